@@ -1,19 +1,34 @@
 import time
 from utils.logger import setup_logger
+from services.position_book import PositionBook
+
+EXIT_LABELS = {
+    'take_profit': "🎯 Take Profit",
+    'stop_loss': "🛑 Stop Loss",
+    'trailing_stop': "📉 Trailing Stop"
+}
 
 class AnalysisAgent:
-    def __init__(self, exit_agent=None):
+    def __init__(self, exit_agent=None, indicators=None, sol_price=None, strategy=None):
         self.logger = setup_logger("analysis_agent")
         self.is_initialized = False
         self.exit_agent = exit_agent
+        self.indicators = indicators
+        self.sol_price = sol_price
         self.active_trades = {}
+        self.positions = PositionBook()
+        self.exiting = set()
         
         # Analysis parameters
         self.params = {
             'take_profit_usdc': 0.05,  # $0.05 USDC take profit
             'stop_loss': -4.0,         # 4% stop loss
+            'trailing_stop': 0.0,      # % below the high since entry, 0 disables
             'max_trades': 5            # Maximum concurrent trades
         }
+        if strategy:
+            self.params['stop_loss'] = -strategy.stop_loss * 100
+            self.params['max_trades'] = strategy.max_trades
 
     async def initialize(self):
         """Initialize analysis agent"""
@@ -30,41 +45,47 @@ class AnalysisAgent:
             return False
 
     async def process_price_update(self, price_data):
-        """Process price updates and trigger exits at $0.05 USDC profit"""
+        """Process a price update and trigger exits at $0.05 USDC profit"""
+        await self.process_price_updates([price_data])
+
+    async def process_price_updates(self, updates):
+        """Evaluate exit rules for a batch of price updates in one pass"""
         try:
-            token_address = price_data['address']
-            current_price = float(price_data['price'])
+            if self.indicators:
+                for update in updates:
+                    self.indicators.update(
+                        update['address'], float(update['price']), update.get('volume'), update.get('timestamp')
+                    )
             
-            if token_address in self.active_trades:
+            # Latest price per token wins within a batch
+            prices = {
+                update['address']: float(update['price'])
+                for update in updates
+                if update['address'] not in self.exiting
+            }
+            for token_address, current_price, reason in self.positions.evaluate(prices):
                 trade = self.active_trades[token_address]
-                entry_price = trade['entry_price']
-                position_size = trade['position_size']
-                
-                # Calculate profit/loss in USDC
-                price_diff = current_price - entry_price
-                profit_usdc = price_diff * position_size
-                pl_pct = (price_diff / entry_price) * 100
-                
-                # Log current status
+                pl_pct = (current_price - trade['entry_price']) / trade['entry_price'] * 100
                 self.logger.info(
-                    f"\n📊 Trade Status: {token_address}\n"
-                    f"  Entry: ${entry_price:.8f}\n"
-                    f"  Current: ${current_price:.8f}\n"
-                    f"  P/L: ${profit_usdc:.3f} USDC ({pl_pct:.3f}%)"
+                    f"{EXIT_LABELS[reason]} triggered for {token_address[:8]}... "
+                    f"at ${current_price:.8f} ({pl_pct:.3f}%)"
                 )
-                
-                # Check exit conditions
-                if profit_usdc >= self.params['take_profit_usdc']:
-                    self.logger.info(f"🎯 Take Profit triggered at ${profit_usdc:.3f} USDC")
-                    await self._execute_exit(token_address, current_price, "take_profit")
-                    
-                elif pl_pct <= self.params['stop_loss']:
-                    self.logger.info(f"🛑 Stop Loss triggered at {pl_pct:.3f}%")
-                    await self._execute_exit(token_address, current_price, "stop_loss")
+                self.exiting.add(token_address)
+                try:
+                    await self._execute_exit(token_address, current_price, reason)
+                finally:
+                    self.exiting.discard(token_address)
                     
         except Exception as e:
             self.logger.error(f"Error processing price update: {str(e)}")
 
+    def _position_usd(self, trade_data):
+        """USD cost of a position: SOL size at the current SOL/USD rate, or the fill's implied rate"""
+        position_usd = self.sol_price.to_usd(trade_data['position_size']) if self.sol_price else None
+        if not position_usd and trade_data.get('fill_price_sol'):
+            position_usd = trade_data['position_size'] * trade_data['entry_price'] / trade_data['fill_price_sol']
+        return position_usd
+
     async def process_trade_update(self, trade_data):
         """Process new trade notifications"""
         try:
@@ -74,19 +95,39 @@ class AnalysisAgent:
                 return
             
             # Add new trade to monitoring
+            position_usd = self._position_usd(trade_data)
+            if not position_usd:
+                self.logger.warning(
+                    f"No SOL/USD rate for {trade_data['token_address'][:8]}..., USDC target disabled"
+                )
             self.active_trades[trade_data['token_address']] = {
                 'entry_price': trade_data['entry_price'],
                 'position_size': trade_data['position_size'],
+                'position_usd': position_usd,
+                'token_amount': trade_data.get('token_amount'),
                 'entry_time': trade_data['entry_time']
             }
+            # Both prices are USD per token, so the target move is the USDC profit over the USD cost
+            entry_price = float(trade_data['entry_price'])
+            self.positions.add(
+                trade_data['token_address'],
+                entry_price,
+                trade_data['position_size'],
+                stop_price=entry_price * (1 + self.params['stop_loss'] / 100),
+                target_price=(
+                    entry_price * (1 + self.params['take_profit_usdc'] / position_usd)
+                    if position_usd else float('inf')
+                ),
+                trail=self.params['trailing_stop'] / 100
+            )
             
             self.logger.info(
                 f"\n📈 Monitoring New Trade:\n"
                 f"  Token: {trade_data['token_address']}\n"
                 f"  Entry: ${trade_data['entry_price']:.8f}\n"
                 f"  Size: {trade_data['position_size']} SOL\n"
-                f"  Target: +$0.05 USDC\n"
-                f"  Stop: -4.00%"
+                f"  Target: +${self.params['take_profit_usdc']:.2f} USDC\n"
+                f"  Stop: {self.params['stop_loss']:.2f}%"
             )
             
         except Exception as e:
@@ -96,17 +137,24 @@ class AnalysisAgent:
         """Execute exit through exit agent"""
         try:
             trade = self.active_trades[token_address]
+            if not trade.get('token_amount'):
+                # Without the filled amount a sell quote cannot be requested
+                self.logger.warning(
+                    f"No token amount for {token_address[:8]}..., {reason} exit skipped"
+                )
+                return
             
             # Calculate final P/L
             price_diff = current_price - trade['entry_price']
-            profit_usdc = price_diff * trade['position_size']
             pl_pct = (price_diff / trade['entry_price']) * 100
+            profit_usdc = (trade['position_usd'] or 0) * pl_pct / 100
             
             # Execute sell through exit agent
             success = await self.exit_agent.execute_sell(
                 token_address=token_address,
-                amount=trade['position_size'],
-                reason=reason
+                amount=trade['token_amount'],
+                reason=reason,
+                trade=trade
             )
             
             if success:
@@ -120,6 +168,7 @@ class AnalysisAgent:
                 )
                 # Remove from active trades
                 del self.active_trades[token_address]
+                self.positions.remove(token_address)
                 
                 # Log available slots
                 self.logger.info(f"Active Trades: {len(self.active_trades)}/{self.params['max_trades']}")
@@ -130,3 +179,4 @@ class AnalysisAgent:
     async def cleanup(self):
         """Cleanup resources"""
         self.active_trades.clear()
+        self.positions = PositionBook()
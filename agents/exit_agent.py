@@ -1,18 +1,57 @@
 import asyncio
-import aiohttp
 import base64
 from solana.transaction import Transaction
 from utils.logger import setup_logger
+from services.signature_stream import SignatureStream, default_ws_url
+from services.tx_sender import TransactionSender
+from services.fill_accounting import FillAccountant
+from services.jupiter import JupiterClient, SOL_MINT
+from services.scheduler import ExecutionScheduler, Priority
+from utils.config import config
 
 class ExitAgent:
-    def __init__(self, wallet_manager):
+    """Sells positions through Jupiter.
+
+    Pass the trading agent's `jupiter` client (or an `exit_planner` built
+    on it) so exits go through the shared scheduler: its per-upstream
+    caps, reserved exit slot and priority order. Only a standalone agent
+    gets a scheduler of its own.
+    """
+
+    def __init__(self, wallet_manager, exit_planner=None, wallet_pool=None, jupiter=None):
         self.logger = setup_logger("exit_agent")
         self.wallet_manager = wallet_manager
+        self.exit_planner = exit_planner
+        self.wallet_pool = wallet_pool
+        self.jupiter = jupiter or (
+            exit_planner.jupiter if exit_planner
+            else JupiterClient(ExecutionScheduler.from_config())
+        )
         self.is_initialized = False
+        self.signature_stream = None
+        self.tx_sender = None
+        self.fill_accountant = FillAccountant(wallet_manager, wallet_pool)
+
+    def _owner(self, token_address):
+        """(public key, keypair) of the wallet holding the position"""
+        if self.wallet_pool:
+            wallet = self.wallet_pool.wallet_for(token_address)
+            return wallet.public_key, wallet.keypair
+        return self.wallet_manager.phantom_public_key, self.wallet_manager.keypair
 
     async def initialize(self):
         """Initialize exit agent"""
         try:
+            self.signature_stream = SignatureStream(
+                default_ws_url(),
+                self.wallet_manager.client
+            )
+            self.tx_sender = TransactionSender(
+                self.wallet_manager.client,
+                self.signature_stream,
+                race_preflight=getattr(config, 'RACE_PREFLIGHT', False),
+                scheduler=self.jupiter.scheduler
+            )
             self.is_initialized = True
             self.logger.info("Exit agent initialized")
             return True
@@ -20,66 +59,78 @@ class ExitAgent:
             self.logger.error(f"Exit agent initialization failed: {str(e)}")
             return False
 
-    async def execute_sell(self, token_address, amount, reason="manual"):
-        """Execute sell order using Jupiter Swap API"""
-        session = None
+    async def execute_sell(self, token_address, amount, reason="manual", trade=None):
+        """Execute sell order using Jupiter Swap API.
+
+        `amount` is the raw token amount to sell. When the position's `trade`
+        dict is given, the realized fill is recorded on it.
+        """
         try:
-            session = aiohttp.ClientSession()
-            
-            # 1. Get quote from Jupiter
-            quote_url = f"https://quote-api.jup.ag/v6/quote"
-            params = {
-                'inputMint': token_address,
-                'outputMint': 'So11111111111111111111111111111111111111112',  # SOL
-                'amount': str(amount),
-                'slippageBps': 50  # 0.5% slippage
-            }
-            
-            async with session.get(quote_url, params=params) as response:
-                quote_data = await response.json()
+            owner, keypair = self._owner(token_address)
+            plan = self.exit_planner.take(token_address) if self.exit_planner else None
+            if plan and plan['amount'] == amount:
+                # Pre-built exit: only the priority fee is refreshed
+                tx_bytes = self.exit_planner.finalize(plan)
+            else:
+                # 1. Get quote from Jupiter
+                quote_data = await self.jupiter.get_quote(
+                    token_address,
+                    SOL_MINT,
+                    amount,
+                    50,  # 0.5% slippage
+                    priority=Priority.EXIT
+                )
 
-            # 2. Get swap transaction
-            swap_url = "https://quote-api.jup.ag/v6/swap"
-            swap_data = {
-                'quoteResponse': quote_data,
-                'userPublicKey': str(self.wallet_manager.phantom_public_key),
-                'wrapUnwrapSOL': True
-            }
-            
-            async with session.post(swap_url, json=swap_data) as response:
-                transaction_data = await response.json()
+                # 2. Get swap transaction
+                swap_transaction = await self.jupiter.get_swap_transaction(
+                    quote_data,
+                    owner,
+                    priority=Priority.EXIT
+                )
+                tx_bytes = base64.b64decode(swap_transaction)
                 
-            # 3. Deserialize and sign transaction
-            tx_bytes = base64.b64decode(transaction_data['swapTransaction'])
+            # 3. Deserialize transaction
             transaction = Transaction.deserialize(tx_bytes)
             
             # 4. Sign and send
-            transaction.sign([self.wallet_manager.keypair])
-            txid = await self.wallet_manager.client.send_transaction(
+            transaction.sign(keypair)
+            result = await self.tx_sender.send(
                 transaction,
-                opts={'skipPreflight': True}
+                fetch_transaction=True,
+                priority=Priority.EXIT
             )
+            if result['status'] != 'confirmed':
+                raise Exception(
+                    f"Transaction {result['status']}: {result['error'] or result['err']}"
+                )
 
-            if not await self._wait_for_confirmation(txid):
-                raise Exception("Transaction failed to confirm")
-
-            self.logger.info(f"Sell transaction sent: {txid} (Reason: {reason})")
+            self.logger.info(f"Sell transaction sent: {result['signature']} (Reason: {reason})")
+            self.jupiter.quote_cache.note_slot(result.get('slot'))
+            if result.get('transaction'):
+                self.fill_accountant.record_sell(
+                    trade if trade is not None else {},
+                    result['transaction'],
+                    token_address,
+                    str(owner)
+                )
+            if self.exit_planner:
+                self.exit_planner.untrack(token_address)
             return True
 
         except Exception as e:
             self.logger.error(f"Sell order failed: {str(e)}")
             return False
-        finally:
-            if session:
-                await session.close()
 
-    async def _wait_for_confirmation(self, signature):
-        """Wait for transaction confirmation"""
+    async def _wait_for_confirmation(self, signature, on_processed=None):
+        """Wait for transaction confirmation via signature subscriptions"""
         try:
-            await self.wallet_manager.client.confirm_transaction(
-                signature,
-                commitment="confirmed"
-            )
+            result = await self.signature_stream.wait(signature, on_processed=on_processed)
+            if result['status'] != 'confirmed':
+                self.logger.error(
+                    f"Transaction {result['signature']} not confirmed: "
+                    f"{result['status']} {result['err'] or ''}"
+                )
+                return False
             return True
         except Exception as e:
             self.logger.error(f"Transaction confirmation failed: {str(e)}")
@@ -88,7 +139,11 @@ class ExitAgent:
     async def cleanup(self):
         """Cleanup resources"""
         try:
-            # Nothing to clean up for now
+            if self.signature_stream:
+                await self.signature_stream.close()
+                self.signature_stream = None
+            if not self.exit_planner:
+                await self.jupiter.cleanup()
             self.logger.info("Exit agent cleanup completed")
         except Exception as e:
             self.logger.error(f"Error during cleanup: {str(e)}")
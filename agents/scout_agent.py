@@ -103,6 +103,7 @@ class ScoutAgent:
                 'liquidity': token.get('liquidity', 0),
                 'volume': token.get('volume', 0),
                 'created_at': int(time.time()),
+                'detected_at': time.time(),
                 'source': source
             }
 
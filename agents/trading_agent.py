@@ -1,5 +1,6 @@
 import asyncio
 from collections import deque
+import math
 import time
 from solana.rpc.async_api import AsyncClient
 from solana.transaction import Transaction
@@ -24,7 +25,32 @@ from utils.exceptions import (
     TokenAccountError
 )
 import aiohttp
-from utils.dexscreener import DexScreener
+from services.dexscreener import DexScreener
+from services.signature_stream import SignatureStream, default_ws_url
+from services.tx_sender import TransactionSender
+from services.fill_accounting import FillAccountant
+from services.jupiter import JupiterClient, SOL_MINT
+from services.raydium import RaydiumClient
+from services.best_execution import BestExecution
+from services.exit_planner import ExitPlanner
+from services.trade_slots import TradeSlots
+from services.wallet_pool import WalletPool, LAMPORTS_PER_SOL, SIGNATURE_FEE_LAMPORTS
+from services.deadline import LatencyBudget, DeadlineExceeded
+from services.market_cap import MarketCapResolver
+from services.volatility import VolatilityTracker
+from services.indicators import IndicatorEngine
+from services.ohlcv import OHLCVStore
+from services.pools import PoolRegistry, price_sol
+from services.reserve_stream import ReserveStream
+from services.reserve_poller import ReservePoller
+from services.sol_price import SolPriceFeed
+from services.strategies import StrategyHost
+from services.rug_detector import RugDetector
+from services.timers import TimerWheel
+from services.cadence import MonitorCadence
+from services.resilience import backoff_delay, is_transient
+from services.paper import PaperJupiterClient, PaperRaydiumClient, PaperSignatureStream
+from services.scheduler import ExecutionScheduler, Priority
 import base64
 from dotenv import load_dotenv
 import os
@@ -32,20 +58,67 @@ import os
 load_dotenv()
 
 class TradingAgent:
-    def __init__(self, wallet_manager=None):
+    def __init__(self, wallet_manager=None, paper_engine=None):
         self.logger = setup_logger("trading_agent")
         self.wallet_manager = wallet_manager
+        self.paper_engine = paper_engine
         self.active_trades = {}
         self.execution_times = deque(maxlen=100)
         self.is_initialized = False
         self.session = None
+        self.signature_stream = None
+        self.tx_sender = None
+        self.fill_accountant = FillAccountant(wallet_manager)
+        self.scheduler = ExecutionScheduler.from_config()
+        if paper_engine:
+            # Quotes, swaps and sends against simulated pools
+            self.jupiter = PaperJupiterClient(paper_engine, self.scheduler)
+            self.raydium = PaperRaydiumClient(paper_engine, self.scheduler, self.jupiter.quote_cache)
+        else:
+            self.jupiter = JupiterClient(self.scheduler)
+            self.raydium = RaydiumClient(self.scheduler, self.jupiter.quote_cache)
+        self.best_execution = BestExecution(self.jupiter, self.raydium)
+        self.exit_planner = None
+        self.wallet_pool = None
+        self.latency_budget = LatencyBudget.from_config()
+        self.dexscreener = DexScreener(self.scheduler)
+        self.volatility = VolatilityTracker.from_config()
+        # Indicators feed the shared volatility estimators
+        self.indicators = IndicatorEngine.from_config(volatility=self.volatility)
+        self.history = OHLCVStore.from_config()
+        self.timers = TimerWheel.from_config()
+        self.cadence = MonitorCadence.from_config()
+        self.due_checks = set()
+        self.checks_due = asyncio.Event()
+        self.closing = set()
+        self.price_updates = []  # batch for the analysis price callback
+        self.pools = None
+        self.reserve_feed = None
+        self.rug_detector = RugDetector.from_config()
+        self._tasks = set()
+        self.sol_price = SolPriceFeed.from_config([self._jupiter_sol_price])
+        self.market_cap = MarketCapResolver({
+            'dexscreener': self._dexscreener_market_caps,
+            'onchain': self._onchain_market_cap
+        })
         
-        # Trading parameters
-        self.MAX_TOKEN_AGE = 120  # 2 minutes in seconds
-        self.POSITION_SIZE = 0.1  # 0.1 SOL per trade
-        self.MAX_TRADES = 5
-        self.TAKE_PROFIT = 0.5  # 50%
-        self.STOP_LOSS = -0.2   # -20%
+        # Trading parameters of the live strategy, shadows share its market data
+        self.strategies = StrategyHost.from_config()
+        self.strategy = self.strategies.live
+        self.MAX_TOKEN_AGE = self.strategy.max_token_age
+        self.POSITION_SIZE = self.strategy.position_size
+        self.MAX_TRADES = self.strategy.max_trades
+        self.MAX_INFLIGHT_BUYS = getattr(config, 'MAX_INFLIGHT_BUYS', 3)
+        self.TAKE_PROFIT = self.strategy.take_profit
+        self.STOP_LOSS = -self.strategy.stop_loss
+        self.MAX_HOLD_TIME = getattr(config, 'MAX_HOLD_S', None)  # seconds, None or 0 disables
+        self.RACE_PREFLIGHT = getattr(config, 'RACE_PREFLIGHT', False)
+        self.SLIPPAGE_HORIZON = getattr(config, 'SLIPPAGE_HORIZON', 5.0)  # seconds until a swap lands
+        self.SLIPPAGE_SIGMAS = getattr(config, 'SLIPPAGE_SIGMAS', 2.0)
+        # A blockhash is valid for ~150 slots, an unconfirmed buy cannot land after that
+        self.PENDING_BUY_TIMEOUT = getattr(config, 'PENDING_BUY_TIMEOUT_S', 90)
+        self.PENDING_BUY_POLL = 2.0
+        self.trade_slots = TradeSlots(self.MAX_TRADES, self.MAX_INFLIGHT_BUYS)
 
     async def initialize(self):
         """Initialize trading agent"""
@@ -59,6 +132,53 @@ class TradingAgent:
                 self.logger.error("Wallet manager not initialized")
                 return False
             
+            if self.paper_engine:
+                self.signature_stream = PaperSignatureStream(self.paper_engine)
+                self.paper_engine.start()
+            else:
+                self.signature_stream = SignatureStream(
+                    default_ws_url(),
+                    self.wallet_manager.client
+                )
+            self.tx_sender = TransactionSender(
+                self.wallet_manager.client,
+                self.signature_stream,
+                race_preflight=self.RACE_PREFLIGHT,
+                scheduler=self.scheduler
+            )
+            
+            if not self.paper_engine:
+                # Pool reserves (websocket, or batched polling) drive exits between price polls
+                self.pools = PoolRegistry(self.wallet_manager.client, self.dexscreener, self.scheduler)
+                self.best_execution.reserve_lookup = self.pools.reserve_lookup
+                if getattr(config, 'RESERVE_SOURCE', 'stream') == 'poll':
+                    self.reserve_feed = ReservePoller(
+                        self.wallet_manager.client,
+                        self._on_reserve_update,
+                        interval=getattr(config, 'RESERVE_POLL_INTERVAL', 1.0),
+                        scheduler=self.scheduler
+                    )
+                else:
+                    self.reserve_feed = ReserveStream(default_ws_url(), self._on_reserve_update)
+                self.reserve_feed.start()
+            
+            self.wallet_pool = WalletPool.from_config(self.wallet_manager)
+            self.fill_accountant.wallet_pool = self.wallet_pool
+            await self._refresh_wallet_balances()
+            
+            await self.jupiter.initialize()
+            await self.raydium.initialize()
+            self.exit_planner = ExitPlanner(
+                self.jupiter,
+                self.wallet_manager,
+                fee_source=self._get_priority_fee,
+                slippage_source=self._exit_slippage_bps,
+                timers=self.timers
+            )
+            self.timers.start()
+            await self.exit_planner.start()
+            await self.sol_price.start()
+            
             balance = await self.wallet_manager.check_balance()
             self.logger.info(
                 f"Trading agent initialized:\n"
@@ -75,18 +195,36 @@ class TradingAgent:
 
     async def handle_new_token(self, token_data):
         """Handle new token from scout agent"""
+        address = token_data['address']
+        opened = False
+        
+        # Shadow strategies see every scouted token, whatever the live one does
+        if self.strategies.on_token(token_data):
+            self._schedule_shadow_check(address, self.cadence.min_interval)
+            if self.reserve_feed:
+                self._spawn(self._watch_pool(address))
+        
+        # Drop tokens that can no longer be bought within the latency budget
+        deadline = self.latency_budget.start(token_data.get('detected_at'))
+        if not self.latency_budget.admit(deadline):
+            self.logger.info(
+                f"Over latency budget ({deadline.elapsed_ms():.0f}ms since detection), "
+                f"skipping {token_data.get('symbol')}"
+            )
+            return
+        
+        # Claim a slot and the mint before any network work
+        reserved, reason = self.trade_slots.reserve(address)
+        if not reserved:
+            self.logger.info(f"{reason}, skipping {token_data.get('symbol')}")
+            return
+        
         try:
             self.logger.info(f"\n🔄 Processing token: {token_data['symbol']}")
-            
-            # Skip if maximum trades reached
-            if len(self.active_trades) >= self.MAX_TRADES:
-                self.logger.info("Maximum active trades reached, skipping")
-                return
-            
-            # Skip if token already traded
-            if token_data['address'] in self.active_trades:
-                self.logger.info("Token already in active trades, skipping")
-                return
+            if self.paper_engine:
+                self.paper_engine.list_token(token_data)
+            self.indicators.update(address, float(token_data.get('price', 0)))
+            self.history.update(address, float(token_data.get('price', 0)))
             
             # Check token age
             token_age = time.time() - token_data.get('created_at', 0)
@@ -96,151 +234,602 @@ class TradingAgent:
                 self.logger.info(f"Token too old (>{self.MAX_TOKEN_AGE}s), skipping")
                 return
             
-            # Check wallet balance
-            balance = await self.wallet_manager.check_balance()
-            self.logger.info(f"Wallet balance: {balance:.4f} SOL")
-            
-            if balance < self.POSITION_SIZE:
-                self.logger.info(f"Insufficient balance for {self.POSITION_SIZE} SOL trade")
+            # Least-loaded wallet with enough free SOL, reserved until the buy settles
+            wallet = self.wallet_pool.assign(address, self.POSITION_SIZE)
+            if not wallet:
+                self.logger.info(f"No wallet with free balance for {self.POSITION_SIZE} SOL trade")
                 return
+            self.logger.info(
+                f"Wallet {wallet.address[:8]}... balance: {wallet.balance:.4f} SOL"
+            )
             
-            self.logger.info(f"Attempting to buy {token_data['symbol']}...")
-            success = await self._execute_buy_order(token_data, self.POSITION_SIZE)
+            pending_seen = False
             
-            if success:
+            def mark_pending_fill(status):
+                # Buy landed at processed commitment, start exit monitoring now
+                nonlocal pending_seen
+                pending_seen = True
                 self.active_trades[token_data['address']] = {
                     'token_data': token_data,
                     'entry_price': float(token_data['price']),
                     'position_size': self.POSITION_SIZE,
-                    'entry_time': time.time()
+                    # Provisional until the fill is recorded: the quote's minimum
+                    # output is what a landed swap is guaranteed to have bought
+                    'token_amount': int(status['quote']['otherAmountThreshold']),
+                    'entry_time': time.time(),
+                    'status': 'pending',
+                    'signature': status['signature'],
+                    'wallet': wallet.address
                 }
+                self._arm_timers(token_data['address'])
+                self.logger.info(f"Buy processed for {token_data['symbol']}, monitoring as pending fill")
+            
+            async with self.trade_slots.buying():
+                self.logger.info(f"Attempting to buy {token_data['symbol']}...")
+                result = await self._execute_buy_order(
+                    token_data,
+                    self.POSITION_SIZE,
+                    on_processed=mark_pending_fill,
+                    wallet=wallet,
+                    deadline=deadline
+                )
+            
+            if not result:
+                self.active_trades.pop(token_data['address'], None)
+            elif pending_seen and address not in self.active_trades:
+                # Exited while still a pending fill, the close released the slot
+                opened = True
+            elif result['status'] == 'pending':
+                # Broadcast but not confirmed in time: it can still land, so
+                # hold the position until the signature's fate is known
+                self.trade_slots.open(address)
+                self.wallet_pool.open(address)
+                opened = True
+                if address not in self.active_trades:
+                    mark_pending_fill(result)
+                self._spawn(self._reconcile_buy(address, result['signature'], result['quote']))
+            else:
+                self.trade_slots.open(address)
+                self.wallet_pool.open(address)
+                opened = True
+                trade = self.active_trades.setdefault(token_data['address'], {
+                    'token_data': token_data,
+                    'entry_price': float(token_data['price']),
+                    'position_size': self.POSITION_SIZE,
+                    'entry_time': time.time(),
+                    'wallet': wallet.address
+                })
+                self._arm_timers(address)
+                self._record_buy_fill(address, result)
                 
                 self.logger.info(
                     f"\n✅ Trade Opened:\n"
                     f"  Token: {token_data['symbol']}\n"
-                    f"  Entry: ${token_data['price']:.8f}\n"
-                    f"  Size: {self.POSITION_SIZE} SOL\n"
+                    f"  Entry: ${trade['entry_price']:.8f}\n"
+                    f"  Size: {trade['position_size']:.4f} SOL\n"
                     f"  Age: {token_age:.1f} seconds\n"
                     f"  Active Trades: {len(self.active_trades)}/{self.MAX_TRADES}"
                 )
             
         except Exception as e:
             self.logger.error(f"Error handling token {token_data.get('symbol')}: {str(e)}")
+            if not opened:
+                self.active_trades.pop(address, None)
+        finally:
+            if not opened:
+                self.trade_slots.release(address)
+                self.timers.cancel_all(address)
+                if self.wallet_pool:
+                    self.wallet_pool.release(address)
 
     async def monitor_active_trades(self):
-        """Monitor active trades for take profit/stop loss"""
+        """Monitor active trades for take profit/stop loss.
+
+        Each position is checked when its price-check timer fires, sooner
+        the closer it is to a threshold; positions that come due together
+        share one price request.
+        """
         while True:
+            due = []
             try:
-                for address, trade in list(self.active_trades.items()):
-                    # Get current price from Jupiter
-                    price_url = f"https://price.jup.ag/v4/price?ids={address}"
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(price_url) as response:
-                            if response.status == 200:
-                                price_data = await response.json()
-                                if price_data['data'].get(address):
-                                    current_price = float(price_data['data'][address]['price'])
-                                    
-                                    # Calculate profit/loss
-                                    entry_price = trade['entry_price']
-                                    price_change = (current_price - entry_price) / entry_price
-                                    
-                                    # Take profit at 50%
-                                    if price_change >= self.TAKE_PROFIT:
-                                        self.logger.info(f"Take profit triggered for {trade['token_data']['symbol']}")
-                                        await self._execute_sell_order(address, trade, "TAKE_PROFIT")
-                                    
-                                    # Stop loss at -20%
-                                    elif price_change <= self.STOP_LOSS:
-                                        self.logger.info(f"Stop loss triggered for {trade['token_data']['symbol']}")
-                                        await self._execute_sell_order(address, trade, "STOP_LOSS")
+                await self.checks_due.wait()
+                self.checks_due.clear()
+                watched = self.strategies.watched
+                due = [
+                    address for address in self.due_checks
+                    if address in self.active_trades or address in watched
+                ]
+                self.due_checks.clear()
+                if not due:
+                    continue
+                # Live positions and shadow-only positions share one request
+                prices = await self.jupiter.get_price(due)
                 
-                await asyncio.sleep(1)  # Check every second
+                exit_signals = []
+                for address in due:
+                    trade = self.active_trades.get(address)
+                    if not trade:
+                        self._check_shadow_price(address, prices.get(address))
+                        continue
+                    if address not in prices:
+                        self._schedule_price_check(address, self.cadence.max_interval)
+                        continue
+                    exit_signal = self._check_price(address, trade, prices[address])
+                    if exit_signal:
+                        exit_signals.append(exit_signal)
+                    elif self.reserve_feed and self.reserve_feed.is_live(address):
+                        # Pool updates already drive this position, poll prices only as a backstop
+                        self._schedule_price_check(address, self.cadence.max_interval)
+                    else:
+                        self._schedule_price_check(address, self.cadence.next_delay(
+                            (prices[address] - trade['entry_price']) / trade['entry_price'],
+                            self.TAKE_PROFIT,
+                            self.STOP_LOSS,
+                            self.volatility.stdev(address, 1.0)
+                        ))
+                
+                if exit_signals:
+                    await self.close_positions(exit_signals)
+                    # Positions whose exit failed stay on the fastest cadence
+                    for exit_signal in exit_signals:
+                        if exit_signal['token_address'] in self.active_trades:
+                            self._schedule_price_check(exit_signal['token_address'], self.cadence.min_interval)
                 
             except Exception as e:
                 self.logger.error(f"Monitor error: {str(e)}")
+                for address in due:
+                    if address in self.active_trades:
+                        self._schedule_price_check(address, 1)
+                    elif address in self.strategies.watched:
+                        self._schedule_shadow_check(address, 1)
                 await asyncio.sleep(1)
 
+    def _check_price(self, address, trade, current_price):
+        """Record a position price, returns an exit signal when TP/SL is hit"""
+        self.indicators.update(address, current_price)
+        self.history.update(address, current_price)
+        if self.exit_planner:
+            self.exit_planner.note_price(address, current_price)
+        if getattr(self, 'analysis_callbacks', None):
+            if not self.price_updates:
+                # Prices of one monitor tick or reserve poll arrive in one pass of the loop
+                asyncio.get_running_loop().call_soon(self._flush_price_updates)
+            self.price_updates.append({'address': address, 'price': current_price})
+        self.strategies.on_prices({address: current_price})
+        
+        # Calculate profit/loss
+        entry_price = trade['entry_price']
+        price_change = (current_price - entry_price) / entry_price
+        
+        # Take profit / stop loss of the live strategy
+        if price_change >= self.TAKE_PROFIT:
+            self.logger.info(f"Take profit triggered for {trade['token_data']['symbol']}")
+            return self._exit_signal(address, current_price, price_change, "TAKE_PROFIT")
+        if price_change <= self.STOP_LOSS:
+            self.logger.info(f"Stop loss triggered for {trade['token_data']['symbol']}")
+            return self._exit_signal(address, current_price, price_change, "STOP_LOSS")
+        return None
+
+    def _flush_price_updates(self):
+        """Hand the batched price updates to the analysis price callback"""
+        updates, self.price_updates = self.price_updates, []
+        for callback in self.analysis_callbacks:
+            if callback['type'] == 'price':
+                self._spawn(callback['func'](updates))
+
+    def _on_reserve_update(self, pool):
+        """Evaluate rug alerts and TP/SL as soon as a position's pool reserves change"""
+        address = pool['mint']
+        trade = self.active_trades.get(address)
+        if not trade:
+            if address in self.strategies.watched:
+                self._on_shadow_reserve_update(address, pool)
+            return
+        alert = self.rug_detector.update(pool)
+        if address in self.closing:
+            return
+        current_price = self._pool_price_usd(trade, pool)
+        if alert:
+            self._spawn(self._emergency_exit(address, alert, current_price))
+            return
+        if not current_price:
+            return
+        exit_signal = self._check_price(address, trade, current_price)
+        if exit_signal:
+            self._spawn(self.close_positions([exit_signal]))
+
+    def _on_shadow_reserve_update(self, address, pool):
+        """Price a token only shadow strategies hold from its pool reserves"""
+        price = price_sol(pool)
+        current_price = self.sol_price.to_usd(price) if price else None
+        if not current_price:
+            return
+        self.volatility.update(address, current_price)
+        self.strategies.on_prices({address: current_price})
+        self._unwatch_pool(address)
+
+    def _pool_price_usd(self, trade, pool):
+        price = price_sol(pool)
+        if not price:
+            return None
+        # Pool prices are in SOL; without a fresh SOL/USD rate use the one implied by the entry fill
+        current_price = self.sol_price.to_usd(price)
+        if not current_price and trade.get('fill_price_sol'):
+            current_price = price * trade['entry_price'] / trade['fill_price_sol']
+        return current_price
+
+    async def _emergency_exit(self, address, alert, current_price=None):
+        """Sell a position whose pool is being rugged, ahead of every other request"""
+        trade = self.active_trades.get(address)
+        if not trade:
+            return
+        current_price = current_price or trade['entry_price']
+        price_change = (current_price - trade['entry_price']) / trade['entry_price']
+        self.logger.warning(
+            f"Rug alert ({alert}) for {trade['token_data']['symbol']}, emergency exit "
+            f"at {price_change * 100:.2f}%"
+        )
+        exit_signal = self._exit_signal(
+            address, current_price, price_change, alert.upper(), priority=Priority.EMERGENCY_EXIT
+        )
+        # The prebuilt plan is the fastest exit, but its minimum output was set
+        # before the drain; if it fails, sell again from a fresh quote
+        await self.close_positions([exit_signal])
+        if address in self.active_trades:
+            await self.close_positions([exit_signal])
+
+    def _spawn(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _watch_pool(self, address):
+        """Stream the reserves of a pool the live strategy or a shadow holds"""
+        pool = await self.pools.resolve(address)
+        if pool and (address in self.active_trades or address in self.strategies.watched):
+            await self.reserve_feed.watch(pool)
+
+    def _unwatch_pool(self, address):
+        """Stop the reserve updates of a token nothing holds any more"""
+        if not self.reserve_feed or address in self.active_trades or address in self.strategies.watched:
+            return
+        self.reserve_feed.unwatch(address)
+        self.pools.forget(address)
+
+    def _schedule_price_check(self, token_address, delay):
+        self.timers.schedule((token_address, 'price_check'), delay, self._price_check_due, token_address)
+
+    def _schedule_shadow_check(self, token_address, delay):
+        # Owned by 'shadow' so closing the live position does not cancel it
+        self.timers.schedule(('shadow', token_address), delay, self._price_check_due, token_address)
+
+    def _check_shadow_price(self, token_address, price):
+        """Price a token only shadow strategies hold"""
+        if not price:
+            self._schedule_shadow_check(token_address, self.cadence.max_interval)
+            return
+        self.volatility.update(token_address, price)
+        self.strategies.on_prices({token_address: price})
+        self._unwatch_pool(token_address)
+        if self.reserve_feed and self.reserve_feed.is_live(token_address):
+            # Pool updates already drive the shadows, poll prices only as a backstop
+            delay = self.cadence.max_interval if token_address in self.strategies.watched else None
+        else:
+            delay = self.strategies.next_delay(
+                token_address, price, self.cadence, self.volatility.stdev(token_address, 1.0)
+            )
+        if delay is not None:
+            self._schedule_shadow_check(token_address, delay)
+
+    def _price_check_due(self, token_address):
+        self.due_checks.add(token_address)
+        self.checks_due.set()
+
+    def _arm_timers(self, token_address):
+        """First price check and, when enabled, the max-hold exit of a new position"""
+        trade = self.active_trades[token_address]
+        if (token_address, 'price_check') not in self.timers:
+            self._schedule_price_check(token_address, self.cadence.min_interval)
+        if not self.MAX_HOLD_TIME:
+            return
+        self.timers.schedule(
+            (token_address, 'max_hold'),
+            self.MAX_HOLD_TIME - (time.time() - trade['entry_time']),
+            self._on_max_hold,
+            token_address
+        )
+
+    async def _on_max_hold(self, token_address):
+        """Close a position held longer than MAX_HOLD_TIME"""
+        trade = self.active_trades.get(token_address)
+        if not trade:
+            return
+        indicators = self.indicators.get(token_address)
+        current_price = indicators['price'] if indicators else trade['entry_price']
+        price_change = (current_price - trade['entry_price']) / trade['entry_price']
+        self.logger.info(f"Max hold time reached for {trade['token_data']['symbol']}")
+        await self.close_positions([
+            self._exit_signal(token_address, current_price, price_change, "MAX_HOLD")
+        ])
+        if token_address in self.active_trades:
+            # Exit failed, try again shortly
+            self.timers.schedule((token_address, 'max_hold'), 5, self._on_max_hold, token_address)
+
+    def _exit_signal(self, token_address, current_price, price_change, reason, priority=Priority.EXIT):
+        position_usd = self.sol_price.to_usd(self.active_trades[token_address]['position_size'])
+        return {
+            'token_address': token_address,
+            'current_price': current_price,
+            'profit_percentage': price_change * 100,
+            'profit_usd': position_usd * price_change if position_usd else None,
+            'reason': reason,
+            'priority': priority
+        }
+
+    async def close_positions(self, exit_signals):
+        """Close every position triggered in the same tick concurrently.
+
+        Positions with a pre-built exit are packed into as few transactions
+        as fit, so they share one signature, broadcast and confirmation.
+        The rest are closed on demand in parallel. Positions already being
+        closed (by another trigger) are skipped.
+        """
+        exit_signals = [s for s in exit_signals if s['token_address'] not in self.closing]
+        addresses = {exit_signal['token_address'] for exit_signal in exit_signals}
+        self.closing |= addresses
+        try:
+            return await self._close_positions(exit_signals)
+        finally:
+            self.closing -= addresses
+
+    async def _close_positions(self, exit_signals):
+        if not exit_signals:
+            return []
+        if len(exit_signals) == 1:
+            return [await self.close_position(exit_signals[0])]
+        
+        start_time = time.perf_counter()
+        planned = {}
+        on_demand = []
+        for exit_signal in exit_signals:
+            plan = self.exit_planner.take(exit_signal['token_address']) if self.exit_planner else None
+            if plan:
+                planned[plan['mint']] = (exit_signal, plan)
+            else:
+                on_demand.append(exit_signal)
+        
+        tasks = [self.close_position(exit_signal) for exit_signal in on_demand]
+        # Only exits signed by the same wallet can share a transaction
+        by_owner = {}
+        for _, plan in planned.values():
+            by_owner.setdefault(plan['owner'], []).append(plan)
+        for plans in by_owner.values():
+            for packed, tx_bytes in self.exit_planner.pack(plans):
+                signals = [planned[plan['mint']][0] for plan in packed]
+                tasks.append(self._close_packed(signals, tx_bytes))
+        
+        results = await asyncio.gather(*tasks)
+        self.logger.info(
+            f"Closed {len(exit_signals)} positions in "
+            f"{(time.perf_counter() - start_time) * 1000:.0f}ms "
+            f"({len(tasks)} transactions)"
+        )
+        return results
+
+    async def _close_packed(self, exit_signals, tx_bytes):
+        """Sign and send one transaction closing several positions"""
+        try:
+            transaction = Transaction.deserialize(tx_bytes)
+            transaction.sign(self.wallet_pool.keypair_for(exit_signals[0]['token_address']))
+            result = await self.tx_sender.send(
+                transaction,
+                fetch_transaction=True,
+                priority=min(s.get('priority', Priority.EXIT) for s in exit_signals)
+            )
+            if result['status'] != 'confirmed':
+                raise TransactionError(
+                    f"Transaction {result['status']}: {result['error'] or result['err']}"
+                )
+            
+            for exit_signal in exit_signals:
+                self._finish_close(exit_signal, result, 'prebuilt' if len(exit_signals) == 1 else 'packed')
+            return True
+            
+        except Exception as e:
+            if len(exit_signals) == 1:
+                self.logger.error(f"Sell order failed: {str(e)}")
+                return False
+            # A packed exit is all-or-nothing, retry each position on its own
+            self.logger.warning(f"Packed exit failed, closing individually: {str(e)}")
+            results = await asyncio.gather(
+                *[self.close_position(exit_signal) for exit_signal in exit_signals]
+            )
+            return all(results)
+
+    def _record_buy_fill(self, token_address, result):
+        """Mark a position filled from its confirmed buy result"""
+        trade = self.active_trades[token_address]
+        trade['status'] = 'filled'
+        self.jupiter.quote_cache.note_slot(result.get('slot'))
+        if result.get('quote'):
+            self.jupiter.quote_cache.remember_route(token_address, result['quote'])
+        
+        # Replace quoted values with the real fill from transaction metadata
+        if result.get('transaction'):
+            self.fill_accountant.record_buy(
+                trade,
+                result['transaction'],
+                token_address,
+                trade['wallet'],
+                quote=result.get('quote')
+            )
+            # Keep a ready-to-sign exit for this position
+            self.exit_planner.track(token_address, trade)
+            if self.reserve_feed:
+                self._spawn(self._watch_pool(token_address))
+        else:
+            # No metadata to read the wallet's new balance from, charge the quoted spend
+            self.wallet_pool.charge(
+                trade['wallet'],
+                trade['position_size'] + SIGNATURE_FEE_LAMPORTS / LAMPORTS_PER_SOL
+            )
+
+    async def _reconcile_buy(self, token_address, signature, quote):
+        """Follow a buy that timed out unconfirmed until it lands or expires"""
+        expires = time.time() + self.PENDING_BUY_TIMEOUT
+        status = None
+        while token_address in self.active_trades and time.time() < expires:
+            await asyncio.sleep(self.PENDING_BUY_POLL)
+            try:
+                status = await self.tx_sender.lookup(signature, fetch_transaction=True)
+            except Exception as e:
+                self.logger.warning(f"Status lookup failed for {signature[:8]}...: {str(e)}")
+                continue
+            if token_address not in self.active_trades:
+                return
+            if status['status'] == 'confirmed':
+                status['quote'] = quote
+                self._record_buy_fill(token_address, status)
+                self.logger.info(f"Pending buy {signature[:8]}... confirmed")
+                return
+            if status['status'] == 'failed':
+                break
+        
+        if token_address in self.active_trades:
+            self.logger.warning(
+                f"Buy {signature[:8]}... did not land ({status['status'] if status else 'unknown'}), "
+                f"dropping the pending position"
+            )
+            self._drop_position(token_address)
+
+    def _finish_close(self, exit_signal, result, exit_path):
+        """Record the sell fill and drop the closed position"""
+        token_address = exit_signal['token_address']
+        trade_info = self.active_trades[token_address]
+        self.jupiter.quote_cache.note_slot(result.get('slot'))
+        
+        if result.get('transaction'):
+            self.fill_accountant.record_sell(
+                trade_info,
+                result['transaction'],
+                token_address,
+                self.wallet_pool.wallet_for(token_address).address
+            )
+
+        self.logger.info(f"Sell transaction sent: {result['signature']}")
+        profit = f"{exit_signal['profit_percentage']:.2f}%"
+        if exit_signal.get('profit_usd') is not None:
+            profit += f" (${exit_signal['profit_usd']:.2f})"
+        self.logger.info(
+            f"\n[POSITION CLOSED]"
+            f"\n  Token: {trade_info['token_data']['symbol']}"
+            f"\n  Entry: ${trade_info['entry_price']:.8f}"
+            f"\n  Exit: ${exit_signal['current_price']:.8f}"
+            f"\n  P/L: {profit}"
+            f"\n  Reason: {exit_signal['reason']}"
+            f"\n  Exit path: {exit_path}"
+        )
+        self._drop_position(token_address)
+
+    def _drop_position(self, token_address):
+        """Forget a position and release everything held for it"""
+        del self.active_trades[token_address]
+        self.trade_slots.release(token_address)
+        self.wallet_pool.release(token_address)
+        self.volatility.forget(token_address)
+        self.indicators.forget(token_address)
+        self.rug_detector.forget(token_address)
+        self.timers.cancel_all(token_address)
+        if token_address in self.strategies.watched:
+            self._schedule_shadow_check(token_address, self.cadence.min_interval)
+        self._unwatch_pool(token_address)
+        if self.exit_planner:
+            self.exit_planner.untrack(token_address)
+
     async def close_position(self, exit_signal):
-        """Close position using Raydium API"""
+        """Close position, using the pre-built exit plan when one is fresh"""
         try:
             token_address = exit_signal['token_address']
+            priority = exit_signal.get('priority', Priority.EXIT)
             trade_info = self.active_trades.get(token_address)
             if not trade_info:
                 self.logger.error(f"No active trade found for token {token_address}")
                 return False
             
-            # Calculate optimal slippage for this sell
-            slippage = await self._calculate_optimal_slippage(
-                trade_info['token_data'],
-                trade_info['position_size'],
-                is_buy=False
-            )
+            plan = self.exit_planner.take(token_address) if self.exit_planner else None
+            if plan:
+                # Quote, route and transaction are ready, only the fee is refreshed
+                transaction = Transaction.deserialize(self.exit_planner.finalize(plan))
+            else:
+                transaction = await self._build_exit_transaction(token_address, trade_info, priority)
             
-            async with aiohttp.ClientSession() as session:
-                # Get quote for selling
-                quote_response = await self._execute_with_retry(
-                    session.get,
-                    f"{config.RAYDIUM_API_URL}/compute/swap-base-out",
-                    params={
-                        'inputMint': token_address,
-                        'outputMint': 'So11111111111111111111111111111111111111112',
-                        'amount': str(trade_info['position_size']),
-                        'slippageBps': int(slippage * 100),  # Dynamic slippage
-                        'txVersion': 'V0'
-                    }
-                )
-                quote_data = await quote_response.json()
-
-                # 2. Get transaction from Raydium API
-                priority_fee = await self._get_priority_fee()
-                swap_response = await self._execute_with_retry(
-                    session.post,
-                    f"{config.RAYDIUM_API_URL}/transaction/swap-base-out",
-                    json={
-                        'computeUnitPriceMicroLamports': priority_fee,
-                        'swapResponse': quote_data,
-                        'txVersion': 'V0',
-                        'wallet': str(self.wallet_manager.phantom_public_key),
-                        'wrapSol': True,
-                        'unwrapSol': False
-                    }
-                )
-                swap_data = await swap_response.json()
-
-                # 3. Deserialize and execute transaction
-                tx_bytes = base64.b64decode(swap_data['data'][0]['transaction'])
-                transaction = Transaction.deserialize(tx_bytes)
-                
-                # 4. Sign and send
-                transaction.sign([self.wallet_manager.keypair])
-                txid = await self.wallet_manager.client.send_transaction(
-                    transaction,
-                    opts={'skipPreflight': True}
+            # Sign and send with the wallet that holds the position
+            transaction.sign(self.wallet_pool.keypair_for(token_address))
+            result = await self.tx_sender.send(
+                transaction,
+                fetch_transaction=True,
+                priority=priority
+            )
+            if result['status'] != 'confirmed':
+                raise TransactionError(
+                    f"Transaction {result['status']}: {result['error'] or result['err']}"
                 )
-
-                if not await self._wait_for_confirmation(txid):
-                    raise TransactionError("Transaction failed to confirm")
-
-                self.logger.info(f"Sell transaction sent: {txid}")
-                if txid:  # If transaction successful
-                    self.logger.info(
-                        f"\n[POSITION CLOSED]"
-                        f"\n  Token: {trade_info['token_data']['symbol']}"
-                        f"\n  Entry: ${trade_info['entry_price']:.8f}"
-                        f"\n  Exit: ${exit_signal['current_price']:.8f}"
-                        f"\n  P/L: {exit_signal['profit_percentage']:.2f}%"
-                        f"\n  Reason: {exit_signal['reason']}"
-                    )
-                    del self.active_trades[token_address]  # Remove the closed position
-                    return True
+            
+            self._finish_close(exit_signal, result, 'prebuilt' if plan else 'on demand')
+            return True
 
         except Exception as e:
             self.logger.error(f"Sell order failed: {str(e)}")
             return False
 
+    async def _build_exit_transaction(self, token_address, trade_info, priority=Priority.EXIT):
+        """Build an unsigned sell transaction on demand on the best venue"""
+        # Calculate optimal slippage for this sell
+        slippage = await self._calculate_optimal_slippage(
+            trade_info['token_data'],
+            trade_info['position_size'],
+            is_buy=False
+        )
+        
+        # 1. Best quote across venues for selling the tokens we actually hold
+        priority_fee = await self._get_priority_fee()
+        choice = await self.best_execution.quote(
+            token_address,
+            SOL_MINT,
+            trade_info['token_amount'],
+            int(slippage * 100),  # Dynamic slippage
+            priority=priority,
+            priority_fee=priority_fee
+        )
+        if not choice:
+            raise TransactionError("No venue returned a sell quote")
+
+        # 2. Get transaction from the winning venue
+        swap_transaction = await self.best_execution.get_swap_transaction(
+            choice,
+            self.wallet_pool.wallet_for(token_address).public_key,
+            priority_fee=int(priority_fee),
+            priority=priority
+        )
+
+        # 3. Deserialize transaction
+        return Transaction.deserialize(base64.b64decode(swap_transaction))
+
+    async def _exit_slippage_bps(self, trade):
+        """Sell slippage in basis points for pre-built exit plans"""
+        slippage = await self._calculate_optimal_slippage(
+            trade['token_data'],
+            trade['position_size'],
+            is_buy=False
+        )
+        return int(slippage * 100)
+
     async def set_analysis_callback(self, price_callback, trade_callback):
-        """Set analysis callbacks with validation"""
+        """Set analysis callbacks with validation.
+
+        `price_callback` receives a list of price updates per monitor tick
+        or reserve poll, like AnalysisAgent.process_price_updates.
+        """
         if not callable(price_callback) or not callable(trade_callback):
             raise ValueError("Callbacks must be callable functions")
             
@@ -259,8 +848,10 @@ class TradingAgent:
             supply = float(token_data.get('supply', 0))
             current_price = float(token_data.get('initial_price', 0))
             
-            # Calculate market cap in USD
+            # Calculate market cap in USD, resolve it from market data if unknown
             market_cap = supply * current_price
+            if not market_cap:
+                market_cap = await self.get_market_cap(token_data['address'])
             
             # Validate market cap is between 100 and 25000 USD
             is_valid = self.MIN_MARKET_CAP <= market_cap <= self.MAX_MARKET_CAP
@@ -288,20 +879,33 @@ class TradingAgent:
             self.logger.error(f"Error calculating market cap: {str(e)}")
             return False, 0
 
-    async def _execute_with_retry(self, func, *args, max_retries=3, **kwargs):
-        """Execute function with retry logic and timing"""
+    async def _execute_with_retry(self, func, *args, max_retries=3, upstream=None,
+                                  priority=Priority.ENTRY, **kwargs):
+        """Execute function with retry logic and timing.
+
+        With `upstream` set, attempts go through the scheduler's resilience
+        layer: priority admission, adaptive rate limit, circuit breaker and
+        jittered backoff on transient failures only.
+        """
         start_time = time.perf_counter()
         
+        if upstream:
+            result = await self.scheduler.call(
+                upstream, priority, func, *args, retries=max_retries - 1, **kwargs
+            )
+            self.execution_times.append(time.perf_counter() - start_time)
+            return result
+        
         for attempt in range(max_retries):
             try:
                 result = await func(*args, **kwargs)
                 self.execution_times.append(time.perf_counter() - start_time)
                 return result
             except Exception as e:
-                if attempt == max_retries - 1:
+                if attempt == max_retries - 1 or not is_transient(e):
                     raise
                 self.logger.warning(f"Retry attempt {attempt + 1}: {str(e)}")
-                await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                await asyncio.sleep(backoff_delay(attempt))
 
     async def _notify_analysis(self, trade_info):
         """Notify analysis agent in parallel"""
@@ -392,10 +996,17 @@ class TradingAgent:
             if trade_impact > 1:  # If trade is >1% of liquidity
                 base_slippage += (trade_impact * 0.5)  # Add 0.5% per 1% of liquidity
             
-            # Adjust for volatility (if available)
-            if 'price_change_24h' in token_data:
+            # Adjust for the expected price move until the swap lands, from the
+            # live price stream; the 24h change only for tokens not seen yet
+            indicators = self.indicators.get(token_data.get('address'))
+            if indicators and indicators['volatility'] is not None:
+                volatility = indicators['volatility'] * math.sqrt(self.SLIPPAGE_HORIZON) * 100
+                base_slippage += self.SLIPPAGE_SIGMAS * volatility
+            elif 'price_change_24h' in token_data:
                 volatility = abs(float(token_data['price_change_24h']))
                 base_slippage += (volatility * 0.1)  # Add 0.1% per 1% volatility
+            else:
+                volatility = 0.0
             
             # Add extra buffer for buys vs sells
             if is_buy:
@@ -408,6 +1019,7 @@ class TradingAgent:
             self.logger.info(
                 f"Calculated slippage: {final_slippage:.2f}%\n"
                 f"  Trade impact: {trade_impact:.2f}%\n"
+                f"  Volatility: {volatility:.2f}%\n"
                 f"  Liquidity: ${liquidity:,.2f}"
             )
             
@@ -417,87 +1029,146 @@ class TradingAgent:
             self.logger.error(f"Error calculating slippage: {str(e)}")
             return 1.0  # Default to 1% if calculation fails
 
-    async def _execute_buy_order(self, token_data, amount_sol):
-        """Execute buy order using Jupiter Swap API"""
+    async def _resolve_unconfirmed_buy(self, signature, quote_data):
+        """Status of a broadcast buy that was not seen confirming.
+
+        Returns the confirmed result, False when it failed, or a `pending`
+        result when its fate is still unknown and the tokens may yet arrive.
+        """
         try:
-            # Create session for Jupiter API
-            async with aiohttp.ClientSession() as session:
-                # 1. Get quote from Jupiter
-                quote_url = "https://quote-api.jup.ag/v6/quote"
-                params = {
-                    'inputMint': 'So11111111111111111111111111111111111111112',  # SOL
-                    'outputMint': token_data['address'],
-                    'amount': str(int(amount_sol * 1e9)),  # Convert SOL to lamports
-                    'slippageBps': '1000',  # 10% slippage for new tokens
-                    'onlyDirectRoutes': 'true',
-                    'asLegacyTransaction': 'true'
-                }
-                
-                self.logger.info(f"Getting Jupiter quote for {token_data['symbol']}...")
-                async with session.get(quote_url, params=params) as response:
-                    if response.status != 200:
-                        raise Exception(f"Jupiter quote error: {await response.text()}")
-                    quote_data = await response.json()
-
-                # 2. Get swap transaction
-                swap_url = "https://quote-api.jup.ag/v6/swap"
-                swap_data = {
-                    'quoteResponse': quote_data,
-                    'userPublicKey': str(self.wallet_manager.phantom_public_key),
-                    'wrapUnwrapSOL': True,
-                    'computeUnitPriceMicroLamports': 50000,  # Higher priority
-                    'asLegacyTransaction': True
-                }
-                
-                self.logger.info("Getting swap transaction...")
-                async with session.post(swap_url, json=swap_data) as response:
-                    if response.status != 200:
-                        raise Exception(f"Jupiter swap error: {await response.text()}")
-                    transaction_data = await response.json()
-
-                # 3. Sign and send transaction
-                tx_bytes = base64.b64decode(transaction_data['swapTransaction'])
-                transaction = Transaction.deserialize(tx_bytes)
-                transaction.sign(self.wallet_manager.keypair)
-                
-                # 4. Send with retries
-                for attempt in range(3):
-                    try:
-                        txid = await self.wallet_manager.client.send_transaction(
-                            transaction,
-                            opts={'skipPreflight': True}
-                        )
-                        
-                        self.logger.info(f"Transaction sent: {txid}")
-                        
-                        # Wait for confirmation
-                        await self.wallet_manager.client.confirm_transaction(
-                            txid,
-                            commitment="confirmed"
+            result = await self.tx_sender.lookup(signature, fetch_transaction=True)
+        except Exception as e:
+            self.logger.warning(f"Status lookup failed for {signature[:8]}...: {str(e)}")
+            result = {'signature': signature, 'status': 'unknown', 'slot': None, 'err': None}
+        result['quote'] = quote_data
+        if result['status'] == 'failed':
+            self.logger.error(f"Buy transaction failed: {result['err']}")
+            return False
+        if result['status'] == 'confirmed':
+            self.logger.info("Transaction confirmed!")
+            return result
+        self.logger.warning(f"Buy {signature[:8]}... unconfirmed ({result['status']}), tracking as pending")
+        result['status'] = 'pending'
+        return result
+
+    async def _execute_buy_order(self, token_data, amount_sol, on_processed=None, wallet=None,
+                                 deadline=None):
+        """Execute buy order on the best of Jupiter and Raydium.
+
+        Returns the confirmed send result (with `quote` and the fetched
+        `transaction`), a `pending` result when a broadcast buy could not
+        be confirmed in time, or False. The buy is paid and signed by `wallet`,
+        the primary wallet by default. Quote, swap build and send each take
+        their timeout from the remaining `deadline` budget.
+        """
+        wallet = wallet or self.wallet_pool.primary
+        if deadline is None:
+            deadline = self.latency_budget.start(token_data.get('detected_at'))
+
+        def landed(status):
+            deadline.mark('processed')
+            self.latency_budget.record(deadline)
+            if on_processed:
+                on_processed(dict(status, quote=quote_data))
+
+        try:
+            # 1. Best quote across Jupiter (direct and multi-hop) and Raydium
+            self.logger.info(f"Getting quotes for {token_data['symbol']}...")
+            priority_fee = 50000  # Higher priority
+            choice = await deadline.run(
+                self.best_execution.quote(
+                    SOL_MINT,
+                    token_data['address'],
+                    int(amount_sol * 1e9),  # Convert SOL to lamports
+                    1000,  # 10% slippage for new tokens
+                    priority_fee=priority_fee,
+                    deadline=min(self.best_execution.deadline, deadline.remaining())
+                ),
+                'quote'
+            )
+            if not choice:
+                raise TransactionError("No venue returned a buy quote")
+            self.logger.info(
+                f"Best route: {choice['venue']} ({choice['elapsed_ms']:.0f}ms)"
+            )
+            quote_data = self.best_execution.fill_quote(choice)
+
+            # 2. Get swap transaction
+            self.logger.info("Getting swap transaction...")
+            swap_transaction = await deadline.run(
+                self.best_execution.get_swap_transaction(
+                    choice,
+                    wallet.public_key,
+                    priority_fee=priority_fee
+                ),
+                'swap build'
+            )
+
+            # 3. Sign and send transaction
+            tx_bytes = base64.b64decode(swap_transaction)
+            transaction = Transaction.deserialize(tx_bytes)
+            transaction.sign(wallet.keypair)
+            
+            # 4. Send with retries
+            sent = None
+            for attempt in range(3):
+                try:
+                    result = await self.tx_sender.send(
+                        transaction,
+                        on_processed=landed,
+                        fetch_transaction=True,
+                        deadline=deadline
+                    )
+                    sent = result['signature']
+                    
+                    if result['status'] == 'failed':
+                        # Deterministic failure, resending cannot help
+                        self.logger.error(
+                            f"Buy transaction failed: {result['error'] or result['err']}"
                         )
-                        
-                        self.logger.info("Transaction confirmed!")
-                        return True
-                        
-                    except Exception as e:
-                        if attempt == 2:  # Last attempt
-                            raise
-                        self.logger.warning(f"Retry {attempt + 1}/3: {str(e)}")
-                        await asyncio.sleep(1)
-                
-                return False
+                        return False
+                    
+                    if result['status'] == 'timeout':
+                        # The broadcast can still land, resending would only race it
+                        return await self._resolve_unconfirmed_buy(sent, quote_data)
+                    
+                    if result['status'] != 'confirmed':
+                        raise TransactionError("Transaction failed to confirm")
+                    
+                    self.logger.info("Transaction confirmed!")
+                    result['quote'] = quote_data
+                    return result
+                    
+                except DeadlineExceeded:
+                    if sent:
+                        return await self._resolve_unconfirmed_buy(sent, quote_data)
+                    raise
+                except Exception as e:
+                    if attempt == 2:  # Last attempt
+                        raise
+                    self.logger.warning(f"Retry {attempt + 1}/3: {str(e)}")
+                    await asyncio.sleep(1)
+            
+            return False
 
+        except DeadlineExceeded as e:
+            self.logger.info(f"Buy dropped for {token_data['symbol']}: {str(e)}")
+            return False
         except Exception as e:
             self.logger.error(f"Buy order failed: {str(e)}")
             return False
 
     async def _get_priority_fee(self):
         """Get recommended priority fee from Raydium"""
+        if self.paper_engine:
+            return str(self.paper_engine.priority_fee)
         try:
             async with aiohttp.ClientSession() as session:
                 response = await self._execute_with_retry(
                     session.get,
-                    f"{config.RAYDIUM_API_URL}/priority-fee"
+                    f"{config.RAYDIUM_API_URL}/priority-fee",
+                    upstream='raydium',
+                    priority=Priority.EXIT
                 )
                 data = await response.json()
                 return str(data['data']['default']['high'])
@@ -505,6 +1176,30 @@ class TradingAgent:
             self.logger.error(f"Error getting priority fee: {str(e)}")
             return "1000"  # Default fallback fee
 
+    async def _refresh_wallet_balances(self):
+        """Load pool balances, falling back to the primary wallet balance"""
+        try:
+            await self.wallet_pool.refresh_balances()
+        except Exception as e:
+            self.logger.warning(f"Wallet pool balance refresh failed: {str(e)}")
+            if self.wallet_pool.primary:
+                self.wallet_pool.update_balance(
+                    self.wallet_pool.primary.address,
+                    await self.wallet_manager.check_balance()
+                )
+
+    async def rebalance_wallets(self):
+        """Even out SOL across idle pool wallets in one transaction"""
+        await self._refresh_wallet_balances()
+        return await self.wallet_pool.rebalance(self.tx_sender)
+
+    def get_execution_metrics(self):
+        """Scheduler queue depth and queue times, and latency budget admissions"""
+        return {
+            'upstreams': self.scheduler.get_metrics(),
+            'latency_budget': self.latency_budget.get_stats()
+        }
+
     def get_execution_time(self):
         return sum(self.execution_times) / len(self.execution_times) if self.execution_times else 0
 
@@ -516,8 +1211,29 @@ class TradingAgent:
                 await self.session.close()
                 self.session = None
                 
+            if self.exit_planner:
+                await self.exit_planner.stop()
+                self.exit_planner = None
+            await self.timers.stop()
+            await self.sol_price.stop()
+            await self.jupiter.cleanup()
+            await self.raydium.cleanup()
+            await self.dexscreener.cleanup()
+            if self.paper_engine:
+                await self.paper_engine.stop()
+            
+            if self.signature_stream:
+                await self.signature_stream.close()
+                self.signature_stream = None
+            if self.reserve_feed:
+                await self.reserve_feed.close()
+                self.reserve_feed = None
+            for task in list(self._tasks):
+                task.cancel()
+                
             # Clear trades and state
             self.active_trades.clear()
+            self.trade_slots.held.clear()
             self.execution_times.clear()
             self.is_initialized = False
             
@@ -527,34 +1243,49 @@ class TradingAgent:
             self.logger.error(f"Error during cleanup: {str(e)}")
 
     async def get_market_cap(self, token_address):
-        """Get real-time market cap from multiple sources"""
+        """Get real-time market cap from multiple sources (median, cached per mint)"""
         try:
-            market_caps = []
-            
-            # 1. Try DexScreener
-            dex_data = await self.dexscreener.get_token_pairs(token_address)
-            if dex_data and 'pairs' in dex_data:
-                for pair in dex_data['pairs']:
-                    if 'fdv' in pair:  # Fully Diluted Valuation
-                        market_caps.append(float(pair['fdv']))
-            
-            # 2. Calculate from supply and price
-            pair_info = await self.get_dexscreener_pair(token_address)
-            if pair_info:
-                supply = float(pair_info['baseToken'].get('supply', 0))
-                price = float(pair_info.get('priceUsd', 0))
-                calculated_mcap = supply * price
-                market_caps.append(calculated_mcap)
-            
-            # Return median if we have multiple values, otherwise the single value
-            if market_caps:
-                return sorted(market_caps)[len(market_caps)//2]
-            return 0
-            
+            return await self.market_cap.get(token_address) or 0
         except Exception as e:
             self.logger.error(f"Error getting market cap: {str(e)}")
             return 0
 
+    async def _dexscreener_market_caps(self, token_address):
+        """Market cap (or FDV) reported for each DexScreener pair"""
+        dex_data = await self.dexscreener.get_token_pairs(token_address)
+        return [
+            float(pair.get('marketCap') or pair['fdv'])
+            for pair in (dex_data or {}).get('pairs') or []
+            if pair.get('marketCap') or pair.get('fdv')
+        ]
+
+    async def _jupiter_sol_price(self):
+        prices = await self.jupiter.get_price([SOL_MINT], priority=Priority.ENRICHMENT)
+        return prices.get(SOL_MINT)
+
+    async def _onchain_market_cap(self, token_address):
+        """Token supply from RPC times the pool price (or the Jupiter price)"""
+        supply_request = self.scheduler.run(
+            'rpc',
+            Priority.ENRICHMENT,
+            self.wallet_manager.client.get_token_supply,
+            Pubkey.from_string(token_address)
+        )
+        pool = self.pools.pools.get(token_address) if self.pools else None
+        price = self.sol_price.to_usd(price_sol(pool) or 0) if pool else None
+        if price:
+            supply_response = await supply_request
+        else:
+            supply_response, prices = await asyncio.gather(
+                supply_request,
+                self.jupiter.get_price([token_address], priority=Priority.ENRICHMENT)
+            )
+            price = prices.get(token_address)
+        supply = supply_response.value.ui_amount
+        if not price or not supply:
+            return None
+        return supply * price
+
     async def validate_token(self, token_data):
         """Validate token - only check age and basic requirements"""
         try:
@@ -609,13 +1340,16 @@ class TradingAgent:
             self.logger.error(f"Error validating token: {str(e)}")
             return False, 0
 
-    async def _wait_for_confirmation(self, signature):
-        """Wait for transaction confirmation"""
+    async def _wait_for_confirmation(self, signature, on_processed=None):
+        """Wait for transaction confirmation via signature subscriptions"""
         try:
-            await self.wallet_manager.client.confirm_transaction(
-                signature,
-                commitment="confirmed"
-            )
+            result = await self.signature_stream.wait(signature, on_processed=on_processed)
+            if result['status'] != 'confirmed':
+                self.logger.error(
+                    f"Transaction {result['signature']} not confirmed: "
+                    f"{result['status']} {result['err'] or ''}"
+                )
+                return False
             return True
         except Exception as e:
             self.logger.error(f"Transaction confirmation failed: {str(e)}")
@@ -625,12 +1359,11 @@ class TradingAgent:
         """Submit transaction with retries"""
         for attempt in range(retries):
             try:
-                txid = await self.wallet_manager.client.send_transaction(
-                    transaction,
-                    opts={'skipPreflight': True}
-                )
-                if await self._wait_for_confirmation(txid):
-                    return txid
+                result = await self.tx_sender.send(transaction)
+                if result['status'] == 'confirmed':
+                    return result['signature']
+                if result['status'] == 'failed':
+                    return None
             except Exception as e:
                 if attempt == retries - 1:
                     raise
@@ -647,11 +1380,16 @@ class TradingAgent:
                 
                 for token in new_tokens:
                     self.logger.info(f"\nNew token detected: {token['symbol']}")
+                    deadline = self.latency_budget.start(token.get('detected_at'))
                     
                     # Validate token
                     is_valid, _ = await self.validate_token(token)
                     if not is_valid:
                         continue
+                    deadline.mark('validated')
+                    if not self.latency_budget.admit(deadline):
+                        self.logger.info(f"Over latency budget, skipping {token['symbol']}")
+                        continue
                     
                     # Check wallet balance
                     balance = await self.wallet_manager.check_balance()
@@ -660,7 +1398,9 @@ class TradingAgent:
                         continue
                     
                     # Execute buy
-                    await self._execute_buy_order(token, config.POSITION_SIZE_SOL)
+                    await self._execute_buy_order(
+                        token, config.POSITION_SIZE_SOL, deadline=deadline
+                    )
                     
                 await asyncio.sleep(1)  # Check every second
                 
@@ -3,6 +3,8 @@ from agents.scout_agent import ScoutAgent
 from agents.trading_agent import TradingAgent
 from agents.analysis_agent import AnalysisAgent
 from utils.wallet_manager import WalletManager
+from utils.config import config
+from services.paper import PaperEngine, PaperWalletManager
 from utils.logger import setup_logger
 from datetime import datetime
 
@@ -18,6 +20,7 @@ class TradingBot:
         self.scout_agent = None
         self.trading_agent = None
         self.wallet_manager = None
+        self.paper_engine = None
         self._tasks = []
         self.logger.info("TradingBot initialized")
 
@@ -26,14 +29,19 @@ class TradingBot:
         try:
             self.logger.info("Initializing components...")
 
-            # Initialize wallet manager
-            self.wallet_manager = WalletManager()
+            # Initialize wallet manager (simulated market and wallet in paper mode)
+            if getattr(config, 'WALLET_MODE', 'active') == 'paper':
+                self.paper_engine = PaperEngine.from_config()
+                self.wallet_manager = PaperWalletManager(self.paper_engine)
+                self.logger.info("Paper trading mode")
+            else:
+                self.wallet_manager = WalletManager()
             if not await self.wallet_manager.initialize():
                 raise Exception("Failed to initialize wallet manager")
             self.logger.info("Wallet manager initialized")
 
             # Initialize trading agent
-            self.trading_agent = TradingAgent(self.wallet_manager)
+            self.trading_agent = TradingAgent(self.wallet_manager, paper_engine=self.paper_engine)
             if not await self.trading_agent.initialize():
                 raise Exception("Failed to initialize trading agent")
             self.logger.info("Trading agent initialized")
@@ -139,6 +147,24 @@ class TradingBot:
             self.logger.error(f"Error getting monitored tokens: {str(e)}")
             return []
 
+    def get_indicators(self, token_address):
+        """Streaming indicators of a token from trading agent"""
+        if self.trading_agent:
+            return self.trading_agent.indicators.get(token_address)
+        return None
+
+    def get_price_history(self, token_address, resolution='1s'):
+        """Closing prices of a token from trading agent's price history"""
+        if self.trading_agent:
+            return self.trading_agent.history.closes(token_address, resolution)
+        return []
+
+    def get_strategy_stats(self):
+        """Per-strategy results, shadows included, from trading agent"""
+        if self.trading_agent:
+            return self.trading_agent.strategies.get_stats()
+        return {}
+
     def get_active_trades(self):
         """Get active trades from trading agent"""
         try:
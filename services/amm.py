@@ -0,0 +1,15 @@
+def constant_product_out(amount_in, reserve_in, reserve_out, fee_bps=25):
+    """Output of an x*y=k swap in raw units, after the pool's LP fee"""
+    amount_in = int(amount_in)
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0
+    amount_in_after_fee = amount_in * (10_000 - fee_bps)
+    return (amount_in_after_fee * int(reserve_out)) // (int(reserve_in) * 10_000 + amount_in_after_fee)
+
+
+def price_impact(amount_in, reserve_in, reserve_out, fee_bps=25):
+    """Fractional shortfall of the swap against the pool's spot price"""
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0.0
+    spot_out = amount_in * reserve_out / reserve_in
+    return 1 - constant_product_out(amount_in, reserve_in, reserve_out, fee_bps) / spot_out
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from utils.logger import setup_logger
+from utils.config import config
+from services.jupiter import SOL_MINT
+from services.scheduler import Priority
+from services.amm import constant_product_out
+
+BASE_FEE_LAMPORTS = 5000
+
+
+class BestExecution:
+    """Fan-out quoting across venues with one deadline.
+
+    Jupiter direct, Jupiter multi-hop and the Raydium compute API are asked
+    at the same time. Candidates are ranked by expected output net of the
+    network cost of their route (base fee plus compute for each hop at the
+    current priority fee). When the deadline hits, the best of whatever has
+    answered wins; if nothing executable has answered yet, the first
+    executable answer is taken.
+
+    With a `reserve_lookup(input_mint, output_mint)` coroutine returning
+    pool reserves, a local constant-product quote is computed as well. It
+    cannot be executed on its own, so it only serves as a reference that
+    the chosen quote is checked against.
+    """
+
+    def __init__(self, jupiter, raydium, reserve_lookup=None, deadline=None,
+                 hop_compute_units=120_000):
+        self.logger = setup_logger("best_execution")
+        self.jupiter = jupiter
+        self.raydium = raydium
+        self.reserve_lookup = reserve_lookup
+        self.deadline = deadline if deadline is not None else (
+            getattr(config, 'QUOTE_DEADLINE_MS', 300) / 1000
+        )
+        self.hop_compute_units = hop_compute_units
+        self.wins = {}
+
+    async def _jupiter(self, input_mint, output_mint, amount, slippage_bps, only_direct, priority):
+        quote = await self.jupiter.get_quote(
+            input_mint, output_mint, amount, slippage_bps,
+            only_direct=only_direct,
+            priority=priority
+        )
+        return {
+            'venue': 'jupiter_direct' if only_direct else 'jupiter',
+            'quote': quote,
+            'in_amount': int(quote['inAmount']),
+            'out_amount': int(quote['outAmount']),
+            'min_out': int(quote.get('otherAmountThreshold') or quote['outAmount']),
+            'hops': max(1, len(quote.get('routePlan') or [])),
+            'executable': True
+        }
+
+    async def _raydium(self, input_mint, output_mint, amount, slippage_bps, priority):
+        quote = await self.raydium.get_quote(
+            input_mint, output_mint, amount, slippage_bps, priority=priority
+        )
+        data = quote['data']
+        return {
+            'venue': 'raydium',
+            'quote': quote,
+            'in_amount': int(data['inputAmount']),
+            'out_amount': int(data['outputAmount']),
+            'min_out': int(data.get('otherAmountThreshold') or data['outputAmount']),
+            'hops': max(1, len(data.get('routePlan') or [])),
+            'executable': True
+        }
+
+    async def _local_amm(self, input_mint, output_mint, amount):
+        pool = await self.reserve_lookup(input_mint, output_mint)
+        if not pool:
+            return None
+        return {
+            'venue': 'local_amm',
+            'quote': pool,
+            'in_amount': int(amount),
+            'out_amount': constant_product_out(
+                amount, pool['reserve_in'], pool['reserve_out'], pool.get('fee_bps', 25)
+            ),
+            'hops': 1,
+            'executable': False
+        }
+
+    def _net_out(self, candidate, input_mint, output_mint, priority_fee):
+        """Expected output after the network cost of the route"""
+        cost = BASE_FEE_LAMPORTS + candidate['hops'] * self.hop_compute_units * priority_fee / 1e6
+        if output_mint == SOL_MINT:
+            return candidate['out_amount'] - cost
+        if input_mint == SOL_MINT:
+            # Output per lamport actually spent, fees included
+            spent = candidate['in_amount'] + cost
+            return candidate['out_amount'] * candidate['in_amount'] / spent
+        return candidate['out_amount']
+
+    async def quote(self, input_mint, output_mint, amount, slippage_bps,
+                    priority=Priority.ENTRY, priority_fee=0, deadline=None):
+        """Best executable quote, or None when no venue answered"""
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(self._jupiter(
+                input_mint, output_mint, amount, slippage_bps, True, priority
+            )),
+            asyncio.create_task(self._jupiter(
+                input_mint, output_mint, amount, slippage_bps, False, priority
+            )),
+            asyncio.create_task(self._raydium(
+                input_mint, output_mint, amount, slippage_bps, priority
+            ))
+        ]
+        if self.reserve_lookup:
+            tasks.append(asyncio.create_task(self._local_amm(input_mint, output_mint, amount)))
+
+        done, pending = await asyncio.wait(
+            tasks, timeout=self.deadline if deadline is None else deadline
+        )
+        while pending and not any(self._executable(task) for task in done):
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            done |= finished
+        for task in pending:
+            task.cancel()
+
+        candidates = []
+        for task in done:
+            if task.exception():
+                self.logger.debug(f"Quote source failed: {str(task.exception())}")
+            elif task.result():
+                candidate = task.result()
+                candidate['net_out'] = self._net_out(
+                    candidate, input_mint, output_mint, float(priority_fee or 0)
+                )
+                candidates.append(candidate)
+
+        executable = [c for c in candidates if c['executable']]
+        if not executable:
+            return None
+
+        best = max(executable, key=lambda c: c['net_out'])
+        reference = next((c for c in candidates if c['venue'] == 'local_amm'), None)
+        if reference and reference['out_amount']:
+            shortfall = 1 - best['out_amount'] / reference['out_amount']
+            if shortfall * 10_000 > slippage_bps:
+                self.logger.warning(
+                    f"Best quote ({best['venue']}) is {shortfall:.2%} below the local pool estimate"
+                )
+
+        self.wins[best['venue']] = self.wins.get(best['venue'], 0) + 1
+        best['candidates'] = {c['venue']: c['net_out'] for c in candidates}
+        best['elapsed_ms'] = (time.perf_counter() - started) * 1000
+        return best
+
+    @staticmethod
+    def _executable(task):
+        return (
+            not task.cancelled()
+            and not task.exception()
+            and task.result() is not None
+            and task.result()['executable']
+        )
+
+    async def get_swap_transaction(self, choice, user_public_key, priority_fee=None,
+                                   priority=Priority.ENTRY):
+        """Unsigned swap transaction (base64) for the venue that won"""
+        if choice['venue'] == 'raydium':
+            return await self.raydium.get_swap_transaction(
+                choice['quote'], user_public_key,
+                priority_fee=priority_fee,
+                priority=priority
+            )
+        return await self.jupiter.get_swap_transaction(
+            choice['quote'], user_public_key,
+            priority_fee=priority_fee,
+            priority=priority
+        )
+
+    @staticmethod
+    def fill_quote(choice):
+        """Quoted input/output amounts in the shape fill accounting expects"""
+        return {
+            'inAmount': str(choice['in_amount']),
+            'outAmount': str(choice['out_amount']),
+            'otherAmountThreshold': str(choice.get('min_out', choice['out_amount'])),
+            'routePlan': choice['quote'].get('routePlan') if choice['venue'] != 'raydium' else []
+        }
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+
+class AsyncTTLCache:
+    """Small TTL cache that merges concurrent fetches of the same key.
+
+    `get_or_fetch` returns a fresh cached value, joins a fetch already in
+    flight for the key, or starts one. Failed fetches are not cached and
+    their error is raised to every caller waiting on them.
+    """
+
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}            # key -> Future
+        self.hits = 0
+        self.misses = 0
+        self.merged = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        expires_at, value = entry
+        if time.monotonic() > expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl=None):
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        self._entries.pop(key, None)
+
+    async def get_or_fetch(self, key, fetch, ttl=None, accept=None):
+        """Cached value for `key`, calling `fetch()` at most once concurrently.
+
+        `accept(value)` can reject a cached or merged value for this
+        particular caller, who then fetches its own.
+        """
+        value = self.get(key)
+        if value is not None and (accept is None or accept(value)):
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task:
+            self.merged += 1
+            value = await asyncio.shield(task)
+            if value is None or accept is None or accept(value):
+                return value
+            # Another caller's request does not fit this one
+            self.merged -= 1
+            self.misses += 1
+            value = await fetch()
+            if value is not None:
+                self.set(key, value, ttl)
+            return value
+
+        self.misses += 1
+        # The fetch is not owned by any caller, cancelling one leaves it running
+        task = asyncio.ensure_future(self._fetch(key, fetch, ttl))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key, fetch, ttl):
+        try:
+            value = await fetch()
+            if value is not None:
+                self.set(key, value, ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self):
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'merged': self.merged
+        }
@@ -0,0 +1,36 @@
+from utils.config import config
+
+
+class MonitorCadence:
+    """How soon a position's price should be checked again.
+
+    The delay is the time an adverse `sigmas` move needs to cover the
+    distance to the nearest exit threshold, given the token's volatility
+    per square-root second: d = sigmas * vol * sqrt(t), so
+    t = (d / (sigmas * vol))^2. Positions close to a trigger or in a fast
+    market are polled often, quiet ones far from both thresholds rarely,
+    always within `min_interval` and `max_interval`.
+    """
+
+    def __init__(self, min_interval=0.25, max_interval=5.0, sigmas=3.0, default_volatility=0.01):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.sigmas = sigmas
+        self.default_volatility = default_volatility
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            min_interval=getattr(config, 'MIN_CHECK_INTERVAL', 0.25),
+            max_interval=getattr(config, 'MAX_CHECK_INTERVAL', 5.0),
+            sigmas=getattr(config, 'CHECK_SIGMAS', 3.0)
+        )
+
+    def next_delay(self, price_change, take_profit, stop_loss, volatility=None):
+        """Seconds until the next check; changes and thresholds are fractions"""
+        distance = min(take_profit - price_change, price_change - stop_loss)
+        if distance <= 0:
+            return self.min_interval
+        move = self.sigmas * (volatility or self.default_volatility)
+        delay = (distance / move) ** 2
+        return min(self.max_interval, max(self.min_interval, delay))
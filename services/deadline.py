@@ -0,0 +1,139 @@
+import asyncio
+import time
+from utils.config import config
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage cannot finish within the trade's latency budget"""
+
+
+class Deadline:
+    """Latency budget of one trade, counted from token detection.
+
+    Stages take their timeout from what is left (`run`, `timeout`) and
+    record when they finished (`mark`).
+    """
+
+    def __init__(self, budget_ms, started_at=None):
+        self.budget_ms = budget_ms
+        self.started_at = started_at if started_at is not None else time.monotonic()
+        self.expires_at = self.started_at + budget_ms / 1000
+        self.stages = {}  # stage -> elapsed ms when it finished
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def remaining_ms(self):
+        return self.remaining() * 1000
+
+    def elapsed_ms(self):
+        return (time.monotonic() - self.started_at) * 1000
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+    def mark(self, stage):
+        self.stages[stage] = self.elapsed_ms()
+
+    def check(self, stage):
+        if self.expired:
+            raise DeadlineExceeded(
+                f"{stage} reached after {self.elapsed_ms():.0f}ms, budget is {self.budget_ms}ms"
+            )
+
+    def timeout(self, stage, cap=None):
+        """Seconds left for `stage`, optionally capped"""
+        self.check(stage)
+        remaining = self.remaining()
+        return min(remaining, cap) if cap is not None else remaining
+
+    async def run(self, awaitable, stage, cap=None):
+        """Await `awaitable` within the remaining budget"""
+        try:
+            timeout = self.timeout(stage, cap)
+        except DeadlineExceeded:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise
+        try:
+            result = await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(
+                f"{stage} timed out after {self.elapsed_ms():.0f}ms, budget is {self.budget_ms}ms"
+            )
+        self.mark(stage)
+        return result
+
+
+class LatencyBudget:
+    """Creates trade deadlines from `performance.max_latency_ms` and admits trades.
+
+    The time from admission until a buy lands (processed commitment) is
+    tracked as an EWMA, floored at `performance.min_execution_speed_ms`.
+    A trade whose remaining budget is below that estimate is dropped
+    before it takes a slot. Only admitted trades teach the estimate, so
+    it is capped below the budget and every drop decays it toward the
+    floor; one slow fill cannot lock out all later entries.
+    """
+
+    def __init__(self, max_latency_ms=1000, min_execution_ms=100, alpha=0.2):
+        self.max_latency_ms = max_latency_ms
+        self.min_execution_ms = min_execution_ms
+        self.alpha = alpha
+        self.execution_ms = None
+        self.admitted = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            max_latency_ms=getattr(config, 'MAX_LATENCY_MS', 1000),
+            min_execution_ms=getattr(config, 'MIN_EXECUTION_SPEED_MS', 100)
+        )
+
+    def start(self, detected_at=None):
+        """Deadline counted from `detected_at` (wall clock) or from now"""
+        started_at = time.monotonic()
+        if detected_at:
+            started_at -= max(0.0, time.time() - detected_at)
+        return Deadline(self.max_latency_ms, started_at)
+
+    @property
+    def expected_ms(self):
+        if self.execution_ms is None:
+            return self.min_execution_ms
+        return max(self.min_execution_ms, self.execution_ms)
+
+    @property
+    def ceiling_ms(self):
+        """Highest estimate, leaves a freshly detected token room to be admitted"""
+        return max(self.min_execution_ms, self.max_latency_ms - self.min_execution_ms)
+
+    def admit(self, deadline):
+        """Whether the trade can still land within its budget"""
+        if deadline.remaining_ms() < self.expected_ms:
+            self.dropped += 1
+            if self.execution_ms is not None:
+                self.execution_ms += self.alpha * (self.min_execution_ms - self.execution_ms)
+            return False
+        self.admitted += 1
+        deadline.mark('admitted')
+        return True
+
+    def record(self, deadline):
+        """Learn execution time from a trade that reached processed"""
+        if 'admitted' not in deadline.stages or 'processed' not in deadline.stages:
+            return
+        sample = min(deadline.stages['processed'] - deadline.stages['admitted'], self.ceiling_ms)
+        if self.execution_ms is None:
+            self.execution_ms = sample
+        else:
+            self.execution_ms += self.alpha * (sample - self.execution_ms)
+
+    def get_stats(self):
+        return {
+            'admitted': self.admitted,
+            'dropped': self.dropped,
+            'expected_ms': self.expected_ms
+        }
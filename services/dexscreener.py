@@ -1,13 +1,31 @@
 import aiohttp
+from services.scheduler import Priority
+from services.resilience import json_or_raise
 
 class DexScreener:
-    def __init__(self):
+    TOKENS_URL = "https://api.dexscreener.com/latest/dex/tokens"
+
+    def __init__(self, scheduler=None):
         self.session = None
+        self.scheduler = scheduler
         
     async def initialize(self):
         """Initialize the DexScreener service"""
         if not self.session:
             self.session = aiohttp.ClientSession()
+
+    async def get_token_pairs(self, token_address, priority=Priority.ENRICHMENT):
+        """Pairs for a token as returned by the DexScreener tokens endpoint"""
+        await self.initialize()
+        if self.scheduler:
+            return await self.scheduler.run(
+                'dexscreener', priority, self._get_token_pairs, token_address
+            )
+        return await self._get_token_pairs(token_address)
+
+    async def _get_token_pairs(self, token_address):
+        async with self.session.get(f"{self.TOKENS_URL}/{token_address}") as response:
+            return await json_or_raise(response, self.scheduler, 'dexscreener')
         
     async def cleanup(self):
         """Cleanup resources"""
@@ -0,0 +1,320 @@
+import asyncio
+import base64
+import time
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+from solders.hash import Hash
+from solders.instruction import AccountMeta, CompiledInstruction, Instruction
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.transaction import Transaction as SoldersTransaction
+from utils.logger import setup_logger
+from services.jupiter import SOL_MINT
+from services.scheduler import Priority
+from services.timers import TimerWheel
+
+COMPUTE_BUDGET_PROGRAM = Pubkey.from_string("ComputeBudget111111111111111111111111111111")
+SET_COMPUTE_UNIT_LIMIT = 2
+SET_COMPUTE_UNIT_PRICE = 3
+DEFAULT_COMPUTE_UNITS = 200_000
+MAX_COMPUTE_UNITS = 1_400_000
+MAX_TRANSACTION_SIZE = 1232
+
+
+def with_priority_fee(tx_bytes, micro_lamports):
+    """Rewrite (or add) the SetComputeUnitPrice instruction of an unsigned legacy transaction"""
+    message = SoldersTransaction.from_bytes(tx_bytes).message
+    header = message.header
+    account_keys = list(message.account_keys)
+    instructions = list(message.instructions)
+    readonly_unsigned = header.num_readonly_unsigned_accounts
+    data = bytes([SET_COMPUTE_UNIT_PRICE]) + int(micro_lamports).to_bytes(8, 'little')
+
+    if COMPUTE_BUDGET_PROGRAM in account_keys:
+        program_index = account_keys.index(COMPUTE_BUDGET_PROGRAM)
+    else:
+        # Readonly unsigned accounts sit at the end, appending keeps other indexes valid
+        account_keys.append(COMPUTE_BUDGET_PROGRAM)
+        program_index = len(account_keys) - 1
+        readonly_unsigned += 1
+
+    for i, ix in enumerate(instructions):
+        if ix.program_id_index == program_index and bytes(ix.data)[:1] == bytes([SET_COMPUTE_UNIT_PRICE]):
+            instructions[i] = CompiledInstruction(program_index, data, bytes(ix.accounts))
+            break
+    else:
+        instructions.insert(0, CompiledInstruction(program_index, data, b''))
+
+    patched = Message.new_with_compiled_instructions(
+        header.num_required_signatures,
+        header.num_readonly_signed_accounts,
+        readonly_unsigned,
+        account_keys,
+        Hash.from_string(str(message.recent_blockhash)),
+        instructions
+    )
+    return bytes(SoldersTransaction.new_unsigned(patched))
+
+
+def _decompile(message):
+    """Compute unit limit and non compute-budget instructions of a legacy message"""
+    limit = 0
+    instructions = []
+    for ix in message.instructions:
+        program = message.account_keys[ix.program_id_index]
+        data = bytes(ix.data)
+        if program == COMPUTE_BUDGET_PROGRAM:
+            if data[:1] == bytes([SET_COMPUTE_UNIT_LIMIT]):
+                limit += int.from_bytes(data[1:5], 'little')
+            continue
+        accounts = [
+            AccountMeta(message.account_keys[i], message.is_signer(i), message.is_writable(i))
+            for i in bytes(ix.accounts)
+        ]
+        instructions.append(Instruction(program, data, accounts))
+    return limit or DEFAULT_COMPUTE_UNITS, instructions
+
+
+def merge_exit_transactions(plans, priority_fee=None):
+    """One unsigned transaction running the swaps of several plans in order"""
+    messages = [SoldersTransaction.from_bytes(plan['transaction']).message for plan in plans]
+    payer = messages[0].account_keys[0]
+    if any(message.account_keys[0] != payer for message in messages):
+        return None
+
+    compute_units = 0
+    instructions = []
+    for message in messages:
+        limit, swap_instructions = _decompile(message)
+        compute_units += limit
+        instructions.extend(swap_instructions)
+
+    budget = [set_compute_unit_limit(min(compute_units, MAX_COMPUTE_UNITS))]
+    if priority_fee is not None:
+        budget.append(set_compute_unit_price(int(priority_fee)))
+
+    # The most recently built plan carries the freshest blockhash
+    newest = max(range(len(plans)), key=lambda i: plans[i]['built_at'])
+    merged = Message.new_with_blockhash(
+        budget + instructions,
+        payer,
+        messages[newest].recent_blockhash
+    )
+    return bytes(SoldersTransaction.new_unsigned(merged))
+
+
+def pack_exit_plans(plans, priority_fee=None, max_size=MAX_TRANSACTION_SIZE):
+    """Greedily pack exit plans into as few transactions as fit.
+
+    Returns a list of `(plans, tx_bytes)` groups. A group of one keeps the
+    original transaction with only its priority fee patched.
+    """
+    groups = []
+    current = []
+    current_bytes = None
+    for plan in plans:
+        if current:
+            merged = merge_exit_transactions(current + [plan], priority_fee)
+            if merged is not None and len(merged) <= max_size:
+                current.append(plan)
+                current_bytes = merged
+                continue
+            groups.append((current, current_bytes))
+        current = [plan]
+        current_bytes = (
+            with_priority_fee(plan['transaction'], priority_fee)
+            if priority_fee is not None else plan['transaction']
+        )
+    if current:
+        groups.append((current, current_bytes))
+    return groups
+
+
+class ExitPlanner:
+    """Keeps a ready-to-sign exit transaction for every open position.
+
+    Each tracked position carries a plan with the sell quote, its route and
+    the unsigned swap transaction. Plans are rebuilt when the price moves
+    past `price_move` and, through a per-plan timer, before the embedded
+    blockhash gets older than `max_age`, so a triggered exit only needs a
+    fee update, a signature and a send. A plan the price has moved away
+    from is still taken while its minimum output remains reachable. A background loop refreshes the
+    priority fee.
+    """
+
+    def __init__(self, jupiter, wallet_manager, fee_source=None, slippage_source=None,
+                 price_move=0.02, max_age=20.0, refresh_interval=1.0, timers=None):
+        self.logger = setup_logger("exit_planner")
+        self.jupiter = jupiter
+        self.wallet_manager = wallet_manager
+        self.fee_source = fee_source
+        self.slippage_source = slippage_source
+        self.price_move = price_move
+        self.max_age = max_age
+        self.refresh_interval = refresh_interval
+        self.positions = {}     # mint -> trade dict
+        self.plans = {}         # mint -> plan dict
+        self.last_prices = {}   # mint -> latest observed price
+        self.priority_fee = None
+        self._building = {}     # mint -> build task
+        self._task = None
+        self._own_timers = timers is None
+        self.timers = timers or TimerWheel()
+
+    def track(self, mint, trade):
+        """Start keeping an exit plan for a position"""
+        self.positions[mint] = trade
+        # The first plan is priced at entry, so a move before the first
+        # observed price still invalidates it
+        if trade.get('entry_price'):
+            self.last_prices.setdefault(mint, trade['entry_price'])
+        self._schedule_build(mint)
+
+    def untrack(self, mint):
+        self.positions.pop(mint, None)
+        self.plans.pop(mint, None)
+        self.last_prices.pop(mint, None)
+        self.timers.cancel((mint, 'exit_plan'))
+        task = self._building.pop(mint, None)
+        if task:
+            task.cancel()
+
+    def note_price(self, mint, price):
+        """Record the latest price, rebuilds the plan when it moved too far"""
+        self.last_prices[mint] = price
+        plan = self.plans.get(mint)
+        if plan and self._is_stale(plan):
+            self._schedule_build(mint)
+
+    def _is_expired(self, plan):
+        """Plan for another amount, or its blockhash is too old to send"""
+        trade = self.positions.get(plan['mint'])
+        if not trade or trade.get('token_amount') != plan['amount']:
+            return True
+        return time.time() - plan['built_at'] > self.max_age
+
+    def _is_stale(self, plan):
+        if self._is_expired(plan):
+            return True
+        price = self.last_prices.get(plan['mint'])
+        if price and plan['price']:
+            return abs(price - plan['price']) / plan['price'] > self.price_move
+        # A plan built before any price was known cannot be checked against one
+        return bool(price)
+
+    def _is_sendable(self, plan):
+        """Whether a plan can still fill, even when the price has moved.
+
+        Exits fire on exactly the moves that make a plan stale, so a moved
+        price alone does not rule it out: the swap only fails when the
+        output expected at the new price falls below the quote's
+        `otherAmountThreshold`.
+        """
+        if self._is_expired(plan):
+            return False
+        if not self._is_stale(plan):
+            return True
+        price = self.last_prices.get(plan['mint'])
+        threshold = plan['quote'].get('otherAmountThreshold')
+        if not (price and plan['price'] and threshold):
+            return False
+        expected = int(plan['quote']['outAmount']) * price / plan['price']
+        return expected >= int(threshold)
+
+    def _schedule_build(self, mint):
+        if mint in self._building and not self._building[mint].done():
+            return
+        self._building[mint] = asyncio.create_task(self._build(mint))
+
+    async def _build(self, mint):
+        trade = self.positions.get(mint)
+        if not trade or not trade.get('token_amount'):
+            return None
+        try:
+            slippage_bps = 300
+            if self.slippage_source:
+                slippage_bps = await self.slippage_source(trade)
+
+            quote = await self.jupiter.get_quote(
+                mint, SOL_MINT, trade['token_amount'], slippage_bps,
+                priority=Priority.EXIT
+            )
+            # Positions opened from a pooled wallet are sold by that wallet
+            owner = trade.get('wallet') or str(self.wallet_manager.phantom_public_key)
+            swap_transaction = await self.jupiter.get_swap_transaction(
+                quote,
+                owner,
+                priority_fee=self.priority_fee,
+                priority=Priority.EXIT
+            )
+            plan = {
+                'mint': mint,
+                'owner': owner,
+                'amount': trade['token_amount'],
+                'quote': quote,
+                'route': quote.get('routePlan', []),
+                'transaction': base64.b64decode(swap_transaction),
+                'price': self.last_prices.get(mint),
+                'built_at': time.time()
+            }
+            if mint in self.positions:
+                self.plans[mint] = plan
+                self.timers.schedule((mint, 'exit_plan'), self.max_age, self._schedule_build, mint)
+            return plan
+        except Exception as e:
+            self.logger.warning(f"Exit plan build failed for {mint[:8]}...: {str(e)}")
+            if mint in self.positions:
+                self.timers.schedule((mint, 'exit_plan'), self.refresh_interval, self._schedule_build, mint)
+            return None
+        finally:
+            self._building.pop(mint, None)
+
+    def take(self, mint):
+        """Sendable exit plan for a position, or None if it has to be built on demand"""
+        plan = self.plans.get(mint)
+        if not plan or not self._is_sendable(plan):
+            # Left in place, a rebuild replaces it
+            return None
+        return self.plans.pop(mint)
+
+    def finalize(self, plan, priority_fee=None):
+        """Unsigned transaction bytes with the current priority fee applied"""
+        fee = priority_fee if priority_fee is not None else self.priority_fee
+        if fee is None:
+            return plan['transaction']
+        return with_priority_fee(plan['transaction'], fee)
+
+    def pack(self, plans, priority_fee=None):
+        """Group plans triggered together into shared transactions"""
+        fee = priority_fee if priority_fee is not None else self.priority_fee
+        return pack_exit_plans(plans, fee)
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                if self.fee_source:
+                    self.priority_fee = int(await self.fee_source())
+            except Exception as e:
+                self.logger.error(f"Exit plan refresh error: {str(e)}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def start(self):
+        if self._own_timers:
+            self.timers.start()
+        if not self._task:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._own_timers:
+            await self.timers.stop()
+        else:
+            for mint in self.positions:
+                self.timers.cancel((mint, 'exit_plan'))
+        for task in list(self._building.values()):
+            task.cancel()
+        self._building.clear()
+        self.plans.clear()
+        self.positions.clear()
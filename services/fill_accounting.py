@@ -0,0 +1,134 @@
+import time
+from utils.logger import setup_logger
+
+SOL_MINT = 'So11111111111111111111111111111111111111112'
+LAMPORTS_PER_SOL = 1e9
+
+
+def _account_keys(tx_result):
+    keys = tx_result['transaction']['message']['accountKeys']
+    # jsonParsed encoding returns dicts, json encoding returns plain strings
+    keys = [k['pubkey'] if isinstance(k, dict) else k for k in keys]
+    loaded = tx_result['meta'].get('loadedAddresses') or {}
+    return keys + loaded.get('writable', []) + loaded.get('readonly', [])
+
+
+def _token_balances(balances, owner, mint):
+    """Raw amount per account index for one owner and mint"""
+    amounts = {}
+    decimals = None
+    for balance in balances or []:
+        if balance.get('owner') == owner and balance.get('mint') == mint:
+            amounts[balance['accountIndex']] = int(balance['uiTokenAmount']['amount'])
+            decimals = balance['uiTokenAmount']['decimals']
+    return amounts, decimals
+
+
+def extract_fill(tx_result, owner, mint):
+    """Exact swap fill from a confirmed transaction's balance metadata.
+
+    `tx_result` is the `getTransaction` result (json or jsonParsed
+    encoding). Returns token and SOL deltas for `owner`, the network fee,
+    rent paid for a newly created token account and the fill price in
+    lamports per raw token unit and SOL per whole token.
+    """
+    meta = tx_result['meta']
+    owner = str(owner)
+    keys = _account_keys(tx_result)
+    owner_index = keys.index(owner)
+
+    fee = meta['fee'] if owner_index == 0 else 0
+    lamport_delta = meta['postBalances'][owner_index] - meta['preBalances'][owner_index]
+
+    pre_tokens, pre_decimals = _token_balances(meta.get('preTokenBalances'), owner, mint)
+    post_tokens, post_decimals = _token_balances(meta.get('postTokenBalances'), owner, mint)
+    decimals = post_decimals if post_decimals is not None else pre_decimals
+    token_delta = sum(post_tokens.values()) - sum(pre_tokens.values())
+
+    # Wrapped SOL left in (or taken from) a token account counts as SOL
+    pre_wsol, _ = _token_balances(meta.get('preTokenBalances'), owner, SOL_MINT)
+    post_wsol, _ = _token_balances(meta.get('postTokenBalances'), owner, SOL_MINT)
+    wsol_delta = sum(post_wsol.values()) - sum(pre_wsol.values())
+
+    # Rent for token accounts opened or closed here is refundable, not price
+    # (a wrapped SOL account holds rent plus the wrapped amount)
+    rent = 0
+    for pre, post, wrapped in ((pre_tokens, post_tokens, False), (pre_wsol, post_wsol, True)):
+        for index in post.keys() - pre.keys():
+            rent += meta['postBalances'][index] - (post[index] if wrapped else 0)
+        for index in pre.keys() - post.keys():
+            rent -= meta['preBalances'][index] - (pre[index] if wrapped else 0)
+
+    swap_lamports = lamport_delta + wsol_delta + fee + rent
+    token_units = abs(token_delta)
+    price_raw = abs(swap_lamports) / token_units if token_units else 0.0
+    scale = 10 ** (decimals or 0)
+
+    return {
+        'token_delta': token_delta,
+        'token_decimals': decimals,
+        'token_balance': sum(post_tokens.values()),
+        'sol_delta': swap_lamports / LAMPORTS_PER_SOL,
+        'fee_sol': fee / LAMPORTS_PER_SOL,
+        'rent_sol': rent / LAMPORTS_PER_SOL,
+        'price_raw': price_raw,
+        'price_sol': price_raw * scale / LAMPORTS_PER_SOL,
+        'post_balance_sol': meta['postBalances'][owner_index] / LAMPORTS_PER_SOL,
+        'slot': tx_result.get('slot')
+    }
+
+
+class FillAccountant:
+    """Apply confirmed fills to positions and the wallet pool's balances"""
+
+    def __init__(self, wallet_manager, wallet_pool=None):
+        self.logger = setup_logger("fill_accounting")
+        self.wallet_manager = wallet_manager
+        self.wallet_pool = wallet_pool
+
+    def _update_wallet(self, fill, owner):
+        if self.wallet_pool:
+            self.wallet_pool.update_balance(owner, fill['post_balance_sol'])
+
+    def record_buy(self, trade, tx_result, mint, owner, quote=None):
+        """Replace quoted entry values on `trade` with the real fill"""
+        fill = extract_fill(tx_result, owner, mint)
+        self._update_wallet(fill, owner)
+
+        if quote and fill['price_raw']:
+            # Quote and fill are both lamports per raw unit, so their ratio is
+            # the realized slippage applied to the quoted USD price
+            quoted_raw = int(quote['inAmount']) / int(quote['outAmount'])
+            trade['entry_price'] = trade['entry_price'] * fill['price_raw'] / quoted_raw
+
+        trade.update({
+            'token_amount': fill['token_delta'],
+            'token_decimals': fill['token_decimals'],
+            'position_size': -fill['sol_delta'],
+            'fill_price_sol': fill['price_sol'],
+            'entry_fees_sol': fill['fee_sol'],
+            'rent_sol': fill['rent_sol'],
+            'fill_slot': fill['slot'],
+            'fill_time': time.time()
+        })
+
+        self.logger.info(
+            f"Buy fill: {fill['token_delta']} units for {-fill['sol_delta']:.6f} SOL "
+            f"(fee {fill['fee_sol']:.6f}, rent {fill['rent_sol']:.6f})"
+        )
+        return fill
+
+    def record_sell(self, trade, tx_result, mint, owner):
+        """Realized proceeds and P/L in SOL for a closing fill"""
+        fill = extract_fill(tx_result, owner, mint)
+        self._update_wallet(fill, owner)
+
+        cost = trade.get('position_size', 0) + trade.get('entry_fees_sol', 0)
+        fill['realized_pnl_sol'] = fill['sol_delta'] - fill['fee_sol'] - cost
+        trade['token_amount'] = fill['token_balance']
+
+        self.logger.info(
+            f"Sell fill: {-fill['token_delta']} units for {fill['sol_delta']:.6f} SOL, "
+            f"realized {fill['realized_pnl_sol']:+.6f} SOL"
+        )
+        return fill
@@ -0,0 +1,121 @@
+import math
+import time
+import numpy as np
+from utils.config import config
+from services.volatility import VolatilityTracker
+
+FIELDS = ('time', 'price', 'ema_fast', 'ema_slow', 'pv', 'volume', 'tw_pv', 'tw_time', 'peak', 'ticks')
+
+
+class IndicatorEngine:
+    """Streaming per-token indicators, O(1) per tick, in fixed-size arrays.
+
+    Every tracked token owns one row of each array. A tick updates fast
+    and slow EMAs (time-based half-lives, so irregular ticks weigh
+    correctly), the session VWAP and the running peak for drawdown. Ticks
+    with a volume feed a volume-weighted average; ticks without one weight
+    the previous price by the seconds it stood, in separate accumulators.
+    The VWAP is volume-weighted once any volume was seen and time-weighted
+    before. Momentum is the fast EMA over the slow one. Realized
+    volatility comes from `volatility`, a VolatilityTracker the engine
+    feeds; pass a shared one so prices are not estimated twice. When all
+    rows are taken, the least recently updated token is evicted.
+    """
+
+    def __init__(self, max_tokens=1000, fast_halflife=10.0, slow_halflife=60.0, volatility=None):
+        self.max_tokens = max_tokens
+        self.fast_halflife = fast_halflife
+        self.slow_halflife = slow_halflife
+        self.volatility = volatility if volatility is not None else VolatilityTracker.from_config()
+        self.rows = {}  # mint -> row
+        self.mints = [None] * max_tokens
+        self.free = list(range(max_tokens - 1, -1, -1))
+        self.data = {name: np.zeros(max_tokens) for name in FIELDS}
+
+    @classmethod
+    def from_config(cls, volatility=None):
+        return cls(
+            max_tokens=getattr(config, 'INDICATOR_MAX_TOKENS', 1000),
+            fast_halflife=getattr(config, 'INDICATOR_FAST_HALFLIFE', 10.0),
+            slow_halflife=getattr(config, 'INDICATOR_SLOW_HALFLIFE', 60.0),
+            volatility=volatility
+        )
+
+    def __contains__(self, mint):
+        return mint in self.rows
+
+    def _row(self, mint):
+        row = self.rows.get(mint)
+        if row is not None:
+            return row
+        if not self.free:
+            last_update = self.data['time']
+            self.forget(self.mints[int(np.argmin(last_update))])
+        row = self.free.pop()
+        self.rows[mint] = row
+        self.mints[row] = mint
+        for values in self.data.values():
+            values[row] = 0.0
+        return row
+
+    def update(self, mint, price, volume=None, timestamp=None):
+        if not price or price <= 0:
+            return
+        timestamp = timestamp if timestamp is not None else time.time()
+        d = self.data
+        row = self._row(mint)
+
+        if not d['ticks'][row]:
+            d['ema_fast'][row] = d['ema_slow'][row] = d['peak'][row] = price
+        else:
+            dt = timestamp - d['time'][row]
+            if dt <= 0:
+                return
+            decay = math.log(2) * dt
+            d['ema_fast'][row] += (1 - math.exp(-decay / self.fast_halflife)) * (price - d['ema_fast'][row])
+            d['ema_slow'][row] += (1 - math.exp(-decay / self.slow_halflife)) * (price - d['ema_slow'][row])
+            d['peak'][row] = max(d['peak'][row], price)
+            if volume is None:
+                d['tw_pv'][row] += d['price'][row] * dt
+                d['tw_time'][row] += dt
+
+        if volume is not None:
+            d['pv'][row] += price * volume
+            d['volume'][row] += volume
+        self.volatility.update(mint, price, timestamp)
+        d['price'][row] = price
+        d['time'][row] = timestamp
+        d['ticks'][row] += 1
+
+    def get(self, mint):
+        """Current indicators of one token, or None when it is not tracked"""
+        row = self.rows.get(mint)
+        if row is None:
+            return None
+        d = self.data
+        return {
+            'price': float(d['price'][row]),
+            'ema_fast': float(d['ema_fast'][row]),
+            'ema_slow': float(d['ema_slow'][row]),
+            'vwap': self._vwap(row),
+            'volatility': self.volatility.stdev(mint, 1.0),  # per sqrt(second)
+            'momentum': float(d['ema_fast'][row] / d['ema_slow'][row] - 1),
+            'drawdown': float(d['price'][row] / d['peak'][row] - 1),
+            'ticks': int(d['ticks'][row]),
+            'updated_at': float(d['time'][row])
+        }
+
+    def _vwap(self, row):
+        d = self.data
+        if d['volume'][row]:
+            return float(d['pv'][row] / d['volume'][row])
+        if d['tw_time'][row]:
+            return float(d['tw_pv'][row] / d['tw_time'][row])
+        return float(d['price'][row])
+
+    def forget(self, mint):
+        row = self.rows.pop(mint, None)
+        if row is None:
+            return
+        self.mints[row] = None
+        self.free.append(row)
@@ -0,0 +1,118 @@
+import aiohttp
+from services.scheduler import Priority
+from services.quote_cache import QuoteCache
+from services.resilience import json_or_raise
+
+SOL_MINT = 'So11111111111111111111111111111111111111112'
+
+
+class JupiterClient:
+    QUOTE_URL = "https://quote-api.jup.ag/v6/quote"
+    SWAP_URL = "https://quote-api.jup.ag/v6/swap"
+    PRICE_URL = "https://price.jup.ag/v4/price"
+
+    def __init__(self, scheduler=None, quote_cache=None):
+        self.session = None
+        self.scheduler = scheduler
+        self.quote_cache = quote_cache or QuoteCache.from_config()
+
+    async def initialize(self):
+        """Initialize the Jupiter service"""
+        if not self.session:
+            self.session = aiohttp.ClientSession()
+
+    async def _run(self, upstream, priority, func, *args):
+        """Route a request through the execution scheduler when one is set"""
+        await self.initialize()
+        if self.scheduler:
+            return await self.scheduler.run(upstream, priority, func, *args)
+        return await func(*args)
+
+    async def get_quote(self, input_mint, output_mint, amount, slippage_bps,
+                        only_direct=False, as_legacy=True, priority=Priority.ENTRY,
+                        use_cache=True):
+        """Get a swap quote, `amount` is in raw units of the input mint.
+
+        Recent quotes for the same pair, amount bucket and slippage are reused
+        and identical concurrent requests share one call.
+        """
+        params = {
+            'inputMint': input_mint,
+            'outputMint': output_mint,
+            'amount': str(int(amount)),
+            'slippageBps': str(int(slippage_bps)),
+            'onlyDirectRoutes': 'true' if only_direct else 'false',
+            'asLegacyTransaction': 'true' if as_legacy else 'false'
+        }
+        # Restrict routing to the venues of the last route that confirmed
+        mint = output_mint if input_mint == SOL_MINT else input_mint
+        last_route = self.quote_cache.last_route(mint)
+        if last_route and last_route['labels']:
+            params['dexes'] = ','.join(last_route['labels'])
+
+        if not use_cache:
+            return await self._fetch_quote(params, priority)
+
+        key = self.quote_cache.key(
+            'jupiter', input_mint, output_mint, amount, slippage_bps, only_direct, as_legacy
+        )
+        return await self.quote_cache.get_or_fetch(
+            key,
+            amount,
+            lambda: self._fetch_quote(params, priority),
+            exact=input_mint != SOL_MINT  # sells spend the whole position
+        )
+
+    async def _fetch_quote(self, params, priority):
+        try:
+            return await self._run('jupiter_quote', priority, self._get_quote, params)
+        except Exception:
+            if 'dexes' not in params:
+                raise
+            # The remembered route may be gone, quote over all venues
+            params = {k: v for k, v in params.items() if k != 'dexes'}
+            return await self._run('jupiter_quote', priority, self._get_quote, params)
+
+    async def _get_quote(self, params):
+        async with self.session.get(self.QUOTE_URL, params=params) as response:
+            return await json_or_raise(response, self.scheduler, 'jupiter_quote')
+
+    async def get_swap_transaction(self, quote, user_public_key, priority_fee=None,
+                                   as_legacy=True, priority=Priority.ENTRY):
+        """Get the unsigned swap transaction for a quote as base64"""
+        payload = {
+            'quoteResponse': quote,
+            'userPublicKey': str(user_public_key),
+            'wrapUnwrapSOL': True,
+            'asLegacyTransaction': as_legacy
+        }
+        if priority_fee is not None:
+            payload['computeUnitPriceMicroLamports'] = int(priority_fee)
+        return await self._run('jupiter_swap', priority, self._get_swap_transaction, payload)
+
+    async def _get_swap_transaction(self, payload):
+        async with self.session.post(self.SWAP_URL, json=payload) as response:
+            data = await json_or_raise(response, self.scheduler, 'jupiter_swap')
+            return data['swapTransaction']
+
+    async def get_price(self, ids, vs_token=None, priority=Priority.EXIT):
+        """Get USD prices (or prices in `vs_token`) for a list of mints"""
+        params = {'ids': ','.join(ids)}
+        if vs_token:
+            params['vsToken'] = vs_token
+        return await self._run('jupiter_price', priority, self._get_price, params)
+
+    async def _get_price(self, params):
+        async with self.session.get(self.PRICE_URL, params=params) as response:
+            data = await json_or_raise(response, self.scheduler, 'jupiter_price')
+            return {
+                address: float(info['price'])
+                for address, info in data.get('data', {}).items()
+                if info
+            }
+
+    async def cleanup(self):
+        """Cleanup resources"""
+        if self.session:
+            await self.session.close()
+            self.session = None
@@ -0,0 +1,57 @@
+import asyncio
+import statistics
+from utils.logger import setup_logger
+from utils.config import config
+from services.cache import AsyncTTLCache
+
+
+class MarketCapResolver:
+    """Market cap from several sources queried at the same time.
+
+    `sources` maps a name to a coroutine function returning a market cap,
+    a list of them, or None for a mint. The median of every positive value
+    that arrives within `deadline` seconds is cached per mint for `ttl`
+    seconds, and concurrent lookups of one mint share a single resolution.
+    """
+
+    def __init__(self, sources, ttl=None, deadline=None):
+        self.logger = setup_logger("market_cap")
+        self.sources = sources
+        self.deadline = deadline if deadline is not None else (
+            getattr(config, 'MARKET_CAP_DEADLINE_MS', 500) / 1000
+        )
+        self.cache = AsyncTTLCache(
+            ttl if ttl is not None else getattr(config, 'MARKET_CAP_TTL', 30)
+        )
+
+    async def get(self, mint):
+        """Median market cap in USD, or None when no source answered"""
+        return await self.cache.get_or_fetch(mint, lambda: self._resolve(mint))
+
+    async def _resolve(self, mint):
+        tasks = {
+            asyncio.create_task(source(mint)): name
+            for name, source in self.sources.items()
+        }
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        for task in pending:
+            task.cancel()
+
+        values = []
+        for task in done:
+            if task.exception():
+                self.logger.debug(f"{tasks[task]} market cap failed: {str(task.exception())}")
+                continue
+            result = task.result()
+            for value in result if isinstance(result, list) else [result]:
+                if value and value > 0:
+                    values.append(float(value))
+
+        if pending:
+            self.logger.debug(
+                f"Market cap for {mint[:8]}... without {', '.join(tasks[t] for t in pending)}"
+            )
+        return statistics.median(values) if values else None
+
+    def get_stats(self):
+        return self.cache.get_stats()
@@ -0,0 +1,123 @@
+import time
+from collections import OrderedDict
+import numpy as np
+from utils.config import config
+
+# Columns of every bar row; ticks use the same layout with open=high=low=close
+TIME, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+COLUMNS = 6
+
+# resolution -> (bar seconds, rows kept); 0 seconds means raw ticks
+RESOLUTIONS = {
+    'tick': (0, 512),
+    '1s': (1, 600),
+    '1m': (60, 1440)
+}
+
+
+class _Ring:
+    """Fixed-capacity array of bars, the oldest row is overwritten"""
+
+    __slots__ = ('rows', 'head', 'count')
+
+    def __init__(self, capacity):
+        self.rows = np.zeros((capacity, COLUMNS))
+        self.head = 0   # next row to write
+        self.count = 0
+
+    def last(self):
+        return self.rows[self.head - 1] if self.count else None
+
+    def push(self, timestamp, price, volume):
+        row = self.rows[self.head]
+        row[TIME] = timestamp
+        row[OPEN] = row[HIGH] = row[LOW] = row[CLOSE] = price
+        row[VOLUME] = volume
+        self.head = (self.head + 1) % len(self.rows)
+        self.count = min(self.count + 1, len(self.rows))
+
+    def ordered(self):
+        """Copy of the rows, oldest first"""
+        if self.count < len(self.rows):
+            return self.rows[:self.count].copy()
+        return np.concatenate([self.rows[self.head:], self.rows[:self.head]])
+
+
+class OHLCVStore:
+    """Per-token price history at tick, 1 second and 1 minute resolution.
+
+    Each price update is appended as a tick and folded into the current
+    1s and 1m bars in O(1), so downsampling needs no pass over history.
+    Every resolution is a ring buffer with a fixed row count (retention).
+    The number of tokens is capped so the store stays within
+    `memory_share` of `performance.memory_limit_mb`; the least recently
+    updated token is dropped first.
+    """
+
+    def __init__(self, memory_limit_mb=512, memory_share=0.25, resolutions=None):
+        self.resolutions = resolutions or RESOLUTIONS
+        self.token_bytes = sum(rows for _, rows in self.resolutions.values()) * COLUMNS * 8
+        self.max_tokens = max(1, int(memory_limit_mb * memory_share * 1024 * 1024 // self.token_bytes))
+        self.series = OrderedDict()  # mint -> {resolution: _Ring}
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            memory_limit_mb=getattr(config, 'MEMORY_LIMIT_MB', 512),
+            memory_share=getattr(config, 'OHLCV_MEMORY_SHARE', 0.25)
+        )
+
+    def __contains__(self, mint):
+        return mint in self.series
+
+    def update(self, mint, price, volume=0.0, timestamp=None):
+        if not price or price <= 0:
+            return
+        timestamp = timestamp if timestamp is not None else time.time()
+        series = self.series.get(mint)
+        if series is None:
+            series = {name: _Ring(rows) for name, (_, rows) in self.resolutions.items()}
+            self.series[mint] = series
+            if len(self.series) > self.max_tokens:
+                self.series.popitem(last=False)
+        else:
+            self.series.move_to_end(mint)
+
+        for name, (seconds, _) in self.resolutions.items():
+            ring = series[name]
+            if not seconds:
+                ring.push(timestamp, price, volume)
+                continue
+            start = timestamp - timestamp % seconds
+            bar = ring.last()
+            if bar is None or start > bar[TIME]:
+                ring.push(start, price, volume)
+            elif start == bar[TIME]:
+                bar[HIGH] = max(bar[HIGH], price)
+                bar[LOW] = min(bar[LOW], price)
+                bar[CLOSE] = price
+                bar[VOLUME] += volume
+            # Ticks older than the current bar are only kept as ticks
+
+    def bars(self, mint, resolution='1s', since=None):
+        """Rows of (time, open, high, low, close, volume), oldest first"""
+        series = self.series.get(mint)
+        if series is None:
+            return np.zeros((0, COLUMNS))
+        rows = series[resolution].ordered()
+        if since is not None:
+            rows = rows[rows[:, TIME] >= since]
+        return rows
+
+    def closes(self, mint, resolution='1s'):
+        return self.bars(mint, resolution)[:, CLOSE]
+
+    def forget(self, mint):
+        self.series.pop(mint, None)
+
+    def get_stats(self):
+        return {
+            'tokens': len(self.series),
+            'max_tokens': self.max_tokens,
+            'memory_mb': len(self.series) * self.token_bytes / (1024 * 1024)
+        }
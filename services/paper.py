@@ -0,0 +1,648 @@
+import asyncio
+import base64
+import json
+import random
+import time
+from types import SimpleNamespace
+from solders.hash import Hash
+from solders.instruction import AccountMeta, Instruction
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.token import ID as TOKEN_PROGRAM
+from solders.token.associated import get_associated_token_address
+from solders.transaction import Transaction as SoldersTransaction
+from utils.logger import setup_logger
+from utils.config import config
+from services.amm import constant_product_out, price_impact
+from services.exit_planner import (
+    COMPUTE_BUDGET_PROGRAM,
+    SET_COMPUTE_UNIT_LIMIT,
+    SET_COMPUTE_UNIT_PRICE,
+    DEFAULT_COMPUTE_UNITS
+)
+from services.jupiter import JupiterClient, SOL_MINT
+from services.raydium import RaydiumClient
+from services.resilience import UpstreamError
+from services.signature_stream import signature_str
+
+LAMPORTS_PER_SOL = 1_000_000_000
+BASE_FEE_LAMPORTS = 5000
+TOKEN_ACCOUNT_RENT = 2_039_280
+MEMO_PROGRAM = Pubkey.from_string("MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr")
+SYSTEM_PROGRAM = Pubkey.from_string("11111111111111111111111111111111")
+SLIPPAGE_EXCEEDED = 6001  # Jupiter's SlippageToleranceExceeded
+INSUFFICIENT_FUNDS = 1    # SPL token InsufficientFunds
+
+
+def token_account(owner, mint):
+    """Associated token account address of `owner` for `mint`"""
+    return str(get_associated_token_address(Pubkey.from_string(str(owner)), Pubkey.from_string(mint)))
+
+
+class PaperPool:
+    """Constant-product SOL/token pool, reserves in raw units"""
+
+    def __init__(self, mint, sol_reserve, token_reserve, decimals=6, fee_bps=25, supply=None):
+        self.mint = mint
+        self.sol_reserve = int(sol_reserve)
+        self.token_reserve = int(token_reserve)
+        self.decimals = decimals
+        self.fee_bps = fee_bps
+        self.supply = int(supply or token_reserve * 5)
+
+    def reserves(self, input_mint):
+        if input_mint == SOL_MINT:
+            return self.sol_reserve, self.token_reserve
+        return self.token_reserve, self.sol_reserve
+
+    def quote(self, input_mint, amount):
+        reserve_in, reserve_out = self.reserves(input_mint)
+        return constant_product_out(amount, reserve_in, reserve_out, self.fee_bps)
+
+    def swap(self, input_mint, amount):
+        """Apply a swap to the reserves, the LP fee stays in the pool"""
+        out = self.quote(input_mint, amount)
+        if input_mint == SOL_MINT:
+            self.sol_reserve += int(amount)
+            self.token_reserve -= out
+        else:
+            self.token_reserve += int(amount)
+            self.sol_reserve -= out
+        return out
+
+    def price_sol(self):
+        """SOL per whole token at the spot price"""
+        if not self.token_reserve:
+            return 0.0
+        return (self.sol_reserve / LAMPORTS_PER_SOL) / (self.token_reserve / 10 ** self.decimals)
+
+
+class PaperEngine:
+    """In-memory Solana market for paper trading.
+
+    Holds constant-product pools, SOL and token balances per owner and the
+    results of executed transactions. Swap transactions are real unsigned
+    legacy transactions whose memo instructions describe the swap, so
+    signing, priority fee rewrites and exit packing work unchanged.
+    Executing one moves the pools with full price impact and LP fees,
+    charges network fees and rent, and records `getTransaction`-shaped
+    balance metadata for fill accounting. Every simulated API or RPC call
+    sleeps for a random latency in `latency_ms` and fails with probability
+    `failure_rate`.
+    """
+
+    def __init__(self, latency_ms=(20, 80), failure_rate=0.0, sol_usd=150.0,
+                 volatility=0.01, seed=None):
+        self.logger = setup_logger("paper")
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.sol_usd = sol_usd
+        self.volatility = volatility
+        self.random = random.Random(seed)
+        self.pools = {}
+        self.lamports = {}
+        self.token_accounts = {}  # address -> (owner, mint)
+        self.token_balances = {}  # address -> raw amount, present while the account exists
+        self.transactions = {}
+        self.started = time.monotonic()
+        self.priority_fee = 1000
+        self.failures = 0
+        self._market_task = None
+
+    @classmethod
+    def from_config(cls):
+        latency = getattr(config, 'PAPER_LATENCY_MS', [20, 80])
+        return cls(
+            latency_ms=tuple(latency),
+            failure_rate=getattr(config, 'PAPER_FAILURE_RATE', 0.0),
+            sol_usd=getattr(config, 'PAPER_SOL_USD', 150.0),
+            volatility=getattr(config, 'PAPER_VOLATILITY', 0.01),
+            seed=getattr(config, 'PAPER_SEED', None)
+        )
+
+    @property
+    def slot(self):
+        return 1 + int((time.monotonic() - self.started) / 0.4)
+
+    # Market
+
+    def add_pool(self, mint, sol_reserve, token_reserve, decimals=6, fee_bps=25, supply=None):
+        self.pools[mint] = PaperPool(mint, sol_reserve, token_reserve, decimals, fee_bps, supply)
+        return self.pools[mint]
+
+    def list_token(self, token_data):
+        """Pool for a scouted token from its USD price and liquidity, if not listed yet"""
+        mint = token_data['address']
+        if mint in self.pools:
+            return self.pools[mint]
+        price_usd = float(token_data.get('price') or 0) or 0.0001
+        side_usd = (float(token_data.get('liquidity') or 0) or 10_000) / 2
+        decimals = 6
+        return self.add_pool(
+            mint,
+            side_usd / self.sol_usd * LAMPORTS_PER_SOL,
+            side_usd / price_usd * 10 ** decimals,
+            decimals
+        )
+
+    def price_usd(self, mint):
+        if mint == SOL_MINT:
+            return self.sol_usd
+        pool = self.pools.get(mint)
+        return pool.price_sol() * self.sol_usd if pool else None
+
+    def step(self):
+        """One round of outside trading, a random swap of about `volatility` of each pool"""
+        for pool in self.pools.values():
+            size = abs(self.random.gauss(0, self.volatility))
+            if self.random.random() < 0.5:
+                pool.swap(SOL_MINT, pool.sol_reserve * size)
+            else:
+                pool.swap(pool.mint, pool.token_reserve * size)
+
+    async def _run_market(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.step()
+
+    def start(self, interval=0.4):
+        if not self._market_task:
+            self._market_task = asyncio.create_task(self._run_market(interval))
+
+    async def stop(self):
+        if self._market_task:
+            self._market_task.cancel()
+            await asyncio.gather(self._market_task, return_exceptions=True)
+            self._market_task = None
+
+    # Balances
+
+    def fund(self, owner, sol):
+        owner = str(owner)
+        self.lamports[owner] = self.lamports.get(owner, 0) + int(sol * LAMPORTS_PER_SOL)
+
+    def balance(self, owner):
+        return self.lamports.get(str(owner), 0)
+
+    def token_balance(self, owner, mint):
+        return self.token_balances.get(token_account(owner, mint), 0)
+
+    def positions(self, owner):
+        """Raw token amounts held by `owner` per mint"""
+        owner = str(owner)
+        return {
+            mint: self.token_balances[address]
+            for address, (holder, mint) in self.token_accounts.items()
+            if holder == owner and self.token_balances.get(address)
+        }
+
+    # Simulated network
+
+    async def call(self, upstream):
+        """Latency and injected failures of one API or RPC call"""
+        low, high = self.latency_ms
+        await asyncio.sleep(self.random.uniform(low, high) / 1000)
+        if self.random.random() < self.failure_rate:
+            self.failures += 1
+            raise UpstreamError(f"{upstream} error 503: paper failure", status=503)
+
+    # Quotes and transactions
+
+    def quote(self, input_mint, output_mint, amount, slippage_bps):
+        """Jupiter-shaped quote against the pool of the non-SOL mint"""
+        mint = output_mint if input_mint == SOL_MINT else input_mint
+        pool = self.pools.get(mint)
+        if not pool or SOL_MINT not in (input_mint, output_mint):
+            raise UpstreamError(f"No route for {input_mint} -> {output_mint}", status=400)
+        amount = int(amount)
+        out = pool.quote(input_mint, amount)
+        reserve_in, reserve_out = pool.reserves(input_mint)
+        return {
+            'inputMint': input_mint,
+            'outputMint': output_mint,
+            'inAmount': str(amount),
+            'outAmount': str(out),
+            'otherAmountThreshold': str(out * (10_000 - int(slippage_bps)) // 10_000),
+            'slippageBps': int(slippage_bps),
+            'priceImpactPct': str(price_impact(amount, reserve_in, reserve_out, pool.fee_bps)),
+            'routePlan': [{
+                'swapInfo': {
+                    'ammKey': mint,
+                    'label': 'PaperAMM',
+                    'inputMint': input_mint,
+                    'outputMint': output_mint,
+                    'inAmount': str(amount),
+                    'outAmount': str(out)
+                },
+                'percent': 100
+            }],
+            'contextSlot': self.slot
+        }
+
+    def swap_transaction(self, input_mint, output_mint, amount, min_out, owner, priority_fee=None):
+        """Unsigned legacy swap transaction as base64"""
+        owner = Pubkey.from_string(str(owner))
+        mint = output_mint if input_mint == SOL_MINT else input_mint
+        payload = {'in': input_mint, 'out': output_mint, 'amount': int(amount), 'min_out': int(min_out)}
+        instructions = []
+        if priority_fee:
+            instructions.append(Instruction(
+                COMPUTE_BUDGET_PROGRAM,
+                bytes([SET_COMPUTE_UNIT_PRICE]) + int(priority_fee).to_bytes(8, 'little'),
+                []
+            ))
+        instructions.append(Instruction(
+            MEMO_PROGRAM,
+            json.dumps(payload, separators=(',', ':')).encode(),
+            [
+                AccountMeta(owner, is_signer=True, is_writable=True),
+                AccountMeta(Pubkey.from_string(token_account(owner, mint)), is_signer=False, is_writable=True)
+            ]
+        ))
+        message = Message.new_with_blockhash(instructions, owner, self.blockhash())
+        return base64.b64encode(bytes(SoldersTransaction.new_unsigned(message))).decode()
+
+    def blockhash(self):
+        return Hash.hash(self.slot.to_bytes(8, 'little'))
+
+    def _fee(self, message, keys):
+        price, limit, other = 0, 0, 0
+        for ix in message.instructions:
+            data = bytes(ix.data)
+            if keys[ix.program_id_index] == str(COMPUTE_BUDGET_PROGRAM):
+                if data[:1] == bytes([SET_COMPUTE_UNIT_PRICE]):
+                    price = int.from_bytes(data[1:9], 'little')
+                elif data[:1] == bytes([SET_COMPUTE_UNIT_LIMIT]):
+                    limit = int.from_bytes(data[1:5], 'little')
+            else:
+                other += 1
+        limit = limit or other * DEFAULT_COMPUTE_UNITS
+        return BASE_FEE_LAMPORTS * message.header.num_required_signatures + price * limit // 1_000_000
+
+    def _swap(self, index, owner, payload, logs):
+        mint = payload['out'] if payload['in'] == SOL_MINT else payload['in']
+        pool = self.pools.get(mint)
+        if not pool:
+            logs.append(f"Program log: Error: unknown pool {mint}")
+            return {'InstructionError': [index, 'InvalidAccountData']}
+        account = token_account(owner, mint)
+        amount = payload['amount']
+
+        if payload['in'] == SOL_MINT:
+            rent = 0 if account in self.token_balances else TOKEN_ACCOUNT_RENT
+            if self.lamports.get(owner, 0) < amount + rent:
+                logs.append("Program log: Error: insufficient lamports")
+                return {'InstructionError': [index, {'Custom': INSUFFICIENT_FUNDS}]}
+        elif self.token_balances.get(account, 0) < amount:
+            logs.append("Program log: Error: insufficient funds")
+            return {'InstructionError': [index, {'Custom': INSUFFICIENT_FUNDS}]}
+
+        out = pool.quote(payload['in'], amount)
+        if out < payload['min_out']:
+            logs.append(f"Program log: Error: SlippageToleranceExceeded ({out} < {payload['min_out']})")
+            return {'InstructionError': [index, {'Custom': SLIPPAGE_EXCEEDED}]}
+
+        pool.swap(payload['in'], amount)
+        if payload['in'] == SOL_MINT:
+            if account not in self.token_balances:
+                self.token_accounts[account] = (owner, mint)
+                self.token_balances[account] = 0
+                self.lamports[owner] -= TOKEN_ACCOUNT_RENT
+                self.lamports[account] = TOKEN_ACCOUNT_RENT
+            self.lamports[owner] -= amount
+            self.token_balances[account] += out
+        else:
+            self.token_balances[account] -= amount
+            self.lamports[owner] = self.lamports.get(owner, 0) + out
+        logs.append(f"Program log: PaperAMM swap {amount} {payload['in'][:8]} -> {out} {payload['out'][:8]}")
+        return None
+
+    def _transfer(self, index, keys, ix, logs):
+        data = bytes(ix.data)
+        accounts = bytes(ix.accounts)
+        if data[:4] != (2).to_bytes(4, 'little'):
+            return {'InstructionError': [index, 'InvalidInstructionData']}
+        source, destination = keys[accounts[0]], keys[accounts[1]]
+        lamports = int.from_bytes(data[4:12], 'little')
+        if self.lamports.get(source, 0) < lamports:
+            logs.append("Transfer: insufficient lamports")
+            return {'InstructionError': [index, {'Custom': INSUFFICIENT_FUNDS}]}
+        self.lamports[source] -= lamports
+        self.lamports[destination] = self.lamports.get(destination, 0) + lamports
+        return None
+
+    def _token_balance_entries(self, keys):
+        entries = []
+        for index, address in enumerate(keys):
+            if address not in self.token_balances:
+                continue
+            owner, mint = self.token_accounts[address]
+            decimals = self.pools[mint].decimals if mint in self.pools else 0
+            amount = self.token_balances[address]
+            entries.append({
+                'accountIndex': index,
+                'mint': mint,
+                'owner': owner,
+                'programId': str(TOKEN_PROGRAM),
+                'uiTokenAmount': {
+                    'amount': str(amount),
+                    'decimals': decimals,
+                    'uiAmount': amount / 10 ** decimals,
+                    'uiAmountString': str(amount / 10 ** decimals)
+                }
+            })
+        return entries
+
+    def execute(self, message, signature, dry_run=False):
+        """Apply a transaction atomically, returns (err, logs).
+
+        A failed instruction reverts the whole transaction except the
+        network fee, like on chain. With `dry_run` nothing is kept.
+        """
+        keys = [str(key) for key in message.account_keys]
+        payer = keys[0]
+        logs = []
+        fee = self._fee(message, keys)
+        if self.lamports.get(payer, 0) < fee:
+            return 'InsufficientFundsForFee', logs
+
+        snapshot = (
+            dict(self.lamports),
+            dict(self.token_accounts),
+            dict(self.token_balances),
+            {mint: (pool.sol_reserve, pool.token_reserve) for mint, pool in self.pools.items()}
+        )
+        pre_balances = [self.lamports.get(key, 0) for key in keys]
+        pre_tokens = self._token_balance_entries(keys)
+        self.lamports[payer] -= fee
+
+        err = None
+        for index, ix in enumerate(message.instructions):
+            program = keys[ix.program_id_index]
+            if program == str(COMPUTE_BUDGET_PROGRAM):
+                continue
+            if program == str(MEMO_PROGRAM):
+                owner = keys[bytes(ix.accounts)[0]]
+                err = self._swap(index, owner, json.loads(bytes(ix.data)), logs)
+            elif program == str(SYSTEM_PROGRAM):
+                err = self._transfer(index, keys, ix, logs)
+            else:
+                err = {'InstructionError': [index, 'IncorrectProgramId']}
+            if err:
+                break
+
+        if err or dry_run:
+            lamports, token_accounts, token_balances, reserves = snapshot
+            self.lamports, self.token_accounts, self.token_balances = lamports, token_accounts, token_balances
+            for mint, (sol_reserve, token_reserve) in reserves.items():
+                self.pools[mint].sol_reserve, self.pools[mint].token_reserve = sol_reserve, token_reserve
+            if dry_run:
+                return err, logs
+            self.lamports[payer] -= fee
+
+        self.transactions[signature] = {
+            'slot': self.slot,
+            'blockTime': int(time.time()),
+            'transaction': {
+                'signatures': [signature],
+                'message': {
+                    'accountKeys': [
+                        {'pubkey': key, 'signer': message.is_signer(i), 'writable': message.is_writable(i)}
+                        for i, key in enumerate(keys)
+                    ],
+                    'recentBlockhash': str(message.recent_blockhash)
+                }
+            },
+            'meta': {
+                'err': err,
+                'fee': fee,
+                'preBalances': pre_balances,
+                'postBalances': [self.lamports.get(key, 0) for key in keys],
+                'preTokenBalances': pre_tokens,
+                'postTokenBalances': self._token_balance_entries(keys),
+                'logMessages': logs,
+                'loadedAddresses': {'writable': [], 'readonly': []}
+            }
+        }
+        return err, logs
+
+
+def _solders_transaction(transaction):
+    """solders Transaction of a solana-py or solders transaction"""
+    if hasattr(transaction, 'to_solders'):
+        return transaction.to_solders()
+    return transaction
+
+
+class PaperRpcClient:
+    """The AsyncClient methods the agents use, answered by a PaperEngine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def send_transaction(self, transaction, *signers, opts=None):
+        await self.engine.call('rpc')
+        transaction = _solders_transaction(transaction)
+        signature = transaction.signatures[0]
+        if signature == Signature.default():
+            signature = Signature.new_unique()
+        err, _ = self.engine.execute(transaction.message, str(signature))
+        if err == 'InsufficientFundsForFee':
+            raise UpstreamError("Transaction simulation failed: insufficient funds for fee", status=400)
+        return SimpleNamespace(value=signature)
+
+    async def simulate_transaction(self, transaction, sig_verify=False, commitment=None):
+        await self.engine.call('rpc')
+        transaction = _solders_transaction(transaction)
+        err, logs = self.engine.execute(transaction.message, None, dry_run=True)
+        return SimpleNamespace(value=SimpleNamespace(err=err, logs=logs))
+
+    async def get_transaction(self, signature, encoding="json", commitment=None,
+                              max_supported_transaction_version=None):
+        await self.engine.call('rpc')
+        result = self.engine.transactions.get(signature_str(signature))
+        return SimpleNamespace(
+            to_json=lambda: json.dumps({'jsonrpc': '2.0', 'result': result, 'id': 1})
+        )
+
+    async def get_signature_statuses(self, signatures, search_transaction_history=False):
+        await self.engine.call('rpc')
+        statuses = []
+        for signature in signatures:
+            record = self.engine.transactions.get(signature_str(signature))
+            statuses.append(SimpleNamespace(
+                slot=record['slot'],
+                err=record['meta']['err'],
+                confirmation_status='confirmed'
+            ) if record else None)
+        return SimpleNamespace(value=statuses)
+
+    async def get_balance(self, pubkey, commitment=None):
+        await self.engine.call('rpc')
+        return SimpleNamespace(value=self.engine.balance(pubkey))
+
+    async def get_multiple_accounts(self, pubkeys, commitment=None, encoding="base64"):
+        await self.engine.call('rpc')
+        return SimpleNamespace(value=[
+            SimpleNamespace(lamports=self.engine.balance(pubkey))
+            if str(pubkey) in self.engine.lamports else None
+            for pubkey in pubkeys
+        ])
+
+    async def get_latest_blockhash(self, commitment=None):
+        await self.engine.call('rpc')
+        return SimpleNamespace(value=SimpleNamespace(
+            blockhash=self.engine.blockhash(),
+            last_valid_block_height=self.engine.slot + 150
+        ))
+
+    async def get_token_supply(self, mint, commitment=None):
+        await self.engine.call('rpc')
+        pool = self.engine.pools.get(str(mint))
+        if not pool:
+            raise UpstreamError(f"Invalid param: could not find mint {mint}", status=400)
+        return SimpleNamespace(value=SimpleNamespace(
+            amount=str(pool.supply),
+            decimals=pool.decimals,
+            ui_amount=pool.supply / 10 ** pool.decimals
+        ))
+
+    async def close(self):
+        pass
+
+
+class PaperSignatureStream:
+    """SignatureStream over the engine's executed transactions"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def wait(self, signature, on_processed=None, timeout=30):
+        signature = signature_str(signature)
+        result = {'signature': signature, 'status': 'timeout', 'slot': None, 'err': None}
+        record = self.engine.transactions.get(signature)
+        if not record:
+            return result
+        await self.engine.call('signature_stream')
+        result.update(slot=record['slot'], err=record['meta']['err'])
+        if result['err'] is not None:
+            result['status'] = 'failed'
+            return result
+        result['status'] = 'processed'
+        if on_processed:
+            callback_result = on_processed(dict(result))
+            if asyncio.iscoroutine(callback_result):
+                await callback_result
+        await self.engine.call('signature_stream')
+        result['status'] = 'confirmed'
+        return result
+
+    async def close(self):
+        pass
+
+
+class PaperJupiterClient(JupiterClient):
+    """Jupiter quotes, swaps and prices from a PaperEngine"""
+
+    def __init__(self, engine, scheduler=None, quote_cache=None):
+        super().__init__(scheduler, quote_cache)
+        self.engine = engine
+
+    async def initialize(self):
+        pass
+
+    async def _get_quote(self, params):
+        await self.engine.call('jupiter_quote')
+        return self.engine.quote(
+            params['inputMint'], params['outputMint'], int(params['amount']), int(params['slippageBps'])
+        )
+
+    async def _get_swap_transaction(self, payload):
+        await self.engine.call('jupiter_swap')
+        quote = payload['quoteResponse']
+        return self.engine.swap_transaction(
+            quote['inputMint'],
+            quote['outputMint'],
+            quote['inAmount'],
+            quote['otherAmountThreshold'],
+            payload['userPublicKey'],
+            payload.get('computeUnitPriceMicroLamports')
+        )
+
+    async def _get_price(self, params):
+        await self.engine.call('jupiter_price')
+        prices = {mint: self.engine.price_usd(mint) for mint in params['ids'].split(',')}
+        return {mint: price for mint, price in prices.items() if price is not None}
+
+    async def cleanup(self):
+        pass
+
+
+class PaperRaydiumClient(RaydiumClient):
+    """Raydium compute and swap responses from a PaperEngine"""
+
+    def __init__(self, engine, scheduler=None, quote_cache=None):
+        super().__init__(scheduler, quote_cache)
+        self.engine = engine
+
+    async def initialize(self):
+        pass
+
+    async def _get_quote(self, params):
+        await self.engine.call('raydium')
+        quote = self.engine.quote(
+            params['inputMint'], params['outputMint'], int(params['amount']), int(params['slippageBps'])
+        )
+        return {'success': True, 'data': {
+            'inputMint': quote['inputMint'],
+            'outputMint': quote['outputMint'],
+            'inputAmount': quote['inAmount'],
+            'outputAmount': quote['outAmount'],
+            'otherAmountThreshold': quote['otherAmountThreshold'],
+            'slippageBps': quote['slippageBps'],
+            'priceImpactPct': float(quote['priceImpactPct']) * 100,
+            'routePlan': [{'poolId': quote['routePlan'][0]['swapInfo']['ammKey']}]
+        }}
+
+    async def _get_swap_transaction(self, payload):
+        await self.engine.call('raydium')
+        data = payload['swapResponse']['data']
+        return self.engine.swap_transaction(
+            data['inputMint'],
+            data['outputMint'],
+            data['inputAmount'],
+            data['otherAmountThreshold'],
+            payload['wallet'],
+            int(payload['computeUnitPriceMicroLamports'])
+        )
+
+    async def cleanup(self):
+        pass
+
+
+class PaperWalletManager:
+    """WalletManager stand-in holding a funded keypair on a PaperEngine"""
+
+    def __init__(self, engine, keypair=None, balance_sol=None):
+        self.logger = setup_logger("paper_wallet")
+        self.engine = engine
+        self.keypair = keypair or Keypair()
+        self.phantom_public_key = self.keypair.pubkey()
+        self.client = PaperRpcClient(engine)
+        self.is_initialized = False
+        self.balance_sol = balance_sol if balance_sol is not None else getattr(config, 'PAPER_BALANCE_SOL', 10.0)
+
+    async def initialize(self):
+        if str(self.phantom_public_key) not in self.engine.lamports:
+            self.engine.fund(self.phantom_public_key, self.balance_sol)
+        self.is_initialized = True
+        self.logger.info(f"Paper wallet {self.phantom_public_key} funded with {self.balance_sol} SOL")
+        return True
+
+    async def check_balance(self):
+        return self.engine.balance(self.phantom_public_key) / LAMPORTS_PER_SOL
+
+    async def cleanup(self):
+        self.is_initialized = False
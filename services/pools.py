@@ -0,0 +1,157 @@
+import struct
+from solders.pubkey import Pubkey
+from utils.logger import setup_logger
+from services.jupiter import SOL_MINT
+from services.scheduler import Priority
+
+RAYDIUM_AMM_V4 = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+AMM_V4_SIZE = 752
+TOKEN_ACCOUNT_AMOUNT = 64  # offset of the u64 amount in an SPL token account
+# Accounts followed per pool: a change to a vault moves its reserve, the
+# pool account carries pending pnl and LP supply
+ROLES = ('token_vault', 'sol_vault', 'address')
+
+
+def decode_amm_v4(data):
+    """Fields of a Raydium AMM v4 pool account needed for pricing"""
+    data = bytes(data)
+    if len(data) < AMM_V4_SIZE:
+        raise ValueError(f"Not an AMM v4 pool account ({len(data)} bytes)")
+    base_decimals, quote_decimals = struct.unpack_from('<QQ', data, 32)
+    swap_fee_numerator, swap_fee_denominator = struct.unpack_from('<QQ', data, 176)
+    base_need_take_pnl, quote_need_take_pnl = struct.unpack_from('<QQ', data, 192)
+    keys = [str(Pubkey.from_bytes(data[offset:offset + 32])) for offset in range(336, 496, 32)]
+    return {
+        'base_decimals': base_decimals,
+        'quote_decimals': quote_decimals,
+        'fee_bps': swap_fee_numerator * 10_000 // swap_fee_denominator if swap_fee_denominator else 25,
+        'base_need_take_pnl': base_need_take_pnl,
+        'quote_need_take_pnl': quote_need_take_pnl,
+        'base_vault': keys[0],
+        'quote_vault': keys[1],
+        'base_mint': keys[2],
+        'quote_mint': keys[3],
+        'lp_mint': keys[4],
+        'lp_reserve': struct.unpack_from('<Q', data, 720)[0]
+    }
+
+
+def token_account_amount(data):
+    """Raw amount held by an SPL token account"""
+    return struct.unpack_from('<Q', bytes(data), TOKEN_ACCOUNT_AMOUNT)[0]
+
+
+def pool_state(mint, address, amm):
+    """Tracked reserves of a token/SOL pool, oriented so `token` is `mint`"""
+    token_is_base = amm['base_mint'] == mint
+    side = ('base', 'quote') if token_is_base else ('quote', 'base')
+    if amm[f'{side[1]}_mint'] != SOL_MINT:
+        raise ValueError(f"Pool {address} does not trade {mint} against SOL")
+    return {
+        'mint': mint,
+        'address': address,
+        'token_vault': amm[f'{side[0]}_vault'],
+        'sol_vault': amm[f'{side[1]}_vault'],
+        'token_decimals': amm[f'{side[0]}_decimals'],
+        'token_is_base': token_is_base,
+        'fee_bps': amm['fee_bps'],
+        'token_pnl': amm[f'{side[0]}_need_take_pnl'],
+        'sol_pnl': amm[f'{side[1]}_need_take_pnl'],
+        'lp_reserve': amm['lp_reserve'],
+        'token_vault_amount': None,
+        'sol_vault_amount': None,
+        'slot': None
+    }
+
+
+def apply_pool_account(pool, data):
+    """Refresh pnl and LP supply from a new pool account snapshot"""
+    amm = decode_amm_v4(data)
+    side = ('base', 'quote') if pool['token_is_base'] else ('quote', 'base')
+    pool['token_pnl'] = amm[f'{side[0]}_need_take_pnl']
+    pool['sol_pnl'] = amm[f'{side[1]}_need_take_pnl']
+    pool['lp_reserve'] = amm['lp_reserve']
+
+
+def reserves(pool):
+    """(token reserve, SOL reserve) in raw units, None until both vaults are known"""
+    if pool['token_vault_amount'] is None or pool['sol_vault_amount'] is None:
+        return None
+    return (
+        max(0, pool['token_vault_amount'] - pool['token_pnl']),
+        max(0, pool['sol_vault_amount'] - pool['sol_pnl'])
+    )
+
+
+def price_sol(pool):
+    """Spot price in SOL per whole token from the pool reserves"""
+    current = reserves(pool)
+    if not current or not current[0]:
+        return None
+    token_reserve, sol_reserve = current
+    return (sol_reserve / 1e9) / (token_reserve / 10 ** pool['token_decimals'])
+
+
+class PoolRegistry:
+    """Raydium AMM v4 pool of each traded token, found once and kept.
+
+    The pool address comes from DexScreener (the deepest Raydium pair
+    against SOL) and its vaults from the pool account itself.
+    """
+
+    def __init__(self, client, dexscreener, scheduler=None):
+        self.logger = setup_logger("pools")
+        self.client = client
+        self.dexscreener = dexscreener
+        self.scheduler = scheduler
+        self.pools = {}  # mint -> pool state
+
+    async def _rpc(self, func, *args, **kwargs):
+        if self.scheduler:
+            return await self.scheduler.run('rpc', Priority.ENRICHMENT, func, *args, **kwargs)
+        return await func(*args, **kwargs)
+
+    async def _pool_address(self, mint):
+        data = await self.dexscreener.get_token_pairs(mint)
+        pairs = [
+            pair for pair in data.get('pairs') or []
+            if pair.get('dexId') == 'raydium'
+            and SOL_MINT in (pair.get('baseToken', {}).get('address'), pair.get('quoteToken', {}).get('address'))
+        ]
+        if not pairs:
+            return None
+        best = max(pairs, key=lambda pair: float((pair.get('liquidity') or {}).get('usd') or 0))
+        return best['pairAddress']
+
+    async def resolve(self, mint):
+        """Pool state for a mint, or None when it has no Raydium SOL pool"""
+        if mint in self.pools:
+            return self.pools[mint]
+        try:
+            address = await self._pool_address(mint)
+            if not address:
+                return None
+            response = await self._rpc(self.client.get_account_info, Pubkey.from_string(address))
+            account = response.value
+            if not account or str(account.owner) != RAYDIUM_AMM_V4:
+                return None
+            self.pools[mint] = pool_state(mint, address, decode_amm_v4(account.data))
+            return self.pools[mint]
+        except Exception as e:
+            self.logger.warning(f"Pool lookup failed for {mint[:8]}...: {str(e)}")
+            return None
+
+    def forget(self, mint):
+        self.pools.pop(mint, None)
+
+    async def reserve_lookup(self, input_mint, output_mint):
+        """Live reserves for BestExecution's local AMM reference quote"""
+        mint = output_mint if input_mint == SOL_MINT else input_mint
+        pool = self.pools.get(mint)
+        current = reserves(pool) if pool else None
+        if not current:
+            return None
+        token_reserve, sol_reserve = current
+        if input_mint == SOL_MINT:
+            return {'reserve_in': sol_reserve, 'reserve_out': token_reserve, 'fee_bps': pool['fee_bps']}
+        return {'reserve_in': token_reserve, 'reserve_out': sol_reserve, 'fee_bps': pool['fee_bps']}
@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class PositionBook:
+    """Open positions as parallel arrays, exit rules evaluated in one pass.
+
+    Each position has a row: entry price, size, stop price, target price,
+    trailing high and trailing distance. `evaluate` applies a batch of
+    price updates with vectorized comparisons and returns only the rows
+    that hit an exit. Freed rows are reused; the arrays grow by doubling.
+    """
+
+    def __init__(self, capacity=64):
+        self.index = {}  # mint -> row
+        self.mints = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+        self.entry = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.stop = np.zeros(capacity)
+        self.target = np.full(capacity, np.inf)
+        self.high = np.zeros(capacity)
+        self.trail = np.zeros(capacity)  # fraction below the high, 0 disables
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, mint):
+        return mint in self.index
+
+    def _grow(self):
+        capacity = len(self.mints)
+        for name in ('entry', 'size', 'stop', 'high', 'trail'):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(capacity)]))
+        self.target = np.concatenate([self.target, np.full(capacity, np.inf)])
+        self.mints.extend([None] * capacity)
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def add(self, mint, entry_price, size, stop_price, target_price=np.inf, trail=0.0):
+        if mint in self.index:
+            row = self.index[mint]
+        else:
+            if not self.free:
+                self._grow()
+            row = self.free.pop()
+            self.index[mint] = row
+            self.mints[row] = mint
+        self.entry[row] = entry_price
+        self.size[row] = size
+        self.stop[row] = stop_price
+        self.target[row] = target_price
+        self.high[row] = entry_price
+        self.trail[row] = trail
+
+    def remove(self, mint):
+        row = self.index.pop(mint, None)
+        if row is None:
+            return
+        self.mints[row] = None
+        self.free.append(row)
+
+    def evaluate(self, prices):
+        """Triggered exits for `prices` (mint -> price) as (mint, price, reason)"""
+        pairs = [(self.index[mint], price) for mint, price in prices.items() if mint in self.index]
+        if not pairs:
+            return []
+        rows = np.fromiter((row for row, _ in pairs), dtype=np.intp, count=len(pairs))
+        price = np.fromiter((p for _, p in pairs), dtype=float, count=len(pairs))
+        valid = price > 0
+
+        high = np.maximum(self.high[rows], np.where(valid, price, 0))
+        self.high[rows] = high
+
+        take_profit = valid & (price >= self.target[rows])
+        stop_loss = valid & ~take_profit & (price <= self.stop[rows])
+        trailing = (
+            valid & ~take_profit & ~stop_loss
+            & (self.trail[rows] > 0)
+            & (high > self.entry[rows])
+            & (price <= high * (1 - self.trail[rows]))
+        )
+
+        exits = []
+        for reason, mask in (('take_profit', take_profit), ('stop_loss', stop_loss),
+                             ('trailing_stop', trailing)):
+            for i in np.flatnonzero(mask):
+                exits.append((self.mints[rows[i]], float(price[i]), reason))
+        return exits
@@ -0,0 +1,81 @@
+import math
+import time
+from services.cache import AsyncTTLCache
+from utils.config import config
+
+
+class QuoteCache:
+    """Short-lived quote cache shared by buys, sells, price checks and exit plans.
+
+    Quotes are keyed by venue, input mint, output mint, an amount bucket
+    and slippage. Entries expire after `ttl` seconds or once the chain is
+    more than `max_slot_lag` slots past the quote's context slot. A cached
+    quote is only reused when it does not spend more than the caller asked
+    for, and for sells (`exact`) only when it spends exactly that, so a
+    close leaves no dust. The last route that produced a confirmed trade is kept per mint.
+    """
+
+    def __init__(self, ttl=0.8, max_slot_lag=2, bucket_pct=0.005):
+        self.cache = AsyncTTLCache(ttl)
+        self.max_slot_lag = max_slot_lag
+        self.bucket_base = math.log1p(bucket_pct)
+        self.current_slot = 0
+        self.routes = {}  # mint -> {'route', 'labels', 'updated_at'}
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            ttl=getattr(config, 'QUOTE_TTL_MS', 800) / 1000,
+            max_slot_lag=getattr(config, 'QUOTE_MAX_SLOT_LAG', 2)
+        )
+
+    def note_slot(self, slot):
+        """Latest slot seen anywhere (confirmations, streams)"""
+        if slot and slot > self.current_slot:
+            self.current_slot = slot
+
+    def _bucket(self, amount):
+        amount = int(amount)
+        return int(math.log(amount) / self.bucket_base) if amount > 0 else 0
+
+    def key(self, venue, input_mint, output_mint, amount, slippage_bps, *extra):
+        return (venue, input_mint, output_mint, self._bucket(amount), int(slippage_bps)) + extra
+
+    def _usable(self, quote, amount, exact=False):
+        context_slot = quote.get('contextSlot')
+        if context_slot and self.current_slot - context_slot > self.max_slot_lag:
+            return False
+        # Jupiter quotes carry inAmount, Raydium compute responses data.inputAmount
+        quoted_in = quote.get('inAmount') or (quote.get('data') or {}).get('inputAmount')
+        if quoted_in is None:
+            return True
+        return int(quoted_in) == int(amount) if exact else int(quoted_in) <= int(amount)
+
+    async def get_or_fetch(self, key, amount, fetch, exact=False):
+        """Cached quote for `key` or the result of one shared `fetch()`"""
+        return await self.cache.get_or_fetch(
+            key,
+            fetch,
+            accept=lambda quote: self._usable(quote, amount, exact)
+        )
+
+    def remember_route(self, mint, quote):
+        """Keep the route of a quote that produced a confirmed trade"""
+        route = quote.get('routePlan') or []
+        labels = [
+            step['swapInfo']['label']
+            for step in route
+            if step.get('swapInfo', {}).get('label')
+        ]
+        self.routes[mint] = {'route': route, 'labels': labels, 'updated_at': time.time()}
+
+    def last_route(self, mint):
+        return self.routes.get(mint)
+
+    def forget(self, mint):
+        self.routes.pop(mint, None)
+
+    def get_stats(self):
+        stats = self.cache.get_stats()
+        stats['routes'] = len(self.routes)
+        return stats
@@ -0,0 +1,84 @@
+import aiohttp
+from utils.config import config
+from services.scheduler import Priority
+from services.jupiter import SOL_MINT
+from services.quote_cache import QuoteCache
+from services.resilience import UpstreamError, json_or_raise
+
+
+class RaydiumClient:
+    """Raydium trade API: compute quotes and swap transactions"""
+
+    def __init__(self, scheduler=None, quote_cache=None):
+        self.session = None
+        self.scheduler = scheduler
+        self.quote_cache = quote_cache or QuoteCache.from_config()
+
+    async def initialize(self):
+        """Initialize the Raydium service"""
+        if not self.session:
+            self.session = aiohttp.ClientSession()
+
+    async def _run(self, priority, func, *args):
+        await self.initialize()
+        if self.scheduler:
+            return await self.scheduler.run('raydium', priority, func, *args)
+        return await func(*args)
+
+    async def get_quote(self, input_mint, output_mint, amount, slippage_bps,
+                        priority=Priority.ENTRY, use_cache=True):
+        """Swap-base-in quote, `amount` is in raw units of the input mint"""
+        params = {
+            'inputMint': input_mint,
+            'outputMint': output_mint,
+            'amount': str(int(amount)),
+            'slippageBps': int(slippage_bps),
+            'txVersion': 'LEGACY'
+        }
+        if not use_cache:
+            return await self._run(priority, self._get_quote, params)
+
+        key = self.quote_cache.key('raydium', input_mint, output_mint, amount, slippage_bps)
+        return await self.quote_cache.get_or_fetch(
+            key,
+            amount,
+            lambda: self._run(priority, self._get_quote, params),
+            exact=input_mint != SOL_MINT  # sells spend the whole position
+        )
+
+    async def _get_quote(self, params):
+        async with self.session.get(
+            f"{config.RAYDIUM_API_URL}/compute/swap-base-in", params=params
+        ) as response:
+            data = await json_or_raise(response, self.scheduler, 'raydium')
+            if not data.get('success', True):
+                raise UpstreamError(f"Raydium quote error: {data.get('msg')}", status=400)
+            return data
+
+    async def get_swap_transaction(self, quote, user_public_key, priority_fee=None,
+                                   wrap_sol=True, unwrap_sol=False, priority=Priority.ENTRY):
+        """Unsigned swap transaction for a compute quote as base64"""
+        payload = {
+            'computeUnitPriceMicroLamports': str(priority_fee or 0),
+            'swapResponse': quote,
+            'txVersion': 'LEGACY',
+            'wallet': str(user_public_key),
+            'wrapSol': wrap_sol,
+            'unwrapSol': unwrap_sol
+        }
+        return await self._run(priority, self._get_swap_transaction, payload)
+
+    async def _get_swap_transaction(self, payload):
+        async with self.session.post(
+            f"{config.RAYDIUM_API_URL}/transaction/swap-base-in", json=payload
+        ) as response:
+            data = await json_or_raise(response, self.scheduler, 'raydium')
+            if not data.get('success', True):
+                raise UpstreamError(f"Raydium swap error: {data.get('msg')}", status=400)
+            return data['data'][0]['transaction']
+
+    async def cleanup(self):
+        """Cleanup resources"""
+        if self.session:
+            await self.session.close()
+            self.session = None
@@ -0,0 +1,101 @@
+import asyncio
+from solders.pubkey import Pubkey
+from utils.logger import setup_logger
+from services.pools import ROLES, apply_pool_account, token_account_amount, reserves
+from services.scheduler import Priority
+
+MAX_ACCOUNTS_PER_CALL = 100  # getMultipleAccounts limit
+
+
+class ReservePoller:
+    """Pool reserves of watched tokens from batched `getMultipleAccounts` polls.
+
+    Same interface as ReserveStream for RPC endpoints without websockets.
+    Every `interval` seconds the vaults and pool accounts of all watched
+    pools are fetched in one call per `MAX_ACCOUNTS_PER_CALL` accounts
+    (chunks run concurrently), so one tick prices every pool from the same
+    slot instead of one price request per token.
+    """
+
+    def __init__(self, client, on_update=None, interval=1.0, scheduler=None,
+                 chunk_size=MAX_ACCOUNTS_PER_CALL):
+        self.logger = setup_logger("reserve_poller")
+        self.client = client
+        self.on_update = on_update
+        self.interval = interval
+        self.scheduler = scheduler
+        self.chunk_size = chunk_size
+        self.pools = {}  # mint -> pool state
+        self._task = None
+        self.polls = 0
+        self.calls = 0
+
+    def is_live(self, mint):
+        pool = self.pools.get(mint)
+        return bool(pool and self._task and reserves(pool))
+
+    async def watch(self, pool):
+        self.pools[pool['mint']] = pool
+
+    def unwatch(self, mint):
+        self.pools.pop(mint, None)
+
+    async def _fetch(self, accounts):
+        self.calls += 1
+        keys = [Pubkey.from_string(account) for account in accounts]
+        if self.scheduler:
+            return await self.scheduler.run('rpc', Priority.EXIT, self.client.get_multiple_accounts, keys)
+        return await self.client.get_multiple_accounts(keys)
+
+    async def poll_once(self):
+        """Fetch every watched account and report the updated pools"""
+        targets = [
+            (pool, role) for pool in list(self.pools.values()) for role in ROLES
+        ]
+        if not targets:
+            return
+        chunks = [targets[i:i + self.chunk_size] for i in range(0, len(targets), self.chunk_size)]
+        responses = await asyncio.gather(
+            *[self._fetch([pool[role] for pool, role in chunk]) for chunk in chunks]
+        )
+        self.polls += 1
+
+        updated = {}
+        for chunk, response in zip(chunks, responses):
+            slot = getattr(getattr(response, 'context', None), 'slot', None)
+            for (pool, role), account in zip(chunk, response.value):
+                if account is None or pool['mint'] not in self.pools:
+                    continue
+                if role == 'address':
+                    apply_pool_account(pool, account.data)
+                else:
+                    pool[f'{role}_amount'] = token_account_amount(account.data)
+                pool['slot'] = slot
+                updated[pool['mint']] = pool
+
+        if self.on_update:
+            for pool in updated.values():
+                if not reserves(pool):
+                    continue
+                try:
+                    self.on_update(pool)
+                except Exception as e:
+                    self.logger.error(f"Reserve update handler failed: {str(e)}")
+
+    async def _run(self):
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                self.logger.warning(f"Reserve poll failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -0,0 +1,180 @@
+import asyncio
+import base64
+import json
+import aiohttp
+from utils.logger import setup_logger
+from services.pools import ROLES, apply_pool_account, token_account_amount, reserves
+from services.resilience import backoff_delay
+
+
+class ReserveStream:
+    """Pool reserves of watched tokens over `accountSubscribe`.
+
+    Both vaults and the pool account of every watched pool are subscribed
+    at processed commitment. Each notification is decoded in place and,
+    once both vault amounts are known, `on_update(pool)` is called with
+    the updated pool state. The connection is kept open in the
+    background: after a drop it reconnects with backoff and subscribes
+    every watched account again.
+    """
+
+    def __init__(self, ws_url, on_update=None):
+        self.logger = setup_logger("reserve_stream")
+        self.ws_url = ws_url
+        self.on_update = on_update
+        self.session = None
+        self.ws = None
+        self.pools = {}           # mint -> pool state
+        self.accounts = {}        # account -> (mint, role)
+        self._next_id = 1
+        self._requests = {}       # request id -> account
+        self._subscriptions = {}  # subscription id -> account
+        self._account_subs = {}   # account -> subscription id
+        self._task = None
+        self.updates = 0
+        self.reconnects = 0
+
+    @property
+    def is_connected(self):
+        return self.ws is not None and not self.ws.closed
+
+    def is_live(self, mint):
+        """Whether prices for `mint` currently arrive over the stream"""
+        pool = self.pools.get(mint)
+        return bool(
+            pool and self.is_connected
+            and all(pool[role] in self._account_subs for role in ROLES)
+            and reserves(pool)
+        )
+
+    async def watch(self, pool):
+        mint = pool['mint']
+        self.pools[mint] = pool
+        for role in ROLES:
+            self.accounts[pool[role]] = (mint, role)
+            if self.is_connected:
+                await self._subscribe(pool[role])
+
+    def unwatch(self, mint):
+        pool = self.pools.pop(mint, None)
+        if not pool:
+            return
+        subs = []
+        for role in ROLES:
+            account = pool[role]
+            self.accounts.pop(account, None)
+            sub = self._account_subs.pop(account, None)
+            if sub is not None:
+                self._subscriptions.pop(sub, None)
+                subs.append(sub)
+        if subs and self.is_connected:
+            asyncio.create_task(self._unsubscribe(subs))
+
+    async def _unsubscribe(self, subs):
+        for sub in subs:
+            try:
+                await self._send('accountUnsubscribe', [sub])
+            except Exception:
+                pass
+
+    async def _send(self, method, params):
+        request_id = self._next_id
+        self._next_id += 1
+        await self.ws.send_str(json.dumps({
+            'jsonrpc': '2.0',
+            'id': request_id,
+            'method': method,
+            'params': params
+        }))
+        return request_id
+
+    async def _subscribe(self, account):
+        try:
+            request_id = await self._send(
+                'accountSubscribe',
+                [account, {'encoding': 'base64', 'commitment': 'processed'}]
+            )
+            self._requests[request_id] = account
+        except Exception as e:
+            self.logger.warning(f"accountSubscribe failed for {account[:8]}...: {str(e)}")
+
+    def _handle_message(self, message):
+        if 'id' in message and message['id'] in self._requests:
+            account = self._requests.pop(message['id'])
+            if 'result' in message and account in self.accounts:
+                self._subscriptions[message['result']] = account
+                self._account_subs[account] = message['result']
+            return
+
+        if message.get('method') != 'accountNotification':
+            return
+        params = message['params']
+        account = self._subscriptions.get(params['subscription'])
+        entry = self.accounts.get(account)
+        if not entry:
+            return
+        mint, role = entry
+        pool = self.pools[mint]
+        result = params['result']
+        data = base64.b64decode(result['value']['data'][0])
+
+        if role == 'address':
+            apply_pool_account(pool, data)
+        else:
+            pool[f'{role}_amount'] = token_account_amount(data)
+        pool['slot'] = result.get('context', {}).get('slot')
+        self.updates += 1
+
+        if self.on_update and reserves(pool):
+            try:
+                self.on_update(pool)
+            except Exception as e:
+                self.logger.error(f"Reserve update handler failed: {str(e)}")
+
+    async def _run(self):
+        attempt = 0
+        while True:
+            try:
+                if not self.session:
+                    self.session = aiohttp.ClientSession()
+                self.ws = await self.session.ws_connect(self.ws_url, heartbeat=10)
+                attempt = 0
+                self.logger.info(f"Reserve stream connected: {self.ws_url}")
+                for account in list(self.accounts):
+                    await self._subscribe(account)
+                async for msg in self.ws:
+                    if msg.type != aiohttp.WSMsgType.TEXT:
+                        if msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                            break
+                        continue
+                    self._handle_message(json.loads(msg.data))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Reserve stream error: {str(e)}")
+            finally:
+                ws, self.ws = self.ws, None
+                self._requests.clear()
+                self._subscriptions.clear()
+                self._account_subs.clear()
+                if ws and not ws.closed:
+                    await ws.close()
+            self.reconnects += 1
+            await asyncio.sleep(backoff_delay(attempt, base=0.5, cap=10.0))
+            attempt += 1
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            if self.session:
+                await self.session.close()
+                self.session = None
+        except Exception as e:
+            self.logger.error(f"Error closing reserve stream: {str(e)}")
@@ -0,0 +1,127 @@
+import random
+import time
+
+
+class UpstreamError(Exception):
+    """Error response from an upstream API"""
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class UpstreamUnavailable(UpstreamError):
+    """Raised without calling an upstream whose circuit breaker is open"""
+
+
+def _header(headers, name):
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.title())
+    return value
+
+
+def retry_after_from(headers):
+    """Seconds to wait from a Retry-After header, if any"""
+    value = _header(headers, 'retry-after')
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def rate_limit_from(headers):
+    """Requests per second the upstream still allows, from X-RateLimit headers"""
+    remaining = _header(headers, 'x-ratelimit-remaining')
+    reset = _header(headers, 'x-ratelimit-reset')
+    if remaining is None or reset is None:
+        return None
+    try:
+        remaining, reset = float(remaining), float(reset)
+    except ValueError:
+        return None
+    if reset > 1e9:  # epoch seconds rather than a delay
+        reset -= time.time()
+    return remaining / max(reset, 1.0)
+
+
+def is_transient(error):
+    """Whether retrying (and counting the failure against the host) makes sense"""
+    if isinstance(error, UpstreamUnavailable):
+        return False
+    if isinstance(error, UpstreamError):
+        return error.status is None or error.status == 429 or error.status >= 500
+    return not isinstance(error, (ValueError, TypeError, KeyError))
+
+
+def backoff_delay(attempt, base=0.25, cap=4.0):
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+async def json_or_raise(response, scheduler=None, upstream=None):
+    """Parsed JSON of a successful response; reports headers to the scheduler"""
+    if scheduler and upstream:
+        scheduler.observe(upstream, response.status, response.headers)
+    if response.status != 200:
+        raise UpstreamError(
+            f"{upstream or 'upstream'} error {response.status}: {await response.text()}",
+            status=response.status,
+            retry_after=retry_after_from(response.headers)
+        )
+    return await response.json()
+
+
+class CircuitBreaker:
+    """Fails fast after repeated transient failures.
+
+    Opens after `failure_threshold` consecutive failures. After
+    `reset_timeout` seconds one probe call is let through (half open); its
+    success closes the breaker, its failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+
+    def allow(self):
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self.probing = False
+        if self.state == self.HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.probing = False
+
+    def release_probe(self):
+        """A probe ended without a verdict (cancelled), let another one through"""
+        if self.state == self.HALF_OPEN:
+            self.probing = False
@@ -0,0 +1,64 @@
+from utils.config import config
+from services.pools import reserves
+
+LP_WITHDRAWAL = 'lp_withdrawal'
+LIQUIDITY_DRAIN = 'liquidity_drain'
+LARGE_SELL = 'large_sell'
+
+
+class RugDetector:
+    """Liquidity pulls and dumps spotted from a pool's reserve updates.
+
+    Each update is compared with the previous one and with the highs
+    since the pool was first seen, in O(1): LP supply falling more than
+    `lp_drop` below its high means liquidity is being withdrawn, the SOL
+    reserve falling more than `sol_drop` below its high means the pool is
+    being drained, and a single update taking more than `sell_ratio` of
+    the SOL reserve is a large sell. All thresholds are fractions.
+    """
+
+    def __init__(self, lp_drop=0.1, sol_drop=0.5, sell_ratio=0.15):
+        self.lp_drop = lp_drop
+        self.sol_drop = sol_drop
+        self.sell_ratio = sell_ratio
+        self.state = {}  # mint -> last and peak reserves
+        self.alerts = 0
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            lp_drop=getattr(config, 'RUG_LP_DROP', 0.1),
+            sol_drop=getattr(config, 'RUG_SOL_DROP', 0.5),
+            sell_ratio=getattr(config, 'RUG_SELL_RATIO', 0.15)
+        )
+
+    def update(self, pool):
+        """Record a pool update, returns the alert it raises or None"""
+        current = reserves(pool)
+        if not current:
+            return None
+        sol = current[1]
+        lp = pool['lp_reserve']
+        state = self.state.get(pool['mint'])
+        if state is None:
+            self.state[pool['mint']] = {'sol': sol, 'lp': lp, 'peak_sol': sol, 'peak_lp': lp}
+            return None
+
+        alert = None
+        if state['peak_lp'] and lp < state['peak_lp'] * (1 - self.lp_drop):
+            alert = LP_WITHDRAWAL
+        elif sol < state['peak_sol'] * (1 - self.sol_drop):
+            alert = LIQUIDITY_DRAIN
+        elif sol < state['sol'] * (1 - self.sell_ratio):
+            alert = LARGE_SELL
+
+        state['sol'] = sol
+        state['lp'] = lp
+        state['peak_sol'] = max(state['peak_sol'], sol)
+        state['peak_lp'] = max(state['peak_lp'], lp)
+        if alert:
+            self.alerts += 1
+        return alert
+
+    def forget(self, mint):
+        self.state.pop(mint, None)
@@ -0,0 +1,269 @@
+import asyncio
+import heapq
+import itertools
+import time
+from utils.logger import setup_logger
+from utils.config import config
+from services.resilience import (
+    CircuitBreaker,
+    UpstreamError,
+    UpstreamUnavailable,
+    backoff_delay,
+    is_transient,
+    rate_limit_from,
+    retry_after_from
+)
+
+
+class Priority:
+    EMERGENCY_EXIT = 0
+    EXIT = 1
+    ENTRY = 2
+    ENRICHMENT = 3
+
+    NAMES = {0: 'emergency_exit', 1: 'exit', 2: 'entry', 3: 'enrichment'}
+
+
+# Per-upstream concurrency and requests per second
+DEFAULT_LIMITS = {
+    'jupiter_quote': {'concurrency': 4, 'rate': 10},
+    'jupiter_swap': {'concurrency': 4, 'rate': 10},
+    'jupiter_price': {'concurrency': 2, 'rate': 10},
+    'raydium': {'concurrency': 4, 'rate': 10},
+    'dexscreener': {'concurrency': 2, 'rate': 5},
+    'rpc': {'concurrency': 8, 'rate': 40},
+}
+
+
+class _Upstream:
+    def __init__(self, name, concurrency, rate, reserved_for_exits, breaker):
+        self.name = name
+        self.concurrency = concurrency
+        self.base_rate = rate
+        self.rate = rate
+        self.min_rate = max(0.2, rate / 20)
+        self.breaker = breaker
+        self.failures = 0
+        self.throttled = 0
+        self.rejected = 0
+        # Entries and enrichment can never take the last slots
+        self.reserved_for_exits = min(reserved_for_exits, concurrency - 1)
+        self.active = 0
+        self.waiting = []  # heap of (priority, seq, enqueued_at, future)
+        self.tokens = float(max(1, rate))
+        self.refilled_at = time.monotonic()
+        self.wakeup = None
+
+    def refill(self):
+        now = time.monotonic()
+        burst = max(1.0, float(self.rate))
+        self.tokens = min(burst, self.tokens + (now - self.refilled_at) * self.rate)
+        self.refilled_at = now
+
+    def capacity_for(self, priority):
+        if priority <= Priority.EXIT:
+            return self.concurrency
+        return self.concurrency - self.reserved_for_exits
+
+    def throttle(self, retry_after=None):
+        """Halve the rate after a 429 and hold new calls for `retry_after`"""
+        self.throttled += 1
+        self.refill()
+        self.rate = max(self.min_rate, self.rate / 2)
+        if retry_after:
+            self.tokens = min(self.tokens, 1 - retry_after * self.rate)
+
+    def tune(self, allowed_rate):
+        """Follow the rate the upstream reports, or creep back to the configured one"""
+        self.refill()
+        if allowed_rate is not None:
+            self.rate = min(self.base_rate, max(self.min_rate, allowed_rate))
+        else:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * 0.1)
+
+
+class ExecutionScheduler:
+    """Prioritized admission for every call to Jupiter, Raydium and RPC.
+
+    Work is queued per upstream and started strictly by priority class
+    (emergency exit > exit > entry > enrichment), within the upstream's
+    concurrency and rate limits. A slot per upstream is held back for exits
+    so a burst of entries can never make a stop-loss wait. Queue times are
+    recorded per upstream and priority.
+
+    Each upstream also has a circuit breaker and an adaptive rate: a 429
+    halves the rate and honours Retry-After, X-RateLimit headers set it,
+    and successes raise it back towards the configured limit. While the
+    breaker is open calls fail fast with `UpstreamUnavailable`.
+    """
+
+    def __init__(self, limits=None, reserved_for_exits=1, failure_threshold=5, reset_timeout=10.0):
+        self.logger = setup_logger("scheduler")
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self.reserved_for_exits = reserved_for_exits
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.upstreams = {}
+        self.stats = {}  # (upstream, priority) -> {'count', 'total_ms', 'max_ms'}
+        self._seq = itertools.count()
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            limits=getattr(config, 'UPSTREAM_LIMITS', None),
+            failure_threshold=getattr(config, 'BREAKER_FAILURE_THRESHOLD', 5),
+            reset_timeout=getattr(config, 'BREAKER_RESET_S', 10.0)
+        )
+
+    def _upstream(self, name):
+        upstream = self.upstreams.get(name)
+        if not upstream:
+            limits = self.limits.get(name, {'concurrency': 4, 'rate': 10})
+            upstream = _Upstream(
+                name,
+                limits['concurrency'],
+                limits['rate'],
+                self.reserved_for_exits,
+                CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            )
+            self.upstreams[name] = upstream
+        return upstream
+
+    def _record(self, upstream, priority, queued_ms):
+        stats = self.stats.setdefault(
+            (upstream.name, priority),
+            {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        )
+        stats['count'] += 1
+        stats['total_ms'] += queued_ms
+        stats['max_ms'] = max(stats['max_ms'], queued_ms)
+
+    def _dispatch(self, upstream):
+        """Start as many queued calls as limits allow, highest priority first"""
+        upstream.wakeup = None
+        while upstream.waiting:
+            priority, _, enqueued_at, future = upstream.waiting[0]
+            if future.done():
+                heapq.heappop(upstream.waiting)
+                continue
+            if upstream.active >= upstream.capacity_for(priority):
+                # Lower classes have at most the same capacity, nothing else can start
+                return
+            upstream.refill()
+            if upstream.tokens < 1:
+                delay = (1 - upstream.tokens) / upstream.rate
+                upstream.wakeup = asyncio.get_running_loop().call_later(
+                    delay, self._dispatch, upstream
+                )
+                return
+            heapq.heappop(upstream.waiting)
+            upstream.tokens -= 1
+            upstream.active += 1
+            self._record(upstream, priority, (time.monotonic() - enqueued_at) * 1000)
+            future.set_result(None)
+
+    async def acquire(self, name, priority):
+        upstream = self._upstream(name)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            upstream.waiting,
+            (priority, next(self._seq), time.monotonic(), future)
+        )
+        if not upstream.wakeup:
+            self._dispatch(upstream)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(name)
+            future.cancel()
+            raise
+
+    def release(self, name):
+        upstream = self._upstream(name)
+        upstream.active -= 1
+        if not upstream.wakeup:
+            self._dispatch(upstream)
+
+    def observe(self, name, status, headers=None):
+        """Tune the upstream's rate from a response status and headers"""
+        upstream = self._upstream(name)
+        if status == 429:
+            upstream.throttle(retry_after_from(headers))
+        elif status < 400:
+            upstream.tune(rate_limit_from(headers))
+
+    async def run(self, name, priority, func, *args, **kwargs):
+        """Run `func(*args, **kwargs)` once `name` admits work of this priority"""
+        return await self.call(name, priority, func, *args, retries=0, **kwargs)
+
+    async def call(self, name, priority, func, *args, retries=0, **kwargs):
+        """Like `run`, retrying transient failures with jittered backoff"""
+        upstream = self._upstream(name)
+        for attempt in range(retries + 1):
+            if not upstream.breaker.allow():
+                upstream.rejected += 1
+                raise UpstreamUnavailable(f"{name} is failing, circuit open")
+
+            await self.acquire(name, priority)
+            error = None
+            try:
+                result = await func(*args, **kwargs)
+                status = getattr(result, 'status', None)
+                if isinstance(status, int) and hasattr(result, 'headers'):
+                    # Raw HTTP response, the caller reads the body
+                    self.observe(name, status, result.headers)
+                    if status == 429 or status >= 500:
+                        result.release()
+                        raise UpstreamError(
+                            f"{name} error {status}",
+                            status=status,
+                            retry_after=retry_after_from(result.headers)
+                        )
+                upstream.breaker.record_success()
+                return result
+            except asyncio.CancelledError:
+                upstream.breaker.release_probe()
+                raise
+            except Exception as e:
+                if not is_transient(e):
+                    # The host answered, the request itself was bad
+                    upstream.breaker.record_success()
+                    raise
+                upstream.failures += 1
+                upstream.breaker.record_failure()
+                if attempt == retries:
+                    raise
+                error = e
+            finally:
+                self.release(name)
+
+            delay = getattr(error, 'retry_after', None) or backoff_delay(attempt)
+            self.logger.warning(
+                f"{name} attempt {attempt + 1}/{retries + 1} failed, retrying in {delay:.2f}s: {str(error)}"
+            )
+            await asyncio.sleep(delay)
+
+    def get_metrics(self):
+        """Queue depth, in-flight calls and queue times per upstream"""
+        metrics = {}
+        for name, upstream in self.upstreams.items():
+            metrics[name] = {
+                'active': upstream.active,
+                'queued': sum(1 for entry in upstream.waiting if not entry[3].done()),
+                'rate': upstream.rate,
+                'breaker': upstream.breaker.state,
+                'breaker_trips': upstream.breaker.trips,
+                'failures': upstream.failures,
+                'throttled': upstream.throttled,
+                'rejected': upstream.rejected,
+                'queue_ms': {}
+            }
+        for (name, priority), stats in self.stats.items():
+            metrics[name]['queue_ms'][Priority.NAMES[priority]] = {
+                'count': stats['count'],
+                'avg': stats['total_ms'] / stats['count'],
+                'max': stats['max_ms']
+            }
+        return metrics
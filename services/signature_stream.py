@@ -0,0 +1,259 @@
+import asyncio
+import json
+import aiohttp
+from solders.signature import Signature
+from utils.logger import setup_logger
+from utils.config import config
+
+
+def ws_url_from_rpc(rpc_url):
+    """Derive the websocket endpoint for an HTTP RPC endpoint"""
+    if rpc_url.startswith("https://"):
+        return "wss://" + rpc_url[len("https://"):]
+    if rpc_url.startswith("http://"):
+        return "ws://" + rpc_url[len("http://"):]
+    return rpc_url
+
+
+def default_ws_url():
+    """Websocket endpoint from config, falling back to the first RPC endpoint"""
+    ws_url = getattr(config, 'WS_ENDPOINT', None)
+    if ws_url:
+        return ws_url
+    return ws_url_from_rpc(config.RPC_ENDPOINTS[0])
+
+
+def signature_str(signature):
+    """Normalize send_transaction results and raw signatures to a string"""
+    return str(getattr(signature, 'value', signature))
+
+
+class SignatureStream:
+    """Signature confirmations over a shared RPC websocket.
+
+    Every signature gets two `signatureSubscribe` subscriptions, one at
+    `processed` and one at `confirmed`, so callers learn that a transaction
+    landed before it is confirmed. If the socket is unavailable or drops
+    mid-wait, the wait falls back to polling `getSignatureStatuses`.
+    """
+
+    COMMITMENTS = ('processed', 'confirmed')
+
+    def __init__(self, ws_url, rpc_client=None, poll_interval=0.5, resync_interval=2.0):
+        self.logger = setup_logger("signature_stream")
+        self.ws_url = ws_url
+        self.rpc_client = rpc_client
+        self.poll_interval = poll_interval
+        self.resync_interval = resync_interval
+        self.session = None
+        self.ws = None
+        self._reader = None
+        self._connect_lock = asyncio.Lock()
+        self._next_id = 1
+        self._requests = {}       # request id -> (signature, commitment)
+        self._subscriptions = {}  # subscription id -> (signature, commitment)
+        self._waiters = {}        # signature -> asyncio.Queue of (event, value)
+
+    @property
+    def is_connected(self):
+        return self.ws is not None and not self.ws.closed
+
+    async def _ensure_connected(self):
+        """Open the websocket if needed, returns False when unavailable"""
+        async with self._connect_lock:
+            if self.is_connected:
+                return True
+            try:
+                if not self.session:
+                    self.session = aiohttp.ClientSession()
+                self.ws = await self.session.ws_connect(self.ws_url, heartbeat=10)
+                self._reader = asyncio.create_task(self._read_loop(self.ws))
+                self.logger.info(f"Signature stream connected: {self.ws_url}")
+                return True
+            except Exception as e:
+                self.logger.warning(f"Signature stream unavailable, polling instead: {str(e)}")
+                self.ws = None
+                return False
+
+    async def _read_loop(self, ws):
+        """Dispatch subscription responses and notifications"""
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    if msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                        break
+                    continue
+                self._handle_message(json.loads(msg.data))
+        except Exception as e:
+            self.logger.warning(f"Signature stream read error: {str(e)}")
+        finally:
+            if self.ws is ws:
+                self.ws = None
+            self._requests.clear()
+            self._subscriptions.clear()
+            # Every in-flight wait switches to polling
+            for queue in self._waiters.values():
+                queue.put_nowait(('dropped', None))
+
+    def _handle_message(self, message):
+        if 'id' in message and message['id'] in self._requests:
+            signature, commitment = self._requests.pop(message['id'])
+            if 'result' in message and signature in self._waiters:
+                self._subscriptions[message['result']] = (signature, commitment)
+            return
+
+        if message.get('method') == 'signatureNotification':
+            params = message['params']
+            entry = self._subscriptions.pop(params['subscription'], None)
+            if not entry:
+                return
+            signature, commitment = entry
+            queue = self._waiters.get(signature)
+            if queue:
+                result = params['result']
+                queue.put_nowait((commitment, {
+                    'slot': result.get('context', {}).get('slot'),
+                    'err': result.get('value', {}).get('err')
+                }))
+
+    async def _subscribe(self, signature):
+        if not await self._ensure_connected():
+            return False
+        try:
+            for commitment in self.COMMITMENTS:
+                request_id = self._next_id
+                self._next_id += 1
+                self._requests[request_id] = (signature, commitment)
+                await self.ws.send_str(json.dumps({
+                    'jsonrpc': '2.0',
+                    'id': request_id,
+                    'method': 'signatureSubscribe',
+                    'params': [signature, {'commitment': commitment}]
+                }))
+            return True
+        except Exception as e:
+            self.logger.warning(f"signatureSubscribe failed: {str(e)}")
+            return False
+
+    async def _unsubscribe(self, signature):
+        """Drop leftover subscriptions for a finished signature"""
+        stale = [sub for sub, (sig, _) in self._subscriptions.items() if sig == signature]
+        for sub in stale:
+            del self._subscriptions[sub]
+            if self.is_connected:
+                try:
+                    request_id = self._next_id
+                    self._next_id += 1
+                    await self.ws.send_str(json.dumps({
+                        'jsonrpc': '2.0',
+                        'id': request_id,
+                        'method': 'signatureUnsubscribe',
+                        'params': [sub]
+                    }))
+                except Exception:
+                    pass
+
+    async def _poll_status(self, signature):
+        """Single getSignatureStatuses lookup, returns (event, value) or None"""
+        if not self.rpc_client:
+            return None
+        try:
+            response = await self.rpc_client.get_signature_statuses(
+                [Signature.from_string(signature)]
+            )
+            status = response.value[0]
+            if status is None:
+                return None
+            value = {'slot': status.slot, 'err': status.err}
+            level = str(status.confirmation_status).split('.')[-1].lower()
+            if status.err is not None or level in ('confirmed', 'finalized'):
+                return ('confirmed', value)
+            return ('processed', value)
+        except Exception as e:
+            self.logger.warning(f"Signature status poll failed: {str(e)}")
+            return None
+
+    async def _poll_loop(self, signature, queue):
+        while True:
+            event = await self._poll_status(signature)
+            if event:
+                queue.put_nowait(event)
+                if event[0] == 'confirmed':
+                    return
+            await asyncio.sleep(self.poll_interval)
+
+    async def wait(self, signature, on_processed=None, timeout=30):
+        """Wait for a signature to confirm.
+
+        `on_processed` is awaited (or called) once with the result dict as
+        soon as the transaction is seen at processed commitment.
+        Returns a dict with `status` of confirmed, failed or timeout.
+        """
+        signature = signature_str(signature)
+        queue = asyncio.Queue()
+        self._waiters[signature] = queue
+        poller = None
+        result = {'signature': signature, 'status': 'timeout', 'slot': None, 'err': None}
+
+        async def _consume():
+            nonlocal poller
+            processed_seen = False
+            while True:
+                try:
+                    event, value = await asyncio.wait_for(queue.get(), self.resync_interval)
+                except asyncio.TimeoutError:
+                    # Catch signatures that landed before the subscription did
+                    polled = await self._poll_status(signature)
+                    if not polled:
+                        continue
+                    event, value = polled
+
+                if event == 'dropped':
+                    if not poller:
+                        self.logger.info(f"Signature stream dropped, polling {signature[:8]}...")
+                        poller = asyncio.create_task(self._poll_loop(signature, queue))
+                    continue
+
+                result.update(value)
+                if value['err'] is not None:
+                    result['status'] = 'failed'
+                    return
+                if not processed_seen:
+                    # A confirmed status implies processed, always report it first
+                    processed_seen = True
+                    result['status'] = 'processed'
+                    if on_processed:
+                        callback_result = on_processed(dict(result))
+                        if asyncio.iscoroutine(callback_result):
+                            await callback_result
+                if event == 'confirmed':
+                    result['status'] = 'confirmed'
+                    return
+
+        try:
+            if not await self._subscribe(signature):
+                queue.put_nowait(('dropped', None))
+            await asyncio.wait_for(_consume(), timeout)
+        except asyncio.TimeoutError:
+            result['status'] = 'timeout'
+        finally:
+            if poller:
+                poller.cancel()
+            self._waiters.pop(signature, None)
+            await self._unsubscribe(signature)
+
+        return result
+
+    async def close(self):
+        """Close the websocket and session"""
+        try:
+            if self.ws and not self.ws.closed:
+                await self.ws.close()
+            if self._reader:
+                await asyncio.gather(self._reader, return_exceptions=True)
+                self._reader = None
+            if self.session:
+                await self.session.close()
+                self.session = None
+        except Exception as e:
+            self.logger.error(f"Error closing signature stream: {str(e)}")
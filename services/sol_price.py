@@ -0,0 +1,93 @@
+import asyncio
+import time
+from utils.logger import setup_logger
+from utils.config import config
+
+
+class SolPriceFeed:
+    """SOL/USD reference price refreshed in the background.
+
+    `sources` are coroutine functions returning the SOL price in USD, tried
+    in order until one answers. The last good value is served from memory,
+    so reading it costs nothing on the price update path. A value older
+    than `max_age` seconds is stale: `usd` then returns None and callers
+    fall back to their own conversion instead of using a wrong rate.
+    """
+
+    def __init__(self, sources, refresh_interval=10.0, max_age=60.0):
+        self.logger = setup_logger("sol_price")
+        self.sources = sources
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.price = None
+        self.updated_at = None
+        self._task = None
+        self.refreshes = 0
+        self.failures = 0
+
+    @classmethod
+    def from_config(cls, sources):
+        return cls(
+            sources,
+            refresh_interval=getattr(config, 'SOL_USD_REFRESH_S', 10.0),
+            max_age=getattr(config, 'SOL_USD_MAX_AGE_S', 60.0)
+        )
+
+    @property
+    def age(self):
+        return time.time() - self.updated_at if self.updated_at else None
+
+    @property
+    def usd(self):
+        """USD per SOL, or None when no fresh value is known"""
+        if self.updated_at is None or time.time() - self.updated_at > self.max_age:
+            return None
+        return self.price
+
+    def to_usd(self, sol_amount):
+        rate = self.usd
+        return sol_amount * rate if rate else None
+
+    async def refresh(self):
+        """Fetch a new price; the previous value stays on failure"""
+        for source in self.sources:
+            try:
+                price = await source()
+            except Exception as e:
+                self.logger.debug(f"SOL/USD source failed: {str(e)}")
+                continue
+            if price and price > 0:
+                self.price = float(price)
+                self.updated_at = time.time()
+                self.refreshes += 1
+                return self.price
+        self.failures += 1
+        if self.age and self.age > self.max_age:
+            self.logger.warning(f"SOL/USD price stale for {self.age:.0f}s")
+        return None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    async def start(self):
+        """Load a first price, then keep it fresh in the background"""
+        if not self._task:
+            await self.refresh()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get_stats(self):
+        return {
+            'price': self.price,
+            'age': self.age,
+            'stale': self.usd is None,
+            'refreshes': self.refreshes,
+            'failures': self.failures
+        }
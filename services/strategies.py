@@ -0,0 +1,184 @@
+import time
+from collections import deque
+from utils.logger import setup_logger
+from utils.config import config
+from services.position_book import PositionBook
+
+LIVE = 'live'
+SHADOW = 'shadow'
+
+
+class Strategy:
+    """Entry filter and exit thresholds of one parameter set.
+
+    Thresholds are fractions of the entry price (`stop_loss` is the size
+    of the loss, 0.2 for -20%). Override `should_enter` in a subclass to
+    plug in other entry rules; exits are evaluated from `levels`.
+    """
+
+    def __init__(self, name, mode=LIVE, take_profit=0.5, stop_loss=0.2,
+                 position_size=0.1, max_trades=5, max_token_age=120):
+        self.name = name
+        self.mode = mode
+        self.take_profit = take_profit
+        self.stop_loss = stop_loss
+        self.position_size = position_size
+        self.max_trades = max_trades
+        self.max_token_age = max_token_age
+
+    @classmethod
+    def from_dict(cls, params):
+        """Strategy from a `strategies` config entry, unset values from `trading`"""
+        return cls(
+            params.get('name', 'default'),
+            mode=params.get('mode', LIVE),
+            take_profit=params.get('take_profit', getattr(config, 'TAKE_PROFIT', 0.5)),
+            stop_loss=params.get('stop_loss', getattr(config, 'STOP_LOSS', 0.2)),
+            position_size=params.get('position_size', getattr(config, 'POSITION_SIZE_SOL', 0.1)),
+            max_trades=params.get('max_trades', getattr(config, 'MAX_HOLDINGS', 5)),
+            max_token_age=params.get('max_token_age', 120)
+        )
+
+    @property
+    def shadow(self):
+        return self.mode == SHADOW
+
+    def should_enter(self, token_data):
+        return (
+            float(token_data.get('price') or 0) > 0
+            and time.time() - token_data.get('created_at', 0) <= self.max_token_age
+        )
+
+    def levels(self, entry_price):
+        """(stop price, target price) of a position entered at `entry_price`"""
+        return entry_price * (1 - self.stop_loss), entry_price * (1 + self.take_profit)
+
+
+class ShadowBook:
+    """Positions a shadow strategy would hold, filled at the scouted price.
+
+    No orders are placed; entries and exits are recorded at the prices the
+    live pipeline already receives, so results compare directly with the
+    live strategy.
+    """
+
+    def __init__(self, strategy, history=1000):
+        self.strategy = strategy
+        self.book = PositionBook()
+        self.positions = {}  # mint -> entry price and time
+        self.closed = deque(maxlen=history)
+        self.realized_sol = 0.0
+        self.wins = 0
+        self.trades = 0
+
+    def open(self, mint, price):
+        if mint in self.positions or len(self.positions) >= self.strategy.max_trades:
+            return False
+        stop_price, target_price = self.strategy.levels(price)
+        self.book.add(mint, price, self.strategy.position_size, stop_price, target_price)
+        self.positions[mint] = {'entry_price': price, 'entry_time': time.time()}
+        return True
+
+    def on_prices(self, prices):
+        """Close positions hit by `prices`, returns the closed trades"""
+        closed = []
+        for mint, price, reason in self.book.evaluate(prices):
+            position = self.positions.pop(mint)
+            self.book.remove(mint)
+            change = (price - position['entry_price']) / position['entry_price']
+            trade = {
+                'mint': mint,
+                'entry_price': position['entry_price'],
+                'exit_price': price,
+                'change': change,
+                'profit_sol': change * self.strategy.position_size,
+                'reason': reason,
+                'held_s': time.time() - position['entry_time']
+            }
+            self.closed.append(trade)
+            self.realized_sol += trade['profit_sol']
+            self.trades += 1
+            self.wins += change > 0
+            closed.append(trade)
+        return closed
+
+    def get_stats(self):
+        return {
+            'mode': self.strategy.mode,
+            'open': len(self.positions),
+            'trades': self.trades,
+            'win_rate': self.wins / self.trades if self.trades else None,
+            'realized_sol': self.realized_sol
+        }
+
+
+class StrategyHost:
+    """One live strategy and any number of shadows on one market-data feed.
+
+    The trading agent hands every scouted token and every price it
+    receives to the host once; each shadow keeps its own book. Tokens only
+    shadows hold are priced in the same batched requests as live
+    positions, price polls and pool reserve updates alike, so adding a
+    strategy adds no separate polling.
+    """
+
+    def __init__(self, strategies):
+        self.logger = setup_logger("strategies")
+        strategies = list(strategies) or [Strategy('default')]
+        live = [strategy for strategy in strategies if not strategy.shadow]
+        if not live:
+            self.logger.warning(f"No live strategy configured, trading {strategies[0].name}")
+            live = [strategies[0]]
+        for strategy in live[1:]:
+            self.logger.warning(f"Only one live strategy is supported, running {strategy.name} as shadow")
+            strategy.mode = SHADOW
+        self.live = live[0]
+        self.live.mode = LIVE
+        self.shadows = [ShadowBook(strategy) for strategy in strategies if strategy is not self.live]
+
+    @classmethod
+    def from_config(cls):
+        entries = getattr(config, 'STRATEGIES', None) or [{'name': 'default'}]
+        return cls([Strategy.from_dict(entry) for entry in entries])
+
+    @property
+    def watched(self):
+        """Mints held by at least one shadow"""
+        return {mint for shadow in self.shadows for mint in shadow.positions}
+
+    def on_token(self, token_data):
+        """Offer a scouted token to every shadow, returns the ones that entered"""
+        entered = []
+        for shadow in self.shadows:
+            if shadow.strategy.should_enter(token_data) and shadow.open(
+                token_data['address'], float(token_data['price'])
+            ):
+                entered.append(shadow.strategy.name)
+        return entered
+
+    def on_prices(self, prices):
+        for shadow in self.shadows:
+            for trade in shadow.on_prices(prices):
+                self.logger.info(
+                    f"[shadow {shadow.strategy.name}] {trade['reason']} {trade['mint'][:8]}... "
+                    f"{trade['change'] * 100:+.2f}% ({trade['profit_sol']:+.4f} SOL)"
+                )
+
+    def next_delay(self, mint, price, cadence, volatility=None):
+        """Soonest check any shadow holding `mint` needs"""
+        delays = [
+            cadence.next_delay(
+                (price - shadow.positions[mint]['entry_price']) / shadow.positions[mint]['entry_price'],
+                shadow.strategy.take_profit,
+                -shadow.strategy.stop_loss,
+                volatility
+            )
+            for shadow in self.shadows if mint in shadow.positions
+        ]
+        return min(delays) if delays else None
+
+    def get_stats(self):
+        stats = {self.live.name: {'mode': LIVE}}
+        for shadow in self.shadows:
+            stats[shadow.strategy.name] = shadow.get_stats()
+        return stats
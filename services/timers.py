@@ -0,0 +1,141 @@
+import asyncio
+import math
+import time
+from utils.logger import setup_logger
+from utils.config import config
+
+
+class TimerWheel:
+    """Hashed timer wheel for per-position deadlines.
+
+    Timers live in `slots` buckets of `tick` seconds; scheduling and
+    cancelling are O(1) and each tick only looks at one bucket, so firing
+    cost does not grow with the number of positions. Deadlines further out
+    than one turn of the wheel wait in their bucket for later turns. Keys
+    identify timers, usually `(mint, kind)`: scheduling an existing key
+    replaces it and `cancel_all(mint)` drops every timer of a position.
+    Callbacks may be plain functions or coroutine functions.
+    """
+
+    def __init__(self, tick=0.1, slots=1024):
+        self.logger = setup_logger("timers")
+        self.tick = tick
+        self.slots = [dict() for _ in range(slots)]
+        self.timers = {}  # key -> (expiry tick, callback, args)
+        self.by_owner = {}  # key[0] -> set of keys
+        self.started = time.monotonic()
+        self.current = 0  # next tick to process
+        self.fired = 0
+        self._wake = asyncio.Event()
+        self._task = None
+        self._callbacks = set()
+
+    @classmethod
+    def from_config(cls):
+        return cls(tick=getattr(config, 'TIMER_TICK_MS', 100) / 1000)
+
+    def __len__(self):
+        return len(self.timers)
+
+    def __contains__(self, key):
+        return key in self.timers
+
+    def _now_tick(self):
+        return int((time.monotonic() - self.started) / self.tick)
+
+    def schedule(self, key, delay, callback, *args):
+        """Run `callback(*args)` in `delay` seconds"""
+        self.cancel(key)
+        expiry = max(self.current, self._now_tick() + math.ceil(max(0.0, delay) / self.tick))
+        self.timers[key] = (expiry, callback, args)
+        self.slots[expiry % len(self.slots)][key] = expiry
+        self.by_owner.setdefault(self._owner(key), set()).add(key)
+        self._wake.set()
+
+    def remaining(self, key):
+        """Seconds until a timer fires, None when it is not scheduled"""
+        timer = self.timers.get(key)
+        if not timer:
+            return None
+        return max(0.0, timer[0] * self.tick - (time.monotonic() - self.started))
+
+    @staticmethod
+    def _owner(key):
+        return key[0] if isinstance(key, tuple) else key
+
+    def cancel(self, key):
+        timer = self.timers.pop(key, None)
+        if not timer:
+            return False
+        self.slots[timer[0] % len(self.slots)].pop(key, None)
+        owner = self._owner(key)
+        keys = self.by_owner.get(owner)
+        if keys:
+            keys.discard(key)
+            if not keys:
+                del self.by_owner[owner]
+        return True
+
+    def cancel_all(self, owner):
+        for key in list(self.by_owner.get(owner, ())):
+            self.cancel(key)
+
+    def advance(self):
+        """Fire every timer due by now, returns how many fired"""
+        now = self._now_tick()
+        fired = 0
+        while self.current <= now:
+            bucket = self.slots[self.current % len(self.slots)]
+            due = [key for key, expiry in bucket.items() if expiry <= self.current]
+            for key in due:
+                _, callback, args = self.timers[key]
+                self.cancel(key)
+                self._fire(key, callback, args)
+                fired += 1
+            self.current += 1
+            if not self.timers:
+                # Nothing left, skip straight to the present
+                self.current = max(self.current, now + 1)
+        self.fired += fired
+        return fired
+
+    def _fire(self, key, callback, args):
+        try:
+            result = callback(*args)
+            if asyncio.iscoroutine(result):
+                task = asyncio.create_task(result)
+                self._callbacks.add(task)
+                task.add_done_callback(self._callback_done)
+        except Exception as e:
+            self.logger.error(f"Timer {key} failed: {str(e)}")
+
+    def _callback_done(self, task):
+        self._callbacks.discard(task)
+        if not task.cancelled() and task.exception():
+            self.logger.error(f"Timer callback failed: {str(task.exception())}")
+
+    async def _run(self):
+        while True:
+            self.advance()
+            if not self.timers:
+                self._wake.clear()
+                await self._wake.wait()
+                self.current = max(self.current, self._now_tick())
+                continue
+            await asyncio.sleep(self.tick)
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for task in list(self._callbacks):
+            task.cancel()
+        self.timers.clear()
+        self.by_owner.clear()
+        for bucket in self.slots:
+            bucket.clear()
@@ -0,0 +1,51 @@
+import asyncio
+
+
+class TradeSlots:
+    """Reservation-based admission for new positions.
+
+    `reserve` checks capacity and claims both a slot and the mint in one
+    synchronous step, so concurrent token handlers cannot all pass the
+    checks before any of their buys land. A reservation becomes an open
+    position with `open` and is given back with `release` when the buy
+    fails or the position is closed. `buying` caps concurrent in-flight
+    buys independently of the number of open positions.
+    """
+
+    RESERVED = 'reserved'
+    OPEN = 'open'
+
+    def __init__(self, max_trades, max_inflight_buys=3):
+        self.max_trades = max_trades
+        self.max_inflight_buys = max_inflight_buys
+        self.held = {}  # mint -> RESERVED or OPEN
+        self._inflight = asyncio.Semaphore(max_inflight_buys)
+
+    @property
+    def in_use(self):
+        return len(self.held)
+
+    @property
+    def open_count(self):
+        return sum(1 for state in self.held.values() if state == self.OPEN)
+
+    def reserve(self, mint):
+        """Claim a slot for `mint`, returns (reserved, reason)"""
+        if mint in self.held:
+            return False, "Token already reserved or in active trades"
+        if len(self.held) >= self.max_trades:
+            return False, "Maximum active trades reached"
+        self.held[mint] = self.RESERVED
+        return True, None
+
+    def open(self, mint):
+        """Turn a reservation into an open position"""
+        self.held[mint] = self.OPEN
+
+    def release(self, mint):
+        """Give back the slot and the mint lock"""
+        self.held.pop(mint, None)
+
+    def buying(self):
+        """Context manager bounding concurrent in-flight buys"""
+        return self._inflight
@@ -0,0 +1,191 @@
+import asyncio
+import json
+from solana.rpc.commitment import Confirmed
+from solders.signature import Signature
+from utils.logger import setup_logger
+from services.signature_stream import signature_str
+from services.scheduler import Priority
+
+# Simulation failures that depend on timing rather than the transaction itself
+TRANSIENT_ERRORS = ('BlockhashNotFound', 'AlreadyProcessed', 'AccountInUse', 'WouldExceed')
+
+
+def classify_simulation_error(err, logs):
+    """Turn a failed simulation into a structured error, None if not deterministic"""
+    text = f"{err} {' '.join(logs or [])}"
+    if any(transient in text for transient in TRANSIENT_ERRORS):
+        return None
+
+    lowered = text.lower()
+    if 'slippage' in lowered:
+        kind = 'slippage'
+    elif 'insufficient funds' in lowered or 'insufficient lamports' in lowered or 'insufficientfunds' in lowered:
+        kind = 'insufficient_funds'
+    else:
+        kind = 'program_error'
+
+    return {
+        'kind': kind,
+        'err': err,
+        'logs': list(logs or [])[-10:],
+        'source': 'simulation'
+    }
+
+
+class TransactionSender:
+    """Broadcast signed transactions and wait for confirmation.
+
+    With `race_preflight` the transaction is still sent with skipPreflight,
+    but a `simulateTransaction` runs alongside the broadcast. A deterministic
+    simulation failure cancels the confirmation wait immediately instead of
+    letting it run into the timeout.
+    """
+
+    def __init__(self, client, signature_stream, race_preflight=False, confirm_timeout=30,
+                 scheduler=None):
+        self.logger = setup_logger("tx_sender")
+        self.client = client
+        self.signature_stream = signature_stream
+        self.race_preflight = race_preflight
+        self.confirm_timeout = confirm_timeout
+        self.scheduler = scheduler
+
+    async def _rpc(self, priority, func, *args, **kwargs):
+        if self.scheduler:
+            return await self.scheduler.run('rpc', priority, func, *args, **kwargs)
+        return await func(*args, **kwargs)
+
+    async def _simulate(self, transaction, priority):
+        """Run simulateTransaction, returns a structured error or None"""
+        try:
+            response = await self._rpc(
+                priority,
+                self.client.simulate_transaction,
+                transaction,
+                sig_verify=False
+            )
+            value = response.value
+            if value.err is None:
+                return None
+            return classify_simulation_error(value.err, value.logs)
+        except Exception as e:
+            # A broken simulation must never block the real send
+            self.logger.warning(f"Preflight simulation unavailable: {str(e)}")
+            return None
+
+    async def fetch_transaction(self, signature, attempts=3, priority=Priority.ENTRY):
+        """Confirmed transaction with balance metadata as a JSON dict"""
+        for attempt in range(attempts):
+            try:
+                response = await self._rpc(
+                    priority,
+                    self.client.get_transaction,
+                    Signature.from_string(signature),
+                    encoding="jsonParsed",
+                    commitment=Confirmed,
+                    max_supported_transaction_version=0
+                )
+                result = json.loads(response.to_json()).get('result')
+                if result:
+                    return result
+            except Exception as e:
+                self.logger.warning(f"getTransaction failed for {signature[:8]}...: {str(e)}")
+            await asyncio.sleep(0.2 * (attempt + 1))
+        return None
+
+    async def lookup(self, signature, fetch_transaction=False, priority=Priority.ENTRY):
+        """Current status of a sent signature from getSignatureStatuses.
+
+        Returns a dict shaped like the `send` result with `status` of
+        confirmed, failed, processed or unknown. Unknown means no node has
+        seen the signature yet; it can still land until its blockhash
+        expires.
+        """
+        response = await self._rpc(
+            priority,
+            self.client.get_signature_statuses,
+            [Signature.from_string(signature)],
+            search_transaction_history=True
+        )
+        status = response.value[0]
+        result = {'signature': signature, 'status': 'unknown', 'slot': None, 'err': None, 'error': None}
+        if status is None:
+            return result
+        level = str(status.confirmation_status).split('.')[-1].lower()
+        result['slot'] = status.slot
+        result['err'] = status.err
+        if status.err is not None:
+            result['status'] = 'failed'
+        elif level in ('confirmed', 'finalized'):
+            result['status'] = 'confirmed'
+            if fetch_transaction:
+                result['transaction'] = await self.fetch_transaction(signature, priority=priority)
+        else:
+            result['status'] = 'processed'
+        return result
+
+    async def send(self, transaction, on_processed=None, timeout=None, fetch_transaction=False,
+                   priority=Priority.ENTRY, deadline=None):
+        """Send a signed transaction and wait for it to confirm.
+
+        Returns a dict with `signature`, `status` (confirmed, failed,
+        timeout), `slot`, `err` and a structured `error` when the failure
+        was detected by simulation. With `fetch_transaction` a confirmed
+        result also carries the `getTransaction` result under `transaction`
+        so fills can be read from its balance metadata. RPC calls are
+        admitted by the scheduler at `priority`. With a `deadline`, the send
+        itself must fit in the remaining budget; once broadcast the
+        transaction can still land, so confirmation keeps `timeout`.
+        """
+        timeout = timeout or self.confirm_timeout
+        simulation = None
+        if self.race_preflight:
+            simulation = asyncio.create_task(self._simulate(transaction, priority))
+
+        try:
+            request = self._rpc(
+                priority,
+                self.client.send_transaction,
+                transaction,
+                opts={'skipPreflight': True}
+            )
+            txid = await (deadline.run(request, 'send') if deadline else request)
+        except BaseException:
+            if simulation:
+                simulation.cancel()
+            raise
+
+        signature = signature_str(txid)
+        self.logger.info(f"Transaction sent: {signature}")
+        confirmation = asyncio.create_task(
+            self.signature_stream.wait(signature, on_processed=on_processed, timeout=timeout)
+        )
+
+        if simulation:
+            done, _ = await asyncio.wait(
+                {simulation, confirmation},
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if simulation in done and not confirmation.done():
+                error = simulation.result()
+                if error:
+                    confirmation.cancel()
+                    await asyncio.gather(confirmation, return_exceptions=True)
+                    self.logger.warning(
+                        f"Preflight simulation failed for {signature[:8]}...: {error['kind']}"
+                    )
+                    return {
+                        'signature': signature,
+                        'status': 'failed',
+                        'slot': None,
+                        'err': error['err'],
+                        'error': error
+                    }
+            else:
+                simulation.cancel()
+
+        result = await confirmation
+        result['error'] = None
+        if fetch_transaction and result['status'] == 'confirmed':
+            result['transaction'] = await self.fetch_transaction(signature, priority=priority)
+        return result
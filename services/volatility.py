@@ -0,0 +1,94 @@
+import math
+import time
+from collections import OrderedDict
+from utils.config import config
+
+
+class VolatilityEstimator:
+    """Running variance of log returns for one token, O(1) per update.
+
+    Returns are normalized by the square root of the time between samples,
+    so irregular price ticks give a variance per second. The first
+    `warmup` samples use Welford's exact running variance; after that an
+    EWMA with the given half-life lets the estimate follow regime changes.
+    """
+
+    __slots__ = ('halflife', 'warmup', 'last_price', 'last_time', 'count', 'mean', 'm2', 'variance')
+
+    def __init__(self, halflife=30.0, warmup=10):
+        self.halflife = halflife
+        self.warmup = warmup
+        self.last_price = None
+        self.last_time = None
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.variance = None  # per second
+
+    def update(self, price, timestamp):
+        if not price or price <= 0:
+            return
+        if self.last_price is None or timestamp <= self.last_time:
+            self.last_price, self.last_time = price, timestamp
+            return
+
+        dt = timestamp - self.last_time
+        z = math.log(price / self.last_price) / math.sqrt(dt)
+        self.last_price, self.last_time = price, timestamp
+        self.count += 1
+
+        if self.count <= self.warmup:
+            delta = z - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (z - self.mean)
+            if self.count > 1:
+                self.variance = self.m2 / (self.count - 1)
+            return
+
+        alpha = 1 - math.exp(-dt * math.log(2) / self.halflife)
+        self.variance += alpha * (z * z - self.variance)
+
+    def stdev(self, horizon):
+        """Expected fractional price move (one sigma) over `horizon` seconds"""
+        if self.variance is None:
+            return None
+        return math.sqrt(self.variance * horizon)
+
+
+class VolatilityTracker:
+    """Per-token volatility estimators over the live price stream.
+
+    Memory is bounded: the least recently updated tokens are dropped once
+    `max_tokens` are tracked.
+    """
+
+    def __init__(self, halflife=30.0, warmup=10, max_tokens=1000):
+        self.halflife = halflife
+        self.warmup = warmup
+        self.max_tokens = max_tokens
+        self.estimators = OrderedDict()
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            halflife=getattr(config, 'VOLATILITY_HALFLIFE', 30.0),
+            warmup=getattr(config, 'VOLATILITY_WARMUP', 10)
+        )
+
+    def update(self, mint, price, timestamp=None):
+        estimator = self.estimators.get(mint)
+        if estimator is None:
+            estimator = VolatilityEstimator(self.halflife, self.warmup)
+            self.estimators[mint] = estimator
+            if len(self.estimators) > self.max_tokens:
+                self.estimators.popitem(last=False)
+        else:
+            self.estimators.move_to_end(mint)
+        estimator.update(price, timestamp if timestamp is not None else time.time())
+
+    def stdev(self, mint, horizon):
+        estimator = self.estimators.get(mint)
+        return estimator.stdev(horizon) if estimator else None
+
+    def forget(self, mint):
+        self.estimators.pop(mint, None)
@@ -0,0 +1,247 @@
+import json
+import time
+from pathlib import Path
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.system_program import transfer, TransferParams
+from solders.transaction import Transaction
+from utils.logger import setup_logger
+from utils.config import config
+from services.scheduler import Priority
+
+LAMPORTS_PER_SOL = 1_000_000_000
+SIGNATURE_FEE_LAMPORTS = 5000
+
+
+def load_keypair(source):
+    """Keypair from a base58 secret or a path to a JSON keypair file"""
+    path = Path(source).expanduser()
+    if path.is_file():
+        return Keypair.from_bytes(bytes(json.loads(path.read_text())))
+    return Keypair.from_base58_string(source)
+
+
+class PoolWallet:
+    def __init__(self, keypair, max_inflight):
+        self.keypair = keypair
+        self.public_key = keypair.pubkey()
+        self.address = str(self.public_key)
+        self.max_inflight = max_inflight
+        self.balance = 0.0   # SOL, from RPC or the last confirmed fill
+        self.reserved = 0.0  # SOL committed to buys still in flight
+        self.inflight = 0
+        self.positions = set()
+        self.updated_at = 0
+
+    @property
+    def available(self):
+        return self.balance - self.reserved
+
+    @property
+    def idle(self):
+        return not self.inflight and not self.positions
+
+
+class WalletPool:
+    """Spread trades over several fee payers.
+
+    Every wallet keeps its own balance ledger and in-flight limit. `assign`
+    picks the least-loaded wallet that can fund a buy and reserves the
+    amount in one synchronous step, like `TradeSlots.reserve`. Positions
+    stay on the wallet that bought them so exits are signed by the owner.
+    The primary wallet is the `WalletManager` keypair; `rebalance` and
+    `sweep` move SOL between wallets in one batched transaction.
+    """
+
+    def __init__(self, wallet_manager, keypairs=None, max_inflight=2, min_reserve_sol=0.01):
+        self.logger = setup_logger("wallet_pool")
+        self.wallet_manager = wallet_manager
+        self.max_inflight = max_inflight
+        self.min_reserve_sol = min_reserve_sol
+        self.wallets = {}
+        self.assignments = {}  # mint -> (wallet, reserved SOL)
+        self.primary = None
+        keypair = getattr(wallet_manager, 'keypair', None)
+        if keypair:
+            self.primary = self.add(keypair)
+        for extra in keypairs or []:
+            self.add(extra)
+
+    @classmethod
+    def from_config(cls, wallet_manager):
+        return cls(
+            wallet_manager,
+            keypairs=[load_keypair(source) for source in getattr(config, 'WALLET_POOL_KEYPAIRS', [])],
+            max_inflight=getattr(config, 'WALLET_MAX_INFLIGHT', 2),
+            min_reserve_sol=getattr(config, 'WALLET_MIN_RESERVE_SOL', 0.01)
+        )
+
+    def add(self, keypair):
+        wallet = PoolWallet(keypair, self.max_inflight)
+        self.wallets.setdefault(wallet.address, wallet)
+        return self.wallets[wallet.address]
+
+    def update_balance(self, owner, balance):
+        """Record a balance read from RPC or confirmed transaction metadata"""
+        wallet = self.wallets.get(str(owner))
+        if not wallet:
+            return
+        wallet.balance = balance
+        wallet.updated_at = time.time()
+
+    def charge(self, owner, amount_sol):
+        """Deduct SOL spent by a transaction whose balance metadata is unknown"""
+        wallet = self.wallets.get(str(owner))
+        if not wallet:
+            return
+        wallet.balance -= amount_sol
+        wallet.updated_at = time.time()
+
+    async def refresh_balances(self):
+        """Load every wallet balance with one getMultipleAccounts call"""
+        wallets = list(self.wallets.values())
+        response = await self.wallet_manager.client.get_multiple_accounts(
+            [wallet.public_key for wallet in wallets]
+        )
+        for wallet, account in zip(wallets, response.value):
+            self.update_balance(wallet.address, account.lamports / LAMPORTS_PER_SOL if account else 0.0)
+
+    def assign(self, mint, amount_sol):
+        """Reserve `amount_sol` on the least-loaded wallet that can fund it"""
+        if mint in self.assignments:
+            return None
+        candidates = [
+            wallet for wallet in self.wallets.values()
+            if wallet.inflight < wallet.max_inflight
+            and wallet.available - amount_sol >= self.min_reserve_sol
+        ]
+        if not candidates:
+            return None
+        wallet = min(
+            candidates,
+            key=lambda w: (w.inflight + len(w.positions), -w.available)
+        )
+        wallet.inflight += 1
+        wallet.reserved += amount_sol
+        self.assignments[mint] = (wallet, amount_sol)
+        return wallet
+
+    def wallet_for(self, mint):
+        assignment = self.assignments.get(mint)
+        return assignment[0] if assignment else self.primary
+
+    def keypair_for(self, mint):
+        return self.wallet_for(mint).keypair
+
+    def open(self, mint):
+        """Buy landed: the reservation becomes a position on its wallet"""
+        assignment = self.assignments.get(mint)
+        if not assignment:
+            return
+        wallet, amount = assignment
+        if mint not in wallet.positions:
+            wallet.inflight -= 1
+            wallet.reserved -= amount
+            wallet.positions.add(mint)
+
+    def release(self, mint):
+        """Buy failed or position closed, free whatever the mint still holds"""
+        assignment = self.assignments.pop(mint, None)
+        if not assignment:
+            return
+        wallet, amount = assignment
+        if mint in wallet.positions:
+            wallet.positions.discard(mint)
+        else:
+            wallet.inflight -= 1
+            wallet.reserved -= amount
+
+    def plan_rebalance(self, target_sol=None):
+        """Transfers (source, destination, lamports) that even out idle wallets"""
+        idle = [wallet for wallet in self.wallets.values() if not wallet.inflight]
+        if len(idle) < 2:
+            return []
+        balances = {wallet.address: round(wallet.balance * LAMPORTS_PER_SOL) for wallet in idle}
+        if target_sol is None:
+            target = sum(balances.values()) // len(idle)
+        else:
+            target = round(target_sol * LAMPORTS_PER_SOL)
+        keep = max(target, round(self.min_reserve_sol * LAMPORTS_PER_SOL))
+
+        surplus = [[w, balances[w.address] - keep] for w in idle if balances[w.address] > keep]
+        deficit = [[w, target - balances[w.address]] for w in idle if balances[w.address] < target]
+
+        transfers = []
+        for entry in deficit:
+            while entry[1] > 0 and surplus:
+                source = surplus[0]
+                lamports = min(entry[1], source[1])
+                transfers.append((source[0], entry[0], lamports))
+                entry[1] -= lamports
+                source[1] -= lamports
+                if not source[1]:
+                    surplus.pop(0)
+        return transfers
+
+    def plan_sweep(self, destination=None):
+        """Transfers moving everything above the reserve from idle wallets to one wallet"""
+        destination = destination or self.primary
+        return [
+            (wallet, destination, round((wallet.balance - self.min_reserve_sol) * LAMPORTS_PER_SOL))
+            for wallet in self.wallets.values()
+            if wallet is not destination
+            and wallet.idle
+            and wallet.balance > self.min_reserve_sol
+        ]
+
+    async def execute_transfers(self, tx_sender, transfers):
+        """Send all transfers in one transaction signed by every source wallet"""
+        if not transfers:
+            return None
+        instructions = [
+            transfer(TransferParams(
+                from_pubkey=source.public_key,
+                to_pubkey=destination.public_key,
+                lamports=lamports
+            ))
+            for source, destination, lamports in transfers
+        ]
+        payer = transfers[0][0]
+        signers = {payer.address: payer.keypair}
+        for source, _, _ in transfers:
+            signers.setdefault(source.address, source.keypair)
+
+        response = await self.wallet_manager.client.get_latest_blockhash()
+        blockhash = response.value.blockhash
+        message = Message.new_with_blockhash(instructions, payer.public_key, blockhash)
+        transaction = Transaction(list(signers.values()), message, blockhash)
+
+        result = await tx_sender.send(transaction, priority=Priority.ENRICHMENT)
+        if result['status'] == 'confirmed' or result['slot']:
+            # Landed, the fee payer is charged even when the transfers failed
+            self.charge(payer.address, SIGNATURE_FEE_LAMPORTS * len(signers) / LAMPORTS_PER_SOL)
+        if result['status'] == 'confirmed':
+            for source, destination, lamports in transfers:
+                source.balance -= lamports / LAMPORTS_PER_SOL
+                destination.balance += lamports / LAMPORTS_PER_SOL
+            self.logger.info(f"Moved SOL in {len(transfers)} transfers: {result['signature']}")
+        else:
+            self.logger.warning(f"Wallet transfers {result['status']}: {result['error'] or result['err']}")
+        return result
+
+    async def rebalance(self, tx_sender, target_sol=None):
+        return await self.execute_transfers(tx_sender, self.plan_rebalance(target_sol))
+
+    async def sweep(self, tx_sender, destination=None):
+        return await self.execute_transfers(tx_sender, self.plan_sweep(destination))
+
+    def get_metrics(self):
+        return {
+            wallet.address: {
+                'balance': wallet.balance,
+                'reserved': wallet.reserved,
+                'inflight': wallet.inflight,
+                'positions': len(wallet.positions)
+            }
+            for wallet in self.wallets.values()
+        }
@@ -0,0 +1,116 @@
+import asyncio
+import json
+from aiohttp import web
+
+
+class RpcWebsocketStub:
+    """Local stand-in for a Solana RPC websocket endpoint.
+
+    Accepts `*Subscribe` / `*Unsubscribe` requests, records subscriptions and
+    lets tests push notifications or drop every connection.
+    """
+
+    def __init__(self):
+        self.app = web.Application()
+        self.app.router.add_get('/', self._handle)
+        self.runner = None
+        self.url = None
+        self.sockets = set()
+        self.subscriptions = {}  # subscription id -> (method, params, ws)
+        self.connections = 0
+        self._next_sub = 1
+
+    async def start(self):
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/"
+        return self.url
+
+    async def stop(self):
+        await self.drop_connections()
+        if self.runner:
+            await self.runner.cleanup()
+
+    async def _handle(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.add(ws)
+        self.connections += 1
+        try:
+            async for msg in ws:
+                message = json.loads(msg.data)
+                method = message['method']
+                if method.endswith('Unsubscribe'):
+                    self.subscriptions.pop(message['params'][0], None)
+                    result = True
+                else:
+                    result = self._next_sub
+                    self._next_sub += 1
+                    self.subscriptions[result] = (method, message['params'], ws)
+                await ws.send_str(json.dumps({
+                    'jsonrpc': '2.0', 'id': message['id'], 'result': result
+                }))
+        finally:
+            self.sockets.discard(ws)
+            for sub, entry in list(self.subscriptions.items()):
+                if entry[2] is ws:
+                    del self.subscriptions[sub]
+        return ws
+
+    def find(self, method, key=None, commitment=None):
+        """Subscription ids for a method, optionally filtered by first param"""
+        found = []
+        for sub, (sub_method, params, _) in self.subscriptions.items():
+            if sub_method != method:
+                continue
+            if key is not None and params[0] != key:
+                continue
+            if commitment is not None and params[1].get('commitment') != commitment:
+                continue
+            found.append(sub)
+        return found
+
+    async def wait_for(self, method, count=1, timeout=2.0):
+        """Wait until at least `count` subscriptions of a method exist"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while len(self.find(method)) < count:
+            if loop.time() > deadline:
+                raise TimeoutError(f"Expected {count} {method} subscriptions")
+            await asyncio.sleep(0.01)
+
+    async def notify(self, sub, notification_method, result, auto_cancel=False):
+        _, _, ws = self.subscriptions[sub]
+        if auto_cancel:
+            del self.subscriptions[sub]
+        await ws.send_str(json.dumps({
+            'jsonrpc': '2.0',
+            'method': notification_method,
+            'params': {'result': result, 'subscription': sub}
+        }))
+
+    async def notify_signature(self, signature, commitment, err=None, slot=1):
+        """Fire the signatureNotification for one commitment level"""
+        for sub in self.find('signatureSubscribe', signature, commitment):
+            await self.notify(
+                sub,
+                'signatureNotification',
+                {'context': {'slot': slot}, 'value': {'err': err}},
+                auto_cancel=True
+            )
+
+    async def notify_account(self, account, data, slot=1):
+        """Fire accountNotification with new base64 account data"""
+        for sub in self.find('accountSubscribe', account):
+            await self.notify(
+                sub,
+                'accountNotification',
+                {'context': {'slot': slot}, 'value': {'data': [data, 'base64'], 'lamports': 0}}
+            )
+
+    async def drop_connections(self):
+        for ws in list(self.sockets):
+            await ws.close()
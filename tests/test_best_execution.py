@@ -0,0 +1,79 @@
+import asyncio
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.best_execution import BestExecution
+from services.jupiter import SOL_MINT
+
+MINT = 'TokenMint1111111111111111111111111111111111'
+
+
+class FakeJupiter:
+    def __init__(self, direct_out, multi_out, multi_hops=2, delay=0.0):
+        self.direct_out = direct_out
+        self.multi_out = multi_out
+        self.multi_hops = multi_hops
+        self.delay = delay
+
+    async def get_quote(self, input_mint, output_mint, amount, slippage_bps,
+                        only_direct=False, priority=None):
+        await asyncio.sleep(self.delay)
+        hops = 1 if only_direct else self.multi_hops
+        return {
+            'inAmount': str(amount),
+            'outAmount': str(self.direct_out if only_direct else self.multi_out),
+            'routePlan': [{'swapInfo': {'label': 'Raydium'}}] * hops
+        }
+
+
+class FakeRaydium:
+    def __init__(self, out, delay=0.0):
+        self.out = out
+        self.delay = delay
+
+    async def get_quote(self, input_mint, output_mint, amount, slippage_bps, priority=None):
+        await asyncio.sleep(self.delay)
+        return {'success': True, 'data': {'inputAmount': str(amount), 'outputAmount': str(self.out)}}
+
+
+def test_picks_best_net_output():
+    async def scenario():
+        # Multi-hop quotes slightly more but pays for two extra hops of compute
+        best = BestExecution(
+            FakeJupiter(direct_out=1_000_000, multi_out=1_010_000, multi_hops=3),
+            FakeRaydium(out=990_000),
+            deadline=0.5
+        )
+        choice = await best.quote(MINT, SOL_MINT, 10_000, 300, priority_fee=100_000)
+        assert choice['venue'] == 'jupiter_direct'
+        assert set(choice['candidates']) == {'jupiter_direct', 'jupiter', 'raydium'}
+
+        # Without priority fees the larger output wins
+        choice = await best.quote(MINT, SOL_MINT, 10_000, 300, priority_fee=0)
+        assert choice['venue'] == 'jupiter'
+
+    asyncio.run(scenario())
+
+
+def test_deadline_uses_answers_so_far():
+    async def scenario():
+        best = BestExecution(
+            FakeJupiter(direct_out=2_000_000, multi_out=2_000_000, delay=0.5),
+            FakeRaydium(out=1_000_000),
+            deadline=0.05
+        )
+        choice = await best.quote(SOL_MINT, MINT, 10_000, 300)
+        assert choice['venue'] == 'raydium'
+        assert choice['elapsed_ms'] < 400
+
+        # Nothing executable by the deadline: the first answer is taken
+        best = BestExecution(
+            FakeJupiter(direct_out=2_000_000, multi_out=2_000_000, delay=0.5),
+            FakeRaydium(out=1_000_000, delay=0.1),
+            deadline=0.01
+        )
+        choice = await best.quote(SOL_MINT, MINT, 10_000, 300)
+        assert choice['venue'] == 'raydium'
+
+    asyncio.run(scenario())
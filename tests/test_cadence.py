@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.cadence import MonitorCadence
+
+
+def test_checks_speed_up_near_thresholds_and_in_fast_markets():
+    cadence = MonitorCadence(min_interval=0.25, max_interval=5.0, sigmas=3.0)
+
+    # Far from both thresholds in a quiet market: slowest cadence
+    assert cadence.next_delay(0.0, 0.5, -0.2, volatility=0.01) == 5.0
+    # 3% from the stop with 1%/sqrt(s) volatility: a 3 sigma move takes 1s
+    assert abs(cadence.next_delay(-0.17, 0.5, -0.2, volatility=0.01) - 1.0) < 1e-9
+    # The same distance in a market four times as volatile
+    assert cadence.next_delay(-0.17, 0.5, -0.2, volatility=0.04) == 0.25
+    # Past a threshold, or with unknown volatility close to one
+    assert cadence.next_delay(0.6, 0.5, -0.2) == 0.25
+    assert cadence.next_delay(0.49, 0.5, -0.2) == 0.25
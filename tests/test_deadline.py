@@ -0,0 +1,60 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+from services.deadline import Deadline, DeadlineExceeded, LatencyBudget
+
+
+def test_stages_share_one_budget():
+    async def scenario():
+        deadline = Deadline(100)
+        assert await deadline.run(asyncio.sleep(0.03, result='quote'), 'quote') == 'quote'
+        assert 'quote' in deadline.stages
+
+        # A hung request is cut off at the end of the budget, not its own timeout
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            await deadline.run(asyncio.sleep(5), 'swap build')
+        assert time.monotonic() - started < 0.1
+
+        with pytest.raises(DeadlineExceeded):
+            await deadline.run(asyncio.sleep(0), 'send')
+
+    asyncio.run(scenario())
+
+
+def test_admission_learns_execution_time():
+    budget = LatencyBudget(max_latency_ms=1000, min_execution_ms=100)
+
+    # Detected 950ms ago, less than the 100ms floor is left
+    assert not budget.admit(budget.start(detected_at=time.time() - 0.95))
+
+    deadline = budget.start(detected_at=time.time() - 0.2)
+    assert budget.admit(deadline)
+    deadline.stages['processed'] = deadline.stages['admitted'] + 600
+    budget.record(deadline)
+    assert budget.expected_ms == 600
+
+    # 800ms left is fine, 500ms is not enough for a 600ms buy any more
+    assert budget.admit(budget.start(detected_at=time.time() - 0.2))
+    assert not budget.admit(budget.start(detected_at=time.time() - 0.5))
+    assert budget.get_stats()['dropped'] == 2
+
+
+def test_one_slow_fill_does_not_block_later_entries():
+    budget = LatencyBudget(max_latency_ms=1000, min_execution_ms=100)
+    deadline = budget.start()
+    assert budget.admit(deadline)
+    deadline.stages['processed'] = deadline.stages['admitted'] + 1200
+    budget.record(deadline)
+    # Capped below the budget, a fresh token still fits
+    assert budget.expected_ms == 900
+    assert budget.admit(budget.start())
+
+    # Tokens detected 300ms ago are dropped at first, each drop lowers the estimate
+    admitted = [budget.admit(budget.start(detected_at=time.time() - 0.3)) for _ in range(5)]
+    assert admitted[0] is False and admitted[-1] is True
+    assert budget.expected_ms < 700
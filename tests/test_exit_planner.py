@@ -0,0 +1,156 @@
+import asyncio
+import base64
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.append(str(Path(__file__).parent.parent))
+
+from solders.compute_budget import set_compute_unit_price
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.system_program import transfer, TransferParams
+from solders.transaction import Transaction
+
+from services.exit_planner import ExitPlanner, pack_exit_plans, with_priority_fee
+
+PAYER = Keypair()
+
+
+def _unsigned_transaction(with_fee_ix):
+    ix = transfer(TransferParams(from_pubkey=PAYER.pubkey(), to_pubkey=Pubkey.new_unique(), lamports=5))
+    instructions = [set_compute_unit_price(10), ix] if with_fee_ix else [ix]
+    message = Message.new_with_blockhash(instructions, PAYER.pubkey(), Hash.new_unique())
+    return bytes(Transaction.new_unsigned(message))
+
+
+def _fee_data(tx_bytes):
+    message = Transaction.from_bytes(tx_bytes).message
+    return [
+        bytes(ix.data) for ix in message.instructions
+        if str(message.account_keys[ix.program_id_index]).startswith("ComputeBudget")
+    ]
+
+
+def test_priority_fee_replaced_or_added():
+    fee = (777).to_bytes(8, 'little')
+    assert _fee_data(with_priority_fee(_unsigned_transaction(True), 777)) == [b'\x03' + fee]
+    patched = with_priority_fee(_unsigned_transaction(False), 777)
+    assert _fee_data(patched) == [b'\x03' + fee]
+
+    # Still a valid transaction for the original fee payer
+    tx = Transaction.from_bytes(patched)
+    tx.sign([PAYER], tx.message.recent_blockhash)
+    assert all(tx.verify_with_results())
+
+
+class FakeJupiter:
+    def __init__(self):
+        self.builds = 0
+
+    async def get_quote(self, input_mint, output_mint, amount, slippage_bps, **kwargs):
+        return {'inAmount': str(amount), 'outAmount': '100', 'routePlan': [{'swapInfo': {}}]}
+
+    async def get_swap_transaction(self, quote, user_public_key, priority_fee=None, **kwargs):
+        self.builds += 1
+        return base64.b64encode(_unsigned_transaction(True)).decode()
+
+
+def test_plan_is_built_and_invalidated_by_price_move():
+    async def scenario():
+        jupiter = FakeJupiter()
+        wallet = SimpleNamespace(phantom_public_key=PAYER.pubkey())
+        planner = ExitPlanner(jupiter, wallet, price_move=0.05)
+        trade = {'token_amount': 1000}
+
+        planner.note_price("MintA", 1.0)
+        planner.track("MintA", trade)
+        await asyncio.sleep(0.01)
+        assert planner.plans["MintA"]['amount'] == 1000
+
+        # A 10% move makes the plan stale and schedules a rebuild
+        planner.note_price("MintA", 1.1)
+        assert planner.take("MintA") is None
+        await asyncio.sleep(0.01)
+        plan = planner.take("MintA")
+        await planner.stop()
+        return plan, jupiter
+
+    plan, jupiter = asyncio.run(scenario())
+    assert plan['price'] == 1.1
+    assert jupiter.builds == 2
+
+
+def test_price_move_before_first_observed_price_invalidates_plan():
+    async def scenario():
+        jupiter = FakeJupiter()
+        wallet = SimpleNamespace(phantom_public_key=PAYER.pubkey())
+        planner = ExitPlanner(jupiter, wallet, price_move=0.05)
+        planner.track("MintA", {'token_amount': 1000, 'entry_price': 2.0})
+        planner.track("MintB", {'token_amount': 1000})
+        await asyncio.sleep(0.01)
+        assert planner.plans["MintA"]['price'] == 2.0
+
+        # 55% drop inside the first max-age window
+        planner.note_price("MintA", 0.9)
+        planner.note_price("MintB", 0.9)
+        stale_a, stale_b = planner.take("MintA"), planner.take("MintB")
+        await planner.stop()
+        return stale_a, stale_b
+
+    assert asyncio.run(scenario()) == (None, None)
+
+
+def test_stop_after_large_move_takes_plan_within_its_minimum_output():
+    class WideSlippageJupiter(FakeJupiter):
+        async def get_quote(self, input_mint, output_mint, amount, slippage_bps, **kwargs):
+            quote = await super().get_quote(input_mint, output_mint, amount, slippage_bps)
+            return dict(quote, otherAmountThreshold='90')
+
+    async def scenario():
+        wallet = SimpleNamespace(phantom_public_key=PAYER.pubkey())
+        planner = ExitPlanner(WideSlippageJupiter(), wallet, price_move=0.02)
+        planner.track("MintA", {'token_amount': 1000, 'entry_price': 1.0})
+        planner.track("MintB", {'token_amount': 1000, 'entry_price': 1.0})
+        await asyncio.sleep(0.01)
+
+        # The price check behind a stop loss notes the new price first
+        planner.note_price("MintA", 0.95)
+        planner.note_price("MintB", 0.85)
+        taken = planner.take("MintA")
+        # 85 expected is below the 90 minimum, the swap would fail
+        rejected = planner.take("MintB")
+        kept = "MintB" in planner.plans
+        await planner.stop()
+        return taken, rejected, kept
+
+    taken, rejected, kept = asyncio.run(scenario())
+    assert taken['mint'] == "MintA" and taken['price'] == 1.0
+    assert rejected is None and kept
+
+
+def test_small_exits_packed_into_one_transaction():
+    plans = [
+        {'transaction': _unsigned_transaction(True), 'built_at': i}
+        for i in range(3)
+    ]
+    groups = pack_exit_plans(plans, priority_fee=500)
+    assert len(groups) == 1
+    packed_plans, tx_bytes = groups[0]
+    assert len(packed_plans) == 3
+
+    message = Transaction.from_bytes(tx_bytes).message
+    budget = _fee_data(tx_bytes)
+    assert len(budget) == 2  # one shared limit and one shared price
+    assert len(message.instructions) == 5
+    assert message.recent_blockhash == Transaction.from_bytes(plans[2]['transaction']).message.recent_blockhash
+
+
+def test_oversized_exits_split_across_transactions():
+    plans = [
+        {'transaction': _unsigned_transaction(True), 'built_at': i}
+        for i in range(3)
+    ]
+    groups = pack_exit_plans(plans, priority_fee=500, max_size=340)
+    assert [len(group) for group, _ in groups] == [2, 1]
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.fill_accounting import FillAccountant, extract_fill
+
+OWNER = "Owner111111111111111111111111111111111111111"
+MINT = "Mint1111111111111111111111111111111111111111"
+RENT = 2039280
+
+
+def _buy_transaction():
+    """0.1 SOL in, 1,000 whole tokens (6 decimals) out into a new token account"""
+    return {
+        'slot': 123,
+        'transaction': {'message': {'accountKeys': [
+            {'pubkey': OWNER}, {'pubkey': "TokenAcct111"}, {'pubkey': "Pool111"}
+        ]}},
+        'meta': {
+            'fee': 5000,
+            'preBalances': [1_000_000_000, 0, 50_000_000_000],
+            'postBalances': [1_000_000_000 - 100_000_000 - 5000 - RENT, RENT, 50_100_000_000],
+            'preTokenBalances': [],
+            'postTokenBalances': [{
+                'accountIndex': 1, 'mint': MINT, 'owner': OWNER,
+                'uiTokenAmount': {'amount': '1000000000', 'decimals': 6}
+            }]
+        }
+    }
+
+
+class BalancePool:
+    def __init__(self):
+        self.balances = {}
+
+    def update_balance(self, owner, balance):
+        self.balances[owner] = balance
+
+
+def test_extract_buy_fill():
+    fill = extract_fill(_buy_transaction(), OWNER, MINT)
+    assert fill['token_delta'] == 1_000_000_000
+    assert abs(fill['sol_delta'] + 0.1) < 1e-12
+    assert fill['fee_sol'] == 5000 / 1e9
+    assert fill['rent_sol'] == RENT / 1e9
+    assert abs(fill['price_sol'] - 0.0001) < 1e-12
+
+
+def test_record_buy_updates_trade_and_wallet_balance():
+    pool = BalancePool()
+    trade = {'entry_price': 2.0, 'position_size': 0.1}
+    # Quoted 1,250,000,000 units for 0.1 SOL, filled 1,000,000,000: 25% worse price
+    quote = {'inAmount': '100000000', 'outAmount': '1250000000'}
+
+    FillAccountant(None, pool).record_buy(trade, _buy_transaction(), MINT, OWNER, quote=quote)
+
+    assert trade['token_amount'] == 1_000_000_000
+    assert abs(trade['entry_price'] - 2.5) < 1e-9
+    assert abs(trade['position_size'] - 0.1) < 1e-12
+    assert pool.balances[OWNER] == _buy_transaction()['meta']['postBalances'][0] / 1e9
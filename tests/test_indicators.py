@@ -0,0 +1,68 @@
+import math
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.indicators import IndicatorEngine
+from services.volatility import VolatilityTracker
+
+
+def test_indicators_follow_ticks():
+    engine = IndicatorEngine(max_tokens=4, fast_halflife=1.0, slow_halflife=10.0)
+    engine.update('mint', 1.0, volume=1.0, timestamp=0.0)
+    engine.update('mint', 2.0, volume=3.0, timestamp=1.0)
+    engine.update('mint', 1.5, volume=0.0, timestamp=2.0)
+
+    result = engine.get('mint')
+    assert result['ticks'] == 3
+    assert result['vwap'] == (1.0 + 6.0) / 4
+    # One fast half-life per second: 1.0 -> 1.5 -> 1.5
+    assert math.isclose(result['ema_fast'], 1.5)
+    assert result['ema_fast'] > result['ema_slow'] and result['momentum'] > 0
+    assert result['drawdown'] == 1.5 / 2.0 - 1
+    assert result['volatility'] > 0
+
+    # Out of order ticks are ignored
+    engine.update('mint', 9.0, timestamp=1.5)
+    assert engine.get('mint')['price'] == 1.5
+
+
+def test_vwap_without_volume_weights_prices_by_time_held():
+    engine = IndicatorEngine(max_tokens=4)
+    engine.update('mint', 1.0, timestamp=0.0)
+    assert engine.get('mint')['vwap'] == 1.0
+    # 1.0 stands for 3s, then 2.0 for 1s: a burst of ticks adds no extra weight
+    engine.update('mint', 2.0, timestamp=3.0)
+    engine.update('mint', 2.0, timestamp=3.5)
+    engine.update('mint', 4.0, timestamp=4.0)
+    assert engine.get('mint')['vwap'] == (1.0 * 3 + 2.0 * 1) / 4
+
+    # A tick with volume switches to the volume-weighted average, seconds never mix with volume
+    engine.update('mint', 3.0, volume=2.0, timestamp=5.0)
+    engine.update('mint', 5.0, timestamp=6.0)
+    engine.update('mint', 6.0, volume=2.0, timestamp=7.0)
+    assert engine.get('mint')['vwap'] == (3.0 * 2 + 6.0 * 2) / 4
+
+
+def test_volatility_comes_from_a_shared_tracker():
+    tracker = VolatilityTracker(warmup=2)
+    engine = IndicatorEngine(max_tokens=4, volatility=tracker)
+    assert engine.get('mint') is None
+    for timestamp, price in enumerate((1.0, 1.1, 0.9, 1.0)):
+        engine.update('mint', price, timestamp=float(timestamp))
+    assert tracker.stdev('mint', 1.0) > 0
+    assert engine.get('mint')['volatility'] == tracker.stdev('mint', 1.0)
+
+
+def test_least_recently_updated_token_is_evicted():
+    engine = IndicatorEngine(max_tokens=2)
+    engine.update('a', 1.0, timestamp=1.0)
+    engine.update('b', 1.0, timestamp=2.0)
+    engine.update('a', 1.1, timestamp=3.0)
+    engine.update('c', 1.0, timestamp=4.0)
+    assert 'b' not in engine and 'a' in engine and 'c' in engine
+    assert engine.get('c')['ticks'] == 1
+
+    engine.forget('a')
+    engine.update('d', 2.0, timestamp=5.0)
+    assert engine.get('d')['vwap'] == 2.0 and engine.get('a') is None
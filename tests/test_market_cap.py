@@ -0,0 +1,46 @@
+import asyncio
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.market_cap import MarketCapResolver
+
+MINT = 'TokenMint1111111111111111111111111111111111'
+
+
+def test_median_of_sources_within_deadline():
+    async def scenario():
+        calls = []
+
+        async def pairs(mint):
+            calls.append('pairs')
+            await asyncio.sleep(0.01)
+            return [10_000.0, 12_000.0]
+
+        async def onchain(mint):
+            calls.append('onchain')
+            await asyncio.sleep(0.01)
+            return 20_000.0
+
+        async def slow(mint):
+            await asyncio.sleep(1)
+            return 1.0
+
+        async def broken(mint):
+            raise Exception("upstream down")
+
+        resolver = MarketCapResolver(
+            {'pairs': pairs, 'onchain': onchain, 'slow': slow, 'broken': broken},
+            ttl=30,
+            deadline=0.1
+        )
+        results = await asyncio.gather(*[resolver.get(MINT) for _ in range(10)])
+        assert results == [12_000.0] * 10
+        assert calls == ['pairs', 'onchain']
+
+        # Cached for the TTL
+        assert await resolver.get(MINT) == 12_000.0
+        assert calls == ['pairs', 'onchain']
+        assert resolver.get_stats()['hits'] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.ohlcv import OHLCVStore, CLOSE, HIGH, LOW, OPEN, TIME, VOLUME
+
+
+def test_ticks_fold_into_bars_and_rings_wrap():
+    store = OHLCVStore(resolutions={'tick': (0, 4), '1s': (1, 3), '1m': (60, 2)})
+    for timestamp, price in ((10.1, 1.0), (10.5, 3.0), (10.9, 2.0), (11.2, 4.0), (12.0, 5.0), (13.5, 6.0)):
+        store.update('mint', price, volume=1.0, timestamp=timestamp)
+
+    ticks = store.bars('mint', 'tick')
+    assert list(ticks[:, CLOSE]) == [2.0, 4.0, 5.0, 6.0]
+
+    seconds = store.bars('mint', '1s')
+    # The 10s bar fell out of the three-row ring
+    assert list(seconds[:, TIME]) == [11.0, 12.0, 13.0]
+    minute = store.bars('mint', '1m')
+    assert len(minute) == 1
+    assert list(minute[0, [OPEN, HIGH, LOW, CLOSE, VOLUME]]) == [1.0, 6.0, 1.0, 6.0, 6.0]
+    assert list(store.closes('mint', '1s')) == [4.0, 5.0, 6.0]
+    assert list(store.bars('mint', '1s', since=12.0)[:, TIME]) == [12.0, 13.0]
+
+
+def test_memory_cap_drops_least_recently_updated_token():
+    store = OHLCVStore(memory_limit_mb=1, memory_share=1.0)
+    assert store.max_tokens == 1024 * 1024 // store.token_bytes
+    for i in range(store.max_tokens + 1):
+        store.update(f'mint{i}', 1.0, timestamp=float(i))
+    assert 'mint0' not in store and f'mint{store.max_tokens}' in store
+    assert store.get_stats()['memory_mb'] <= 1
+    assert len(store.bars('mint0')) == 0
@@ -0,0 +1,95 @@
+import asyncio
+import base64
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solders.transaction import Transaction
+from services.paper import (
+    PaperEngine,
+    PaperJupiterClient,
+    PaperSignatureStream,
+    PaperWalletManager,
+    LAMPORTS_PER_SOL
+)
+from services.fill_accounting import extract_fill
+from services.jupiter import SOL_MINT
+from services.resilience import UpstreamError
+from services.tx_sender import TransactionSender
+
+
+def make_market(**kwargs):
+    engine = PaperEngine(latency_ms=(0, 0), seed=1, **kwargs)
+    mint = str(Pubkey.new_unique())
+    engine.add_pool(mint, 100 * LAMPORTS_PER_SOL, 1_000_000 * 10 ** 6)
+    return engine, mint
+
+
+async def swap(engine, wallet, jupiter, sender, input_mint, output_mint, amount, quote=None):
+    quote = quote or await jupiter.get_quote(input_mint, output_mint, amount, 100, use_cache=False)
+    tx_bytes = base64.b64decode(
+        await jupiter.get_swap_transaction(quote, wallet.phantom_public_key, priority_fee=1000)
+    )
+    transaction = Transaction.from_bytes(tx_bytes)
+    transaction.sign([wallet.keypair], transaction.message.recent_blockhash)
+    return quote, await sender.send(transaction, fetch_transaction=True)
+
+
+def test_round_trip_moves_pool_and_balances():
+    async def scenario():
+        engine, mint = make_market()
+        wallet = PaperWalletManager(engine, Keypair(), balance_sol=2)
+        await wallet.initialize()
+        jupiter = PaperJupiterClient(engine)
+        sender = TransactionSender(wallet.client, PaperSignatureStream(engine))
+        owner = str(wallet.phantom_public_key)
+        price_before = engine.price_usd(mint)
+
+        quote, result = await swap(engine, wallet, jupiter, sender, SOL_MINT, mint, LAMPORTS_PER_SOL)
+        assert result['status'] == 'confirmed'
+        fill = extract_fill(result['transaction'], owner, mint)
+        assert fill['token_delta'] == int(quote['outAmount'])
+        assert fill['sol_delta'] == -1.0
+        assert fill['rent_sol'] > 0 and fill['fee_sol'] > 0
+        # One SOL into a 100 SOL pool moves the price about 2%
+        assert 1.015 < engine.price_usd(mint) / price_before < 1.025
+
+        tokens = engine.token_balance(owner, mint)
+        _, result = await swap(engine, wallet, jupiter, sender, mint, SOL_MINT, tokens)
+        fill = extract_fill(result['transaction'], owner, mint)
+        assert fill['token_delta'] == -tokens
+        # Fees and price impact on both legs make the round trip lose a little
+        assert 0.99 < fill['sol_delta'] < 1.0
+        assert engine.positions(owner) == {}
+
+    asyncio.run(scenario())
+
+
+def test_slippage_and_injected_failures():
+    async def scenario():
+        engine, mint = make_market()
+        wallet = PaperWalletManager(engine, Keypair(), balance_sol=2)
+        await wallet.initialize()
+        jupiter = PaperJupiterClient(engine)
+        sender = TransactionSender(wallet.client, PaperSignatureStream(engine))
+        owner = str(wallet.phantom_public_key)
+
+        quote = await jupiter.get_quote(SOL_MINT, mint, LAMPORTS_PER_SOL, 100, use_cache=False)
+        # Someone else buys first and moves the price past the slippage limit
+        engine.pools[mint].swap(SOL_MINT, 5 * LAMPORTS_PER_SOL)
+        balance = engine.balance(owner)
+        _, result = await swap(engine, wallet, jupiter, sender, SOL_MINT, mint, LAMPORTS_PER_SOL, quote)
+        assert result['status'] == 'failed'
+        assert result['err'] == {'InstructionError': [1, {'Custom': 6001}]}
+        # Only the network fee is charged for a failed swap
+        assert 0 < balance - engine.balance(owner) < 10_000
+        assert engine.token_balance(owner, mint) == 0
+
+        engine.failure_rate = 1.0
+        with pytest.raises(UpstreamError):
+            await jupiter.get_quote(SOL_MINT, mint, LAMPORTS_PER_SOL, 100, use_cache=False)
+
+    asyncio.run(scenario())
@@ -0,0 +1,86 @@
+import asyncio
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.position_book import PositionBook
+from agents.analysis_agent import AnalysisAgent
+from services.sol_price import SolPriceFeed
+
+
+def test_rules_evaluated_per_batch_and_rows_reused():
+    book = PositionBook(capacity=2)
+    book.add('tp', 1.0, 1.0, stop_price=0.9, target_price=1.5)
+    book.add('sl', 1.0, 1.0, stop_price=0.9, target_price=1.5)
+    book.add('trail', 1.0, 1.0, stop_price=0.5, trail=0.1)  # grows the arrays
+    assert len(book) == 3
+
+    assert book.evaluate({'tp': 1.2, 'sl': 1.0, 'trail': 1.3}) == []
+    exits = book.evaluate({'tp': 1.6, 'sl': 0.85, 'trail': 1.16, 'unknown': 2.0})
+    assert sorted(exits) == [
+        ('sl', 0.85, 'stop_loss'),
+        ('tp', 1.6, 'take_profit'),
+        ('trail', 1.16, 'trailing_stop')
+    ]
+
+    row = book.index['sl']
+    book.remove('sl')
+    book.add('new', 2.0, 1.0, stop_price=1.0)
+    assert book.index['new'] == row and 'sl' not in book
+    assert book.evaluate({'new': 0.0}) == []
+
+
+class StubExitAgent:
+    def __init__(self):
+        self.sells = []
+
+    async def execute_sell(self, token_address, amount, reason, trade):
+        self.sells.append((token_address, amount, reason))
+        return True
+
+
+def test_analysis_agent_exits_only_triggered_positions():
+    async def scenario():
+        async def sol_usd():
+            return 100.0
+
+        exit_agent = StubExitAgent()
+        sol_price = SolPriceFeed([sol_usd])
+        await sol_price.refresh()
+        agent = AnalysisAgent(exit_agent, sol_price=sol_price)
+        for address in ('a', 'b', 'c'):
+            await agent.process_trade_update({
+                'token_address': address,
+                'entry_price': 1.0,
+                'position_size': 0.1,
+                'token_amount': 1000,
+                'entry_time': 0
+            })
+
+        await agent.process_price_updates([
+            {'address': 'a', 'price': 1.004},
+            {'address': 'b', 'price': 1.0},
+            {'address': 'a', 'price': 1.006},  # take profit at +$0.05 on 0.1 SOL ($10)
+            {'address': 'c', 'price': 0.95}  # -5% stop loss
+        ])
+        assert exit_agent.sells == [('a', 1000, 'take_profit'), ('c', 1000, 'stop_loss')]
+        assert list(agent.active_trades) == ['b'] and len(agent.positions) == 1
+
+    asyncio.run(scenario())
+
+
+def test_position_without_token_amount_is_not_sold():
+    async def scenario():
+        exit_agent = StubExitAgent()
+        agent = AnalysisAgent(exit_agent)
+        await agent.process_trade_update({
+            'token_address': 'a',
+            'entry_price': 1.0,
+            'position_size': 0.1,
+            'entry_time': 0
+        })
+        await agent.process_price_updates([{'address': 'a', 'price': 0.5}])
+        assert exit_agent.sells == []
+        assert list(agent.active_trades) == ['a']
+
+    asyncio.run(scenario())
@@ -0,0 +1,103 @@
+import asyncio
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.jupiter import JupiterClient, SOL_MINT
+from services.quote_cache import QuoteCache
+
+MINT = 'TokenMint1111111111111111111111111111111111'
+
+
+def test_concurrent_quotes_share_one_call():
+    async def scenario():
+        client = JupiterClient(quote_cache=QuoteCache(ttl=5))
+        calls = []
+
+        async def fake_get_quote(params):
+            calls.append(params)
+            await asyncio.sleep(0.01)
+            return {'inAmount': params['amount'], 'outAmount': '1000', 'contextSlot': 100}
+
+        client._get_quote = fake_get_quote
+        quotes = await asyncio.gather(*[
+            client.get_quote(SOL_MINT, MINT, 1_000_000, 300) for _ in range(5)
+        ])
+        assert len(calls) == 1
+        assert all(quote is quotes[0] for quote in quotes)
+
+        # Same amount bucket reuses a buy quote, a larger slippage does not
+        await client.get_quote(SOL_MINT, MINT, 1_001_000, 300)
+        assert len(calls) == 1
+        await client.get_quote(SOL_MINT, MINT, 1_000_000, 500)
+        assert len(calls) == 2
+
+        # Never reuse a quote that spends more than requested
+        await client.get_quote(SOL_MINT, MINT, 999_000, 300)
+        assert len(calls) == 3
+
+        # Quotes older than the slot lag are refetched
+        client.quote_cache.note_slot(110)
+        await client.get_quote(SOL_MINT, MINT, 1_000_000, 300)
+        assert len(calls) == 4
+        await client.cleanup()
+
+    asyncio.run(scenario())
+
+
+def test_sell_quotes_match_the_amount_exactly():
+    async def scenario():
+        client = JupiterClient(quote_cache=QuoteCache(ttl=5))
+        calls = []
+
+        async def fake_get_quote(params):
+            calls.append(params['amount'])
+            await asyncio.sleep(0.01)
+            return {'inAmount': params['amount'], 'outAmount': '1000'}
+
+        client._get_quote = fake_get_quote
+        await client.get_quote(MINT, SOL_MINT, 1_000_000, 300)
+        # Same bucket, but a cached sell of a different size would leave dust
+        smaller = await client.get_quote(MINT, SOL_MINT, 999_000, 300)
+        assert smaller['inAmount'] == '999000' and len(calls) == 2
+        assert (await client.get_quote(MINT, SOL_MINT, 999_000, 300)) is smaller
+        assert len(calls) == 2
+
+        # A caller joining another's in-flight request still gets its own amount
+        client.quote_cache.cache.clear()
+        larger, exact = await asyncio.gather(
+            client.get_quote(MINT, SOL_MINT, 1_001_000, 300),
+            client.get_quote(MINT, SOL_MINT, 1_000_000, 300)
+        )
+        assert larger['inAmount'] == '1001000' and exact['inAmount'] == '1000000'
+        assert calls[2:] == ['1001000', '1000000']
+        await client.cleanup()
+
+    asyncio.run(scenario())
+
+
+def test_last_good_route_restricts_and_falls_back():
+    async def scenario():
+        client = JupiterClient(quote_cache=QuoteCache(ttl=5))
+        calls = []
+
+        async def fake_get_quote(params):
+            calls.append(params)
+            if 'dexes' in params and len(calls) > 1:
+                raise Exception("Jupiter quote error: no route")
+            return {'inAmount': params['amount'], 'outAmount': '1000'}
+
+        client._get_quote = fake_get_quote
+        client.quote_cache.remember_route(MINT, {
+            'routePlan': [{'swapInfo': {'label': 'Raydium', 'ammKey': 'pool'}}]
+        })
+
+        await client.get_quote(MINT, SOL_MINT, 1_000_000, 300)
+        assert calls[0]['dexes'] == 'Raydium'
+
+        await client.get_quote(SOL_MINT, MINT, 50_000_000, 300)
+        assert calls[1]['dexes'] == 'Raydium'
+        assert 'dexes' not in calls[2]
+        await client.cleanup()
+
+    asyncio.run(scenario())
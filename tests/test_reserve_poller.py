@@ -0,0 +1,102 @@
+import asyncio
+import struct
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.append(str(Path(__file__).parent.parent))
+
+from solders.pubkey import Pubkey
+from services.jupiter import SOL_MINT
+from services.pools import decode_amm_v4, pool_state, price_sol
+from services.reserve_poller import ReservePoller
+
+
+def amm_account(mint, base_vault, quote_vault, quote_pnl=0):
+    data = bytearray(752)
+    struct.pack_into('<QQ', data, 32, 6, 9)
+    struct.pack_into('<QQ', data, 176, 25, 10_000)
+    struct.pack_into('<QQ', data, 192, 0, quote_pnl)
+    for offset, key in zip(range(336, 496, 32), (base_vault, quote_vault, mint, SOL_MINT, str(Pubkey.new_unique()))):
+        data[offset:offset + 32] = bytes(Pubkey.from_string(key))
+    return bytes(data)
+
+
+def token_account(amount):
+    data = bytearray(165)
+    struct.pack_into('<Q', data, 64, amount)
+    return bytes(data)
+
+
+class AccountsClient:
+    """getMultipleAccounts over an in-memory account table"""
+
+    def __init__(self):
+        self.accounts = {}
+        self.requests = []
+        self.slot = 100
+
+    async def get_multiple_accounts(self, keys):
+        self.requests.append(len(keys))
+        value = [
+            SimpleNamespace(data=self.accounts[str(key)]) if str(key) in self.accounts else None
+            for key in keys
+        ]
+        return SimpleNamespace(context=SimpleNamespace(slot=self.slot), value=value)
+
+
+def make_pool(client, sol_reserve):
+    mint, base_vault, quote_vault, address = (str(Pubkey.new_unique()) for _ in range(4))
+    data = amm_account(mint, base_vault, quote_vault)
+    client.accounts[address] = data
+    client.accounts[base_vault] = token_account(1_000_000 * 10 ** 6)
+    client.accounts[quote_vault] = token_account(sol_reserve * 10 ** 9)
+    return pool_state(mint, address, decode_amm_v4(data))
+
+
+def test_polls_all_pools_in_chunked_batches():
+    async def scenario():
+        client = AccountsClient()
+        prices = {}
+        poller = ReservePoller(
+            client,
+            on_update=lambda pool: prices.__setitem__(pool['mint'], (price_sol(pool), pool['slot'])),
+            chunk_size=4
+        )
+        first, second = make_pool(client, 100), make_pool(client, 200)
+        await poller.watch(first)
+        await poller.watch(second)
+
+        await poller.poll_once()
+        # 6 accounts in chunks of 4: one poll, two calls
+        assert client.requests == [4, 2]
+        assert prices == {first['mint']: (0.0001, 100), second['mint']: (0.0002, 100)}
+
+        poller.unwatch(first['mint'])
+        prices.clear()
+        client.slot = 101
+        client.accounts[first['sol_vault']] = token_account(50 * 10 ** 9)
+        await poller.poll_once()
+        assert client.requests[-1] == 3
+        assert list(prices) == [second['mint']]
+        assert poller.polls == 2 and poller.calls == 3
+
+    asyncio.run(scenario())
+
+
+def test_is_live_only_while_running_with_reserves():
+    async def scenario():
+        client = AccountsClient()
+        poller = ReservePoller(client, interval=0.01)
+        pool = make_pool(client, 100)
+        await poller.watch(pool)
+        assert not poller.is_live(pool['mint'])
+
+        poller.start()
+        await asyncio.sleep(0.05)
+        assert poller.is_live(pool['mint'])
+        assert poller.polls >= 2
+
+        await poller.close()
+        assert not poller.is_live(pool['mint'])
+
+    asyncio.run(scenario())
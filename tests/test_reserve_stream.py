@@ -0,0 +1,80 @@
+import asyncio
+import base64
+import struct
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from solders.pubkey import Pubkey
+from services.jupiter import SOL_MINT
+from services.pools import decode_amm_v4, pool_state, price_sol
+from services.reserve_stream import ReserveStream
+from rpc_ws_stub import RpcWebsocketStub
+
+MINT = str(Pubkey.new_unique())
+BASE_VAULT, QUOTE_VAULT, LP_MINT = (str(Pubkey.new_unique()) for _ in range(3))
+POOL = str(Pubkey.new_unique())
+
+
+def amm_account(quote_pnl=0, lp_reserve=1000):
+    data = bytearray(752)
+    struct.pack_into('<QQ', data, 32, 6, 9)           # base / quote decimals
+    struct.pack_into('<QQ', data, 176, 25, 10_000)    # swap fee
+    struct.pack_into('<QQ', data, 192, 0, quote_pnl)  # need take pnl
+    for offset, key in zip(range(336, 496, 32), (BASE_VAULT, QUOTE_VAULT, MINT, SOL_MINT, LP_MINT)):
+        data[offset:offset + 32] = bytes(Pubkey.from_string(key))
+    struct.pack_into('<Q', data, 720, lp_reserve)
+    return bytes(data)
+
+
+def token_account(amount):
+    data = bytearray(165)
+    struct.pack_into('<Q', data, 64, amount)
+    return base64.b64encode(bytes(data)).decode()
+
+
+def test_decode_pool_account():
+    amm = decode_amm_v4(amm_account())
+    assert (amm['base_mint'], amm['quote_mint'], amm['base_vault']) == (MINT, SOL_MINT, BASE_VAULT)
+    assert amm['fee_bps'] == 25 and amm['lp_reserve'] == 1000
+    pool = pool_state(MINT, POOL, amm)
+    assert (pool['token_vault'], pool['sol_vault'], pool['token_decimals']) == (BASE_VAULT, QUOTE_VAULT, 6)
+
+
+def test_streams_reserves_and_resubscribes_after_drop():
+    async def scenario():
+        stub = RpcWebsocketStub()
+        await stub.start()
+        prices = []
+        stream = ReserveStream(stub.url, on_update=lambda pool: prices.append(price_sol(pool)))
+        try:
+            stream.start()
+            await stream.watch(pool_state(MINT, POOL, decode_amm_v4(amm_account())))
+            await stub.wait_for('accountSubscribe', count=3)
+            await asyncio.sleep(0.05)
+
+            await stub.notify_account(BASE_VAULT, token_account(1_000_000 * 10 ** 6))
+            await stub.notify_account(QUOTE_VAULT, token_account(100 * 10 ** 9), slot=5)
+            await asyncio.sleep(0.05)
+            # Only a complete pair of vault amounts produces a price
+            assert prices == [0.0001]
+            assert stream.is_live(MINT)
+
+            # Unclaimed fees in the pool account are not part of the reserves
+            await stub.notify_account(POOL, base64.b64encode(amm_account(quote_pnl=50 * 10 ** 9)).decode())
+            await asyncio.sleep(0.05)
+            assert prices[-1] == 0.00005
+
+            await stub.drop_connections()
+            await stub.wait_for('accountSubscribe', count=3, timeout=5)
+            await asyncio.sleep(0.05)
+            assert stream.reconnects == 1 and stream.is_live(MINT)
+
+            stream.unwatch(MINT)
+            await asyncio.sleep(0.05)
+            assert stub.find('accountSubscribe') == [] and not stream.is_live(MINT)
+        finally:
+            await stream.close()
+            await stub.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,72 @@
+import asyncio
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+from services.resilience import UpstreamError, UpstreamUnavailable
+from services.scheduler import ExecutionScheduler, Priority
+
+
+def test_breaker_fails_fast_and_recovers():
+    async def scenario():
+        scheduler = ExecutionScheduler(
+            limits={'raydium': {'concurrency': 2, 'rate': 1000}},
+            failure_threshold=3,
+            reset_timeout=0.05
+        )
+        calls = []
+
+        async def down():
+            calls.append('down')
+            raise UpstreamError("raydium error 503", status=503)
+
+        async def bad_request():
+            calls.append('bad')
+            raise UpstreamError("raydium error 400", status=400)
+
+        async def up():
+            calls.append('up')
+            return 'ok'
+
+        # Client errors are not retried and do not count against the host
+        with pytest.raises(UpstreamError):
+            await scheduler.call('raydium', Priority.ENTRY, bad_request, retries=3)
+        assert calls == ['bad']
+
+        with pytest.raises(UpstreamError):
+            await scheduler.call('raydium', Priority.ENTRY, down, retries=2)
+        assert calls.count('down') == 3
+        assert scheduler.get_metrics()['raydium']['breaker'] == 'open'
+
+        # Open: fail fast without calling the host
+        with pytest.raises(UpstreamUnavailable):
+            await scheduler.run('raydium', Priority.EXIT, up)
+        assert 'up' not in calls
+
+        await asyncio.sleep(0.06)
+        assert await scheduler.run('raydium', Priority.EXIT, up) == 'ok'
+        metrics = scheduler.get_metrics()['raydium']
+        assert metrics['breaker'] == 'closed'
+        assert metrics['breaker_trips'] == 1 and metrics['rejected'] == 1
+
+    asyncio.run(scenario())
+
+
+def test_rate_follows_response_headers():
+    scheduler = ExecutionScheduler(limits={'jupiter_quote': {'concurrency': 4, 'rate': 10}})
+
+    scheduler.observe('jupiter_quote', 429, {'Retry-After': '2'})
+    upstream = scheduler.upstreams['jupiter_quote']
+    assert upstream.rate == 5
+    # Nothing starts until Retry-After has passed
+    assert upstream.tokens <= 1 - 2 * 5
+
+    scheduler.observe('jupiter_quote', 200, {'x-ratelimit-remaining': '6', 'x-ratelimit-reset': '3'})
+    assert upstream.rate == 2
+
+    # Without headers, successes creep back towards the configured rate
+    for _ in range(20):
+        scheduler.observe('jupiter_quote', 200, {})
+    assert upstream.rate == 10
+    assert scheduler.get_metrics()['jupiter_quote']['throttled'] == 1
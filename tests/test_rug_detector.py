@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.rug_detector import RugDetector, LP_WITHDRAWAL, LIQUIDITY_DRAIN, LARGE_SELL
+
+
+def pool(mint, sol, token=1_000_000, lp=1000):
+    return {
+        'mint': mint,
+        'token_vault_amount': token,
+        'sol_vault_amount': sol,
+        'token_pnl': 0,
+        'sol_pnl': 0,
+        'lp_reserve': lp
+    }
+
+
+def test_alerts_on_single_update():
+    detector = RugDetector(lp_drop=0.1, sol_drop=0.5, sell_ratio=0.15)
+    assert detector.update(pool('a', None)) is None  # reserves not known yet
+    assert detector.update(pool('a', 100)) is None    # baseline
+    assert detector.update(pool('a', 120)) is None
+    assert detector.update(pool('a', 110)) is None    # ordinary sell
+
+    assert detector.update(pool('a', 90)) == LARGE_SELL        # 18% in one update
+    assert detector.update(pool('a', 80)) is None
+    assert detector.update(pool('a', 70)) is None
+    assert detector.update(pool('a', 59)) == LIQUIDITY_DRAIN   # below half of the 120 high
+
+    assert detector.update(pool('b', 100)) is None
+    assert detector.update(pool('b', 95, lp=850)) == LP_WITHDRAWAL
+    assert detector.alerts == 3
+
+
+def test_forget_resets_the_baseline():
+    detector = RugDetector()
+    detector.update(pool('a', 100))
+    detector.forget('a')
+    assert detector.update(pool('a', 10)) is None
+    assert detector.update(pool('a', 10)) is None
@@ -0,0 +1,58 @@
+import asyncio
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.scheduler import ExecutionScheduler, Priority
+
+
+def test_exits_start_before_queued_entries():
+    async def scenario():
+        scheduler = ExecutionScheduler(limits={'jupiter_quote': {'concurrency': 2, 'rate': 1000}})
+        started = []
+        gate = asyncio.Event()
+
+        async def work(label):
+            started.append(label)
+            await gate.wait()
+
+        # Entries can only use one of the two slots, the other is held for exits
+        tasks = [
+            asyncio.create_task(scheduler.run('jupiter_quote', Priority.ENTRY, work, f"entry{i}"))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        assert started == ["entry0"]
+
+        tasks.append(asyncio.create_task(
+            scheduler.run('jupiter_quote', Priority.EXIT, work, "exit")
+        ))
+        await asyncio.sleep(0.01)
+        assert started == ["entry0", "exit"]
+
+        gate.set()
+        await asyncio.gather(*tasks)
+        return started, scheduler.get_metrics()
+
+    started, metrics = asyncio.run(scenario())
+    assert started[:2] == ["entry0", "exit"]
+    queue_ms = metrics['jupiter_quote']['queue_ms']
+    assert queue_ms['entry']['count'] == 3
+    assert queue_ms['exit']['max'] < 50
+
+
+def test_rate_limit_spaces_requests():
+    async def scenario():
+        scheduler = ExecutionScheduler(limits={'rpc': {'concurrency': 10, 'rate': 20}})
+        loop = asyncio.get_running_loop()
+        times = []
+
+        async def work():
+            times.append(loop.time())
+
+        await asyncio.gather(*[scheduler.run('rpc', Priority.ENTRY, work) for _ in range(25)])
+        return times
+
+    times = asyncio.run(scenario())
+    # A burst of 20 goes out at once, the remaining 5 wait for refills
+    assert times[-1] - times[0] >= 0.2
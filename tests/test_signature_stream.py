@@ -0,0 +1,101 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.signature_stream import SignatureStream
+from rpc_ws_stub import RpcWebsocketStub
+
+SIGNATURE = "5" * 88
+
+
+class PollingClient:
+    """RPC client whose signature status flips to confirmed after a few polls"""
+
+    def __init__(self, confirm_after=2):
+        self.calls = 0
+        self.confirm_after = confirm_after
+
+    async def get_signature_statuses(self, signatures):
+        self.calls += 1
+        if self.calls < self.confirm_after:
+            return SimpleNamespace(value=[None])
+        return SimpleNamespace(value=[SimpleNamespace(
+            slot=42, err=None, confirmation_status="TransactionConfirmationStatus.Confirmed"
+        )])
+
+
+async def _with_stub(scenario):
+    stub = RpcWebsocketStub()
+    await stub.start()
+    try:
+        return await scenario(stub)
+    finally:
+        await stub.stop()
+
+
+def test_processed_then_confirmed():
+    async def scenario(stub):
+        stream = SignatureStream(stub.url)
+        events = []
+        wait = asyncio.create_task(stream.wait(SIGNATURE, on_processed=events.append, timeout=5))
+
+        await stub.wait_for('signatureSubscribe', count=2)
+        await stub.notify_signature(SIGNATURE, 'processed', slot=10)
+        await asyncio.sleep(0.05)
+        assert [e['status'] for e in events] == ['processed']
+        assert not wait.done()
+
+        await stub.notify_signature(SIGNATURE, 'confirmed', slot=11)
+        result = await wait
+        await stream.close()
+        return result
+
+    result = asyncio.run(_with_stub(scenario))
+    assert result['status'] == 'confirmed'
+    assert result['slot'] == 11
+
+
+def test_failed_transaction_reported():
+    async def scenario(stub):
+        stream = SignatureStream(stub.url)
+        wait = asyncio.create_task(stream.wait(SIGNATURE, timeout=5))
+        await stub.wait_for('signatureSubscribe', count=2)
+        await stub.notify_signature(SIGNATURE, 'processed', err={'InstructionError': [2, {'Custom': 6001}]})
+        result = await wait
+        await stream.close()
+        return result
+
+    result = asyncio.run(_with_stub(scenario))
+    assert result['status'] == 'failed'
+    assert result['err'] == {'InstructionError': [2, {'Custom': 6001}]}
+
+
+def test_falls_back_to_polling_when_socket_drops():
+    async def scenario(stub):
+        client = PollingClient(confirm_after=2)
+        stream = SignatureStream(stub.url, rpc_client=client, poll_interval=0.01)
+        events = []
+        wait = asyncio.create_task(stream.wait(SIGNATURE, on_processed=events.append, timeout=5))
+        await stub.wait_for('signatureSubscribe', count=2)
+        await stub.drop_connections()
+        result = await wait
+        await stream.close()
+        return result, events, client
+
+    result, events, client = asyncio.run(_with_stub(scenario))
+    assert result['status'] == 'confirmed'
+    assert len(events) == 1
+    assert client.calls >= 2
+
+
+def test_polls_when_websocket_unavailable():
+    async def scenario():
+        client = PollingClient(confirm_after=1)
+        stream = SignatureStream("ws://127.0.0.1:1/", rpc_client=client, poll_interval=0.01)
+        result = await stream.wait(SIGNATURE, timeout=5)
+        await stream.close()
+        return result
+
+    assert asyncio.run(scenario())['status'] == 'confirmed'
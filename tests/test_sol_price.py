@@ -0,0 +1,55 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.sol_price import SolPriceFeed
+
+
+def test_falls_back_across_sources_and_keeps_last_value():
+    calls = []
+
+    async def failing():
+        calls.append('failing')
+        raise RuntimeError("down")
+
+    async def backup():
+        calls.append('backup')
+        return 150.0
+
+    async def scenario():
+        feed = SolPriceFeed([failing, backup], max_age=60)
+        assert feed.usd is None and feed.to_usd(1) is None
+        assert await feed.refresh() == 150.0
+        assert calls == ['failing', 'backup']
+        assert feed.usd == 150.0 and feed.to_usd(0.1) == 15.0
+
+        # A failed refresh keeps serving the last value while it is fresh
+        feed.sources = [failing]
+        assert await feed.refresh() is None
+        assert feed.usd == 150.0 and feed.failures == 1
+
+        # ... and stops serving it once it exceeds max_age
+        feed.updated_at = time.time() - 61
+        assert feed.usd is None
+        assert feed.get_stats()['stale']
+
+    asyncio.run(scenario())
+
+
+def test_refreshes_in_background():
+    prices = iter([100.0, 101.0, 102.0, 103.0, 104.0])
+
+    async def source():
+        return next(prices)
+
+    async def scenario():
+        feed = SolPriceFeed([source], refresh_interval=0.01)
+        await feed.start()
+        assert feed.usd == 100.0
+        await asyncio.sleep(0.035)
+        await feed.stop()
+        assert feed.usd > 100.0 and feed.refreshes >= 2
+
+    asyncio.run(scenario())
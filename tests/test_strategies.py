@@ -0,0 +1,48 @@
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.cadence import MonitorCadence
+from services.strategies import Strategy, StrategyHost
+
+
+def token(address, price=1.0, age=10):
+    return {'address': address, 'price': price, 'created_at': time.time() - age}
+
+
+def test_shadows_keep_separate_books_on_shared_prices():
+    host = StrategyHost([
+        Strategy('live', take_profit=0.5, stop_loss=0.2),
+        Strategy('tight', mode='shadow', take_profit=0.03, stop_loss=0.02, max_trades=1),
+        Strategy('young', mode='shadow', take_profit=0.1, stop_loss=0.1, max_token_age=5)
+    ])
+    assert host.live.name == 'live' and [s.strategy.name for s in host.shadows] == ['tight', 'young']
+
+    assert host.on_token(token('a', age=10)) == ['tight']   # too old for young
+    assert host.on_token(token('b', age=1)) == ['young']    # tight is full
+    assert host.watched == {'a', 'b'}
+
+    host.on_prices({'a': 1.02, 'b': 1.02})
+    assert host.watched == {'a', 'b'}
+    host.on_prices({'a': 1.05, 'b': 0.85})
+    assert host.watched == set()
+
+    tight, young = host.shadows
+    assert tight.closed[0]['reason'] == 'take_profit' and tight.get_stats()['win_rate'] == 1.0
+    assert young.closed[0]['reason'] == 'stop_loss' and young.realized_sol < 0
+    assert host.get_stats()['live'] == {'mode': 'live'}
+
+
+def test_single_live_strategy_and_shadow_cadence():
+    host = StrategyHost([
+        Strategy('first', mode='shadow'),
+        Strategy('second', mode='shadow', take_profit=0.03, stop_loss=0.02)
+    ])
+    # Without a live entry the first strategy trades
+    assert host.live.name == 'first' and len(host.shadows) == 1
+
+    cadence = MonitorCadence(min_interval=0.25, max_interval=5.0)
+    host.on_token(token('a'))
+    assert host.next_delay('a', 1.0, cadence, volatility=0.01) == cadence.next_delay(0.0, 0.03, -0.02, 0.01)
+    assert host.next_delay('unknown', 1.0, cadence) is None
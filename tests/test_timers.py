@@ -0,0 +1,38 @@
+import asyncio
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.timers import TimerWheel
+
+
+def test_timers_fire_in_order_and_cancel():
+    async def scenario():
+        wheel = TimerWheel(tick=0.01, slots=4)  # one turn is 40ms
+        fired = []
+
+        async def async_callback(name):
+            fired.append(name)
+
+        wheel.schedule(('a', 'max_hold'), 0.08, fired.append, 'a-max_hold')  # two turns out
+        wheel.schedule(('a', 'refresh'), 0.02, fired.append, 'a-refresh')
+        wheel.schedule(('b', 'max_hold'), 0.05, async_callback, 'b-max_hold')
+        wheel.schedule(('c', 'max_hold'), 0.03, fired.append, 'c-max_hold')
+        wheel.schedule(('c', 'refresh'), 0.03, fired.append, 'c-refresh')
+        # Rescheduling replaces, cancel_all drops every timer of a position
+        wheel.schedule(('a', 'refresh'), 0.04, fired.append, 'a-refresh')
+        wheel.cancel_all('c')
+        assert len(wheel) == 3 and 0.03 < wheel.remaining(('a', 'refresh')) <= 0.04
+
+        wheel.start()
+        await asyncio.sleep(0.2)
+        assert fired == ['a-refresh', 'b-max_hold', 'a-max_hold']
+        assert len(wheel) == 0 and wheel.fired == 3
+
+        # An idle wheel wakes up for new timers
+        wheel.schedule('late', 0.01, fired.append, 'late')
+        await asyncio.sleep(0.05)
+        assert fired[-1] == 'late'
+        await wheel.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,43 @@
+import asyncio
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.trade_slots import TradeSlots
+
+
+def test_burst_never_exceeds_max_trades_or_duplicates_a_mint():
+    async def scenario():
+        slots = TradeSlots(max_trades=3, max_inflight_buys=2)
+        inflight = 0
+        peak = 0
+
+        async def handle(mint):
+            nonlocal inflight, peak
+            reserved, _ = slots.reserve(mint)
+            if not reserved:
+                return False
+            async with slots.buying():
+                inflight += 1
+                peak = max(peak, inflight)
+                await asyncio.sleep(0.01)
+                inflight -= 1
+            slots.open(mint)
+            return True
+
+        mints = ["A", "A", "B", "C", "D", "E"]
+        results = await asyncio.gather(*[handle(mint) for mint in mints])
+        return slots, results, peak
+
+    slots, results, peak = asyncio.run(scenario())
+    assert results == [True, False, True, True, False, False]
+    assert slots.open_count == 3
+    assert peak == 2
+
+
+def test_release_frees_slot_and_mint():
+    slots = TradeSlots(max_trades=1)
+    assert slots.reserve("A") == (True, None)
+    assert slots.reserve("B")[0] is False
+    slots.release("A")
+    assert slots.reserve("B") == (True, None)
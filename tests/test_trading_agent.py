@@ -0,0 +1,218 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pytest
+from solders.pubkey import Pubkey
+from services.paper import PaperEngine, PaperWalletManager
+from services.strategies import SHADOW, Strategy, StrategyHost
+from services.wallet_pool import WalletPool
+
+# Needs solana-py, spl and the raydium helpers of the full install
+trading_agent = pytest.importorskip("agents.trading_agent")
+
+
+class SignedStub:
+    """Stands in for solana-py's Transaction, which signs with sign(*signers)"""
+
+    def __init__(self):
+        self.signers = []
+
+    def sign(self, *signers):
+        assert signers and not any(isinstance(signer, (list, tuple)) for signer in signers)
+        self.signers.extend(signers)
+
+
+class SenderStub:
+    def __init__(self, results, statuses=()):
+        self.results = list(results)
+        self.statuses = list(statuses)
+        self.sent = []
+
+    async def send(self, transaction, **kwargs):
+        self.sent.append(kwargs)
+        return self.results.pop(0)
+
+    async def lookup(self, signature, **kwargs):
+        return dict(self.statuses.pop(0), signature=signature, slot=None, err=None)
+
+
+def make_agent():
+    engine = PaperEngine(latency_ms=(0, 0), seed=1)
+    manager = PaperWalletManager(engine)
+    agent = trading_agent.TradingAgent(manager, paper_engine=engine)
+    agent.wallet_pool = WalletPool(manager)
+    agent.wallet_pool.update_balance(agent.wallet_pool.primary.address, 10.0)
+    return agent
+
+
+def token(mint):
+    now = time.time()
+    return {'address': mint, 'symbol': 'TEST', 'price': 1.0, 'created_at': now, 'detected_at': now}
+
+
+def test_exit_between_processed_and_confirmed_sells_provisional_amount():
+    async def scenario():
+        agent = make_agent()
+        mint = str(Pubkey.new_unique())
+        sold = []
+        agent.tx_sender = SenderStub([{'status': 'confirmed', 'signature': 'sell', 'slot': 2}])
+
+        signed = SignedStub()
+
+        async def build_exit(token_address, trade_info, priority):
+            sold.append(trade_info['token_amount'])
+            return signed
+
+        async def buy(token_data, amount_sol, on_processed=None, wallet=None, deadline=None):
+            on_processed({'signature': 'buy', 'quote': {'outAmount': '1000', 'otherAmountThreshold': '900'}})
+            assert agent.active_trades[mint]['status'] == 'pending'
+            # Stop loss fires before the buy reaches confirmed
+            exit_signal = agent._exit_signal(mint, 0.5, -0.5, 'STOP_LOSS')
+            assert await agent.close_positions([exit_signal]) == [True]
+            return {'status': 'confirmed', 'signature': 'buy', 'slot': 1}
+
+        agent._build_exit_transaction = build_exit
+        agent._execute_buy_order = buy
+        await agent.handle_new_token(token(mint))
+
+        assert sold == [900]
+        assert signed.signers == [agent.wallet_pool.primary.keypair]
+        assert mint not in agent.active_trades
+        assert not agent.trade_slots.held and not agent.wallet_pool.assignments
+
+    asyncio.run(scenario())
+
+
+def test_buy_timing_out_unconfirmed_is_tracked_until_it_lands(monkeypatch):
+    async def scenario():
+        agent = make_agent()
+        agent.PENDING_BUY_POLL = 0
+        mint = str(Pubkey.new_unique())
+        quote = {'outAmount': '1000', 'otherAmountThreshold': '900'}
+        agent.tx_sender = SenderStub(
+            [{'status': 'timeout', 'signature': 'buy', 'slot': None, 'err': None}],
+            [{'status': 'unknown'}, {'status': 'processed'}, {'status': 'confirmed'}]
+        )
+
+        async def quote_buy(*args, **kwargs):
+            return {'venue': 'jupiter', 'elapsed_ms': 1.0}
+
+        async def swap_transaction(*args, **kwargs):
+            return ''
+
+        agent.best_execution.quote = quote_buy
+        agent.best_execution.fill_quote = lambda choice: quote
+        agent.best_execution.get_swap_transaction = swap_transaction
+        monkeypatch.setattr(trading_agent.Transaction, 'deserialize', lambda data: SignedStub())
+
+        await agent.handle_new_token(token(mint))
+        # Sent once, the unknown status keeps a pending position instead of resending
+        assert len(agent.tx_sender.sent) == 1
+        trade = agent.active_trades[mint]
+        assert trade['status'] == 'pending' and trade['token_amount'] == 900
+        assert mint in agent.trade_slots.held
+
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert trade['status'] == 'filled'
+        assert agent.jupiter.quote_cache.last_route(mint) is not None
+        # The fill was not fetched, the quoted spend leaves the wallet's balance
+        assert agent.wallet_pool.primary.balance < 10.0 - agent.POSITION_SIZE
+
+    asyncio.run(scenario())
+
+
+def test_price_updates_reach_analysis_once_per_batch():
+    async def scenario():
+        agent = make_agent()
+        batches = []
+
+        async def on_prices(updates):
+            batches.append(updates)
+
+        async def on_trade(trade_info):
+            pass
+
+        await agent.set_analysis_callback(on_prices, on_trade)
+        mints = [str(Pubkey.new_unique()) for _ in range(3)]
+        for mint in mints:
+            trade = {'token_data': token(mint), 'entry_price': 1.0}
+            assert agent._check_price(mint, trade, 1.1) is None
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+        assert batches == [[{'address': mint, 'price': 1.1} for mint in mints]]
+
+    asyncio.run(scenario())
+
+
+def test_max_hold_exit_is_off_by_default():
+    async def scenario():
+        agent = make_agent()
+        assert not agent.MAX_HOLD_TIME
+        mint = str(Pubkey.new_unique())
+        agent.active_trades[mint] = {'token_data': token(mint), 'entry_price': 1.0, 'entry_time': 0}
+        agent._arm_timers(mint)
+        assert (mint, 'price_check') in agent.timers
+        assert (mint, 'max_hold') not in agent.timers
+
+        agent.MAX_HOLD_TIME = 600
+        agent._arm_timers(mint)
+        assert (mint, 'max_hold') in agent.timers
+        agent.timers.cancel_all(mint)
+
+    asyncio.run(scenario())
+
+
+class FeedStub:
+    def __init__(self):
+        self.pools = {}
+
+    async def watch(self, pool):
+        self.pools[pool['mint']] = pool
+
+    def unwatch(self, mint):
+        self.pools.pop(mint, None)
+
+    def is_live(self, mint):
+        return mint in self.pools
+
+
+class PoolsStub:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def resolve(self, mint):
+        return self.pool
+
+    def forget(self, mint):
+        pass
+
+
+def test_shadow_only_tokens_get_pool_reserve_updates():
+    async def scenario():
+        agent = make_agent()
+        agent.strategies = StrategyHost([Strategy('live'), Strategy('shadow', mode=SHADOW, stop_loss=0.2)])
+        agent.sol_price.price, agent.sol_price.updated_at = 100.0, time.time()
+        mint = str(Pubkey.new_unique())
+        # 1000 whole tokens against 10 SOL: 0.01 SOL, $1 per token
+        pool = {
+            'mint': mint, 'token_decimals': 6, 'token_pnl': 0, 'sol_pnl': 0,
+            'token_vault_amount': 1000 * 10 ** 6, 'sol_vault_amount': 10 * 10 ** 9
+        }
+        agent.reserve_feed, agent.pools = FeedStub(), PoolsStub(pool)
+
+        assert agent.strategies.on_token(token(mint)) == ['shadow']
+        await agent._watch_pool(mint)
+        assert mint in agent.reserve_feed.pools and mint not in agent.active_trades
+
+        # A drain to 7 SOL is a -30% move, the shadow's stop loss closes it
+        agent._on_reserve_update(dict(pool, sol_vault_amount=7 * 10 ** 9))
+        shadow = agent.strategies.shadows[0]
+        assert [trade['reason'] for trade in shadow.closed] == ['stop_loss']
+        assert mint not in agent.reserve_feed.pools
+
+    asyncio.run(scenario())
@@ -0,0 +1,82 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.tx_sender import TransactionSender, classify_simulation_error
+
+SIGNATURE = "3" * 88
+
+
+class FakeClient:
+    def __init__(self, err=None, logs=None, delay=0.01):
+        self.err = err
+        self.logs = logs or []
+        self.delay = delay
+
+    async def send_transaction(self, transaction, opts=None):
+        return SimpleNamespace(value=SIGNATURE)
+
+    async def simulate_transaction(self, transaction, sig_verify=False):
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(value=SimpleNamespace(err=self.err, logs=self.logs))
+
+
+class SlowStream:
+    """Signature stream that confirms only after a long wait"""
+
+    def __init__(self, delay=10):
+        self.delay = delay
+        self.cancelled = False
+
+    async def wait(self, signature, on_processed=None, timeout=30):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {'signature': signature, 'status': 'confirmed', 'slot': 1, 'err': None}
+
+
+def test_classify_simulation_errors():
+    slippage = classify_simulation_error(
+        {'InstructionError': [3, {'Custom': 6001}]},
+        ["Program log: Error Code: SlippageToleranceExceeded"]
+    )
+    assert slippage['kind'] == 'slippage'
+
+    funds = classify_simulation_error(
+        {'InstructionError': [1, {'Custom': 1}]},
+        ["Program log: Error: insufficient funds"]
+    )
+    assert funds['kind'] == 'insufficient_funds'
+
+    assert classify_simulation_error('BlockhashNotFound', []) is None
+
+
+def test_failed_simulation_cancels_confirmation_wait():
+    async def scenario():
+        stream = SlowStream()
+        client = FakeClient(
+            err={'InstructionError': [3, {'Custom': 6001}]},
+            logs=["Program log: Error Code: SlippageToleranceExceeded"]
+        )
+        sender = TransactionSender(client, stream, race_preflight=True)
+        result = await asyncio.wait_for(sender.send(object()), 1)
+        return result, stream
+
+    result, stream = asyncio.run(scenario())
+    assert result['status'] == 'failed'
+    assert result['error']['kind'] == 'slippage'
+    assert stream.cancelled
+
+
+def test_clean_simulation_waits_for_confirmation():
+    async def scenario():
+        sender = TransactionSender(FakeClient(), SlowStream(delay=0.05), race_preflight=True)
+        return await sender.send(object())
+
+    result = asyncio.run(scenario())
+    assert result['status'] == 'confirmed'
+    assert result['error'] is None
@@ -0,0 +1,42 @@
+import math
+import random
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from services.volatility import VolatilityTracker
+
+
+def simulate(tracker, mint, sigma_per_second, seconds=600, seed=1):
+    rng = random.Random(seed)
+    price, t = 1.0, 0.0
+    while t < seconds:
+        dt = rng.uniform(0.5, 2.0)  # irregular ticks
+        price *= math.exp(rng.gauss(0, sigma_per_second * math.sqrt(dt)))
+        t += dt
+        tracker.update(mint, price, t)
+
+
+def test_estimates_per_second_volatility_from_irregular_ticks():
+    tracker = VolatilityTracker(halflife=120)
+    assert tracker.stdev('calm', 5) is None
+
+    simulate(tracker, 'calm', 0.001)
+    simulate(tracker, 'wild', 0.02)
+
+    calm = tracker.stdev('calm', 1)
+    wild = tracker.stdev('wild', 1)
+    assert 0.0006 < calm < 0.0015
+    assert 0.012 < wild < 0.03
+    # Scales with the square root of the horizon
+    assert math.isclose(tracker.stdev('wild', 4), 2 * wild)
+
+
+def test_memory_is_bounded():
+    tracker = VolatilityTracker(max_tokens=3)
+    for i in range(5):
+        tracker.update(f"mint{i}", 1.0, 0)
+    assert list(tracker.estimators) == ['mint2', 'mint3', 'mint4']
+    tracker.update('mint2', 1.1, 1)
+    tracker.update('mint5', 1.0, 1)
+    assert list(tracker.estimators) == ['mint4', 'mint2', 'mint5']
@@ -0,0 +1,91 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.append(str(Path(__file__).parent.parent))
+
+from solders.hash import Hash
+from solders.keypair import Keypair
+from services.wallet_pool import WalletPool, LAMPORTS_PER_SOL, SIGNATURE_FEE_LAMPORTS
+
+
+class StubWalletManager:
+    def __init__(self):
+        self.keypair = Keypair()
+        self.client = self
+
+    async def get_latest_blockhash(self):
+        return SimpleNamespace(value=SimpleNamespace(blockhash=Hash.new_unique()))
+
+
+class ConfirmingSender:
+    async def send(self, transaction, **kwargs):
+        return {'signature': 'sig', 'status': 'confirmed', 'slot': 1, 'err': None, 'error': None}
+
+
+def make_pool(balances, max_inflight=2):
+    manager = StubWalletManager()
+    pool = WalletPool(manager, [Keypair() for _ in balances[1:]], max_inflight=max_inflight)
+    for wallet, balance in zip(pool.wallets.values(), balances):
+        pool.update_balance(wallet.address, balance)
+    return manager, pool
+
+
+def test_assigns_least_loaded_wallet_with_funds():
+    manager, pool = make_pool([1.0, 0.5, 0.05], max_inflight=1)
+    primary, second, poor = pool.wallets.values()
+    assert primary.balance == 1.0
+
+    assert pool.assign('mintA', 0.1) is primary
+    assert pool.assign('mintB', 0.1) is second
+    # The last wallet cannot fund the buy and keep its reserve, the others are busy
+    assert pool.assign('mintC', 0.1) is None
+    assert pool.assign('mintA', 0.1) is None
+
+    pool.open('mintA')
+    assert primary.inflight == 0 and primary.reserved == 0
+    assert pool.keypair_for('mintA') is primary.keypair
+
+    # An open position counts towards load, so the next buy goes elsewhere
+    pool.release('mintB')
+    assert pool.assign('mintC', 0.1) is second
+
+    pool.release('mintA')
+    assert not primary.positions and 'mintA' not in pool.assignments
+
+
+def test_rebalance_and_sweep_plans():
+    _, pool = make_pool([2.0, 0.0, 0.4])
+    primary, empty, small = pool.wallets.values()
+
+    transfers = pool.plan_rebalance()
+    moved = {}
+    for source, destination, lamports in transfers:
+        moved[source.address] = moved.get(source.address, 0) - lamports
+        moved[destination.address] = moved.get(destination.address, 0) + lamports
+    assert moved[primary.address] == -1.2 * LAMPORTS_PER_SOL
+    assert moved[empty.address] == 0.8 * LAMPORTS_PER_SOL
+    assert moved[small.address] == 0.4 * LAMPORTS_PER_SOL
+
+    # Wallets with open positions are left alone by a sweep
+    small.positions.add('mintA')
+    sweep = pool.plan_sweep()
+    assert [(source, destination) for source, destination, _ in sweep] == []
+    small.positions.clear()
+    sweep = pool.plan_sweep()
+    assert [(source, destination) for source, destination, _ in sweep] == [(small, primary)]
+    assert sweep[0][2] == 0.39 * LAMPORTS_PER_SOL
+
+
+def test_spends_without_fill_metadata_and_transfer_fees_reduce_balances():
+    _, pool = make_pool([1.0, 0.0])
+    primary, empty = pool.wallets.values()
+
+    # A buy whose transaction could not be fetched is charged its quoted spend
+    pool.charge(primary.address, 0.5)
+    assert primary.balance == 0.5
+    assert pool.assign('mintA', 0.5) is None
+
+    asyncio.run(pool.execute_transfers(ConfirmingSender(), [(primary, empty, LAMPORTS_PER_SOL // 10)]))
+    assert empty.balance == 0.1
+    assert round(primary.balance * LAMPORTS_PER_SOL) == 0.4 * LAMPORTS_PER_SOL - SIGNATURE_FEE_LAMPORTS
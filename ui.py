@@ -113,16 +113,26 @@ class TradingBotUI:
                 if active_trades:
                     trades_data = []
                     for address, trade in active_trades.items():
+                        indicators = self.bot.get_indicators(address) or {}
                         trades_data.append({
                             "Symbol": trade['token_data']['symbol'],
                             "Entry": f"${trade['entry_price']:.8f}",
-                            "Size": f"{trade['position_size']} SOL"
+                            "Size": f"{trade['position_size']} SOL",
+                            "Momentum": f"{indicators.get('momentum', 0) * 100:+.2f}%",
+                            "Drawdown": f"{indicators.get('drawdown', 0) * 100:.2f}%"
                         })
                     trades_container.dataframe(
                         trades_data,
                         use_container_width=True,
                         hide_index=True
                     )
+                    
+                    # Price since entry (1s closes) for each open position
+                    for address, trade in active_trades.items():
+                        closes = self.bot.get_price_history(address)
+                        if len(closes) > 1:
+                            st.caption(trade['token_data']['symbol'])
+                            st.line_chart(closes, height=120)
                 else:
                     trades_container.info("No active trades")
             else: